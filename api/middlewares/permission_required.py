@@ -1,9 +1,7 @@
 """ Module for permission validation """
 
 from functools import wraps
-from flask import request
-from api.models.user import User
-from api.schemas.user import UserSchema
+from flask import g
 from api.utilities.helpers.responses import error_response
 
 
@@ -17,15 +15,9 @@ def permission_required(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        decoded_token = request.decoded_token
-        current_user = User.find_by_id(decoded_token['user']['id'])
-        user_schema = UserSchema()
-        user_data = user_schema.dump(current_user)
-
-        if not user_data['is_admin']:
+        if not g.principal.is_admin:
             message = 'Permission denied. You are not authorized to perform this action'
-            error_response['message'] = message
-            return error_response, 403
+            return error_response(message), 403
 
         return f(*args, **kwargs)
     return decorated
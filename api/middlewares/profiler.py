@@ -0,0 +1,260 @@
+""" Module for profiling the requests of the admins with cProfile
+
+    A request of an admin with the X-Profile: 1 header runs under cProfile.
+    Its profile is stored in PROFILE_DIR as a pstats file, named by the
+    X-Profile-Id response header, and its time is broken down into SQL,
+    serialization and view code in the Server-Timing header. Only the last
+    PROFILE_MAX_FILES profiles are kept. The hooks are only registered when
+    PROFILING is enabled.
+"""
+
+import cProfile
+import glob
+import os
+import pstats
+import tempfile
+import threading
+import time
+import uuid
+from flask import current_app, g, request
+from api.utilities.helpers import get_endpoint_name
+from api.utilities.principal import Principal, decode_auth_token
+
+PROFILE_HEADER = 'X-Profile'
+# Functions of the SQL statements and of the response serialization,
+# matched by the end of their file path and their name
+SQL_FUNCTIONS = [
+    ('sqlalchemy/engine/default.py', 'do_execute'),
+    ('sqlalchemy/engine/default.py', 'do_executemany'),
+    ('sqlalchemy/engine/default.py', 'do_execute_no_params'),
+]
+SERIALIZATION_FUNCTIONS = [
+    ('marshmallow/schema.py', 'dump'),
+    ('api/schemas/registry.py', 'dump'),
+    ('api/utilities/json_encoder.py', 'output_json'),
+]
+
+# cProfile can't profile concurrent requests on Python 3.12+, and the
+# profiles of concurrent requests would slow each other down anyway
+_profiling = threading.Lock()
+_END_OF_BODY = object()
+
+
+def is_admin_request():
+    """ Checks if the request is authenticated with the token of an admin """
+
+    token = request.headers.get('Authorization')
+    if not token:
+        return False
+
+    try:
+        return Principal(decode_auth_token(token)).is_admin
+    except Exception:
+        return False
+
+
+def matches(function, functions):
+    """ Checks if a pstats function key is one of the functions """
+
+    filename, _, name = function
+    filename = filename.replace(os.sep, '/')
+    return any(filename.endswith(path) and name == function_name
+               for path, function_name in functions)
+
+
+def time_in(stats, functions):
+    """
+        Gets the time spent in the functions and the functions they call,
+        the calls between the functions themselves are counted once
+        Args:
+            stats(pstats.Stats): request profile
+            functions(list): file path ends and names of the functions
+
+        Returns:
+            float: time in seconds
+    """
+
+    total = 0
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not matches(function, functions):
+            continue
+        total += sum(cumulative for caller, (_, _, _, cumulative) in callers.items()
+                     if not matches(caller, functions))
+    return total
+
+
+def get_breakdown(stats, duration):
+    """
+        Breaks the request time down into SQL, serialization and view code.
+        pstats has no call stacks, a lazy load triggered by a dump counts
+        in both SQL and serialization (the endpoints eager load what they
+        dump).
+        Args:
+            stats(pstats.Stats): request profile
+            duration(float): request time in seconds
+
+        Returns:
+            dict: time of every part in seconds
+    """
+
+    sql = time_in(stats, SQL_FUNCTIONS)
+    serialization = time_in(stats, SERIALIZATION_FUNCTIONS)
+    return {
+        'sql': sql,
+        'serialization': serialization,
+        'view': max(0, duration - sql - serialization),
+    }
+
+
+def start_profile():
+    """ Starts profiling the request of an admin asking for it """
+
+    if request.headers.get(PROFILE_HEADER) != '1' or not is_admin_request():
+        return
+
+    if not _profiling.acquire(blocking=False):
+        g.profile_busy = True
+        return
+
+    g.profile = cProfile.Profile()
+    g.profile_start = time.perf_counter()
+    g.profile.enable()
+
+
+def prune_profiles(directory, max_files):
+    """
+        Removes the oldest pstats files of the directory beyond the limit
+        Args:
+            directory(str): profiles directory
+            max_files(int): profiles kept
+    """
+
+    profiles = glob.glob(os.path.join(directory, '*.pstats'))
+    profiles.sort(key=os.path.getmtime, reverse=True)
+    for profile_file in profiles[max_files:]:
+        try:
+            os.remove(profile_file)
+        except FileNotFoundError:
+            pass
+
+
+def save_profile(profile, profile_id, directory, max_files):
+    """
+        Stores a profile as a pstats file, keeping the last max_files ones
+        Args:
+            profile(cProfile.Profile): stopped profile
+            profile_id(str): name of the file
+            directory(str): profiles directory
+            max_files(int): profiles kept
+
+        Returns:
+            pstats.Stats: profile stats
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    stats = pstats.Stats(profile)
+    stats.dump_stats(os.path.join(directory, f'{profile_id}.pstats'))
+    prune_profiles(directory, max_files)
+    return stats
+
+
+class ProfiledBody:
+    """ Body of a streamed response, generated under the profile of its
+        request. The profile is stored once the body is closed, and the
+        profiler is free again for the next requests.
+    """
+
+    def __init__(self, body, profile, save):
+        self.body = body
+        self.profile = profile
+        self.save = save
+        self.closed = False
+
+    def __iter__(self):
+        chunks = iter(self.body)
+        while True:
+            self.profile.enable()
+            try:
+                chunk = next(chunks, _END_OF_BODY)
+            finally:
+                self.profile.disable()
+            if chunk is _END_OF_BODY:
+                return
+            yield chunk
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if hasattr(self.body, 'close'):
+                self.body.close()
+        finally:
+            try:
+                self.save()
+            finally:
+                _profiling.release()
+
+
+def stop_profile(response):
+    """ Stores the profile of the request and reports its breakdown. The
+        profile of a streamed response goes on while its body is generated,
+        after the headers are sent, so it's only stored and has no
+        breakdown.
+    """
+
+    profile = g.pop('profile', None)
+    if profile is None:
+        if g.pop('profile_busy', False):
+            response.headers['X-Profile-Id'] = 'busy'
+        return response
+
+    profile.disable()
+    duration = time.perf_counter() - g.profile_start
+
+    profile_id = f'{time.strftime("%Y%m%dT%H%M%S")}-' \
+        f'{get_endpoint_name() or "unmatched"}-{uuid.uuid4().hex[:8]}'
+    config = current_app.config
+    directory = config.get('PROFILE_DIR') or \
+        os.path.join(tempfile.gettempdir(), 'dash-shop-profiles')
+    max_files = config.get('PROFILE_MAX_FILES', 100)
+    response.headers['X-Profile-Id'] = profile_id
+
+    if response.is_streamed:
+        response.response = ProfiledBody(
+            response.response, profile,
+            lambda: save_profile(profile, profile_id, directory, max_files))
+        return response
+
+    try:
+        stats = save_profile(profile, profile_id, directory, max_files)
+    finally:
+        _profiling.release()
+
+    breakdown = get_breakdown(stats, duration)
+    response.headers.add('Server-Timing', ', '.join(
+        [f'profile;dur={duration * 1000:.2f}'] +
+        [f'profile-{part};dur={seconds * 1000:.2f}'
+         for part, seconds in breakdown.items()]))
+    return response
+
+
+def discard_profile(error=None):
+    """ Stops the profiler of a failed request """
+
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profile.disable()
+        _profiling.release()
+
+
+def init_profiler(app):
+    """
+        Profiles the requests of the admins sending the X-Profile: 1 header
+        Args:
+            app(Flask): application
+    """
+
+    app.before_request(start_profile)
+    app.after_request(stop_profile)
+    app.teardown_request(discard_profile)
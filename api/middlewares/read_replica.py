@@ -0,0 +1,155 @@
+""" Module for routing the read-only requests to the read replicas """
+
+import random
+from functools import wraps
+from flask import current_app, g, request
+from itsdangerous import BadSignature, TimestampSigner
+from api.utilities.cache import create_cache
+from api.utilities.generate_token import get_secret_key
+from api.utilities.principal import decode_auth_token
+
+REPLICA_BIND_PREFIX = 'replica'
+PRIMARY_COOKIE = 'read_primary'
+# Prefix of the shared store keys of the users reading from the primary
+PRIMARY_READS_PREFIX = 'dash-shop:primary-reads:'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_primary_reads = None
+
+
+def get_replica_binds(config):
+    """
+        Gets the bind keys of the read replicas
+        Args:
+            config(dict): app configuration
+
+        Returns:
+            list: replica bind keys
+    """
+
+    return sorted(key for key in (config.get('SQLALCHEMY_BINDS') or {})
+                  if key.startswith(REPLICA_BIND_PREFIX))
+
+
+def check_replica_config(config):
+    """
+        Checks the users writing on a worker read their writes on the
+        others, their read-your-writes window being kept in a store shared
+        by the workers only with the redis cache backend
+        Args:
+            config(dict): app configuration
+        Raises:
+            ValueError: the replicas are used by several workers without redis
+    """
+
+    if get_replica_binds(config) and config.get('WEB_CONCURRENCY', 1) > 1 \
+            and config.get('CACHE_BACKEND') != 'redis':
+        raise ValueError(
+            'The read replicas of DATABASE_REPLICA_URLS need '
+            'CACHE_BACKEND = redis with more than one worker')
+
+
+def get_primary_reads():
+    """ Gets the store of the users reading from the primary database, apart
+        from the application cache and its hit and miss counters
+    """
+
+    global _primary_reads
+    if _primary_reads is None:
+        _primary_reads = create_cache(current_app.config,
+                                      key_prefix=PRIMARY_READS_PREFIX)
+    return _primary_reads
+
+
+def set_primary_reads(store):
+    """ Replaces the store of the users reading from the primary database """
+
+    global _primary_reads
+    _primary_reads = store
+
+
+def get_primary_cookie_signer():
+    """ Gets the signer of the primary reads cookie, the clients can't
+        forge it to pin their reads to the primary database
+    """
+
+    return TimestampSigner(get_secret_key(), salt='read-primary')
+
+
+def get_user_id():
+    """ Gets the ID of the authenticated user of the request, None for an
+        anonymous client or an invalid token
+    """
+
+    token = request.headers.get('Authorization')
+    if not token:
+        return None
+
+    try:
+        return decode_auth_token(token)['user']['id']
+    except Exception:
+        return None
+
+
+def reads_from_primary():
+    """ Checks if the client wrote recently, its reads then go to the
+        primary database until the replicas have caught up. The users are
+        recognized by their token, the anonymous clients by a signed cookie.
+    """
+
+    user_id = get_user_id()
+    if user_id is not None and get_primary_reads().get(str(user_id)):
+        return True
+
+    cookie = request.cookies.get(PRIMARY_COOKIE)
+    if not cookie:
+        return False
+
+    window = current_app.config.get('READ_YOUR_WRITES_WINDOW', 5)
+    try:
+        get_primary_cookie_signer().unsign(cookie, max_age=window)
+    except BadSignature:
+        return False
+    return True
+
+
+def read_replica(f):
+    """ Read replica decorator. Sends the queries of a read-only endpoint to
+        one of the read replicas, unless the client wrote recently
+
+        Args:
+            f (function): Function to be decorated
+        Returns:
+            decorated (function): Decorated function
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        replicas = get_replica_binds(current_app.config)
+        if replicas and request.method in SAFE_METHODS and not reads_from_primary():
+            g.replica_bind = random.choice(replicas)
+
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g.pop('replica_bind', None)
+    return decorated
+
+
+def stick_to_primary(response):
+    """ Sends the reads of a client to the primary database for a short
+        window after a successful write, so that it reads its own writes.
+        The window of a user is kept in a store shared by the worker
+        processes (see check_replica_config), the signed cookie covers the
+        anonymous clients.
+    """
+
+    if request.method not in SAFE_METHODS and response.status_code < 400 \
+            and get_replica_binds(current_app.config):
+        window = current_app.config.get('READ_YOUR_WRITES_WINDOW', 5)
+        user_id = get_user_id()
+        if user_id is not None:
+            get_primary_reads().set(str(user_id), True, window)
+        response.set_cookie(
+            PRIMARY_COOKIE, get_primary_cookie_signer().sign('1').decode('utf-8'),
+            max_age=window, httponly=True, samesite='Lax')
+    return response
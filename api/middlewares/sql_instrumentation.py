@@ -0,0 +1,208 @@
+""" Module for the SQL statements instrumentation of the requests """
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from api.utilities.helpers import get_endpoint_name
+
+PARAMETER = re.compile(r'%\(\w+\)s|%s')
+PARAMETER_LIST = re.compile(r'\(\?(?:, \?)+\)')
+WHITESPACE = re.compile(r'\s+')
+# Stats of the blocks collecting their statements (see collect_statements)
+_collectors = []
+
+
+class SQLBudgetExceeded(AssertionError):
+    """ Raised when a request runs more SQL statements than its budget,
+        with the raise budget action used by the tests
+    """
+
+
+class StatementStats:
+    """ SQL statements run by a request or a block (see collect_statements) """
+
+    def __init__(self, budget, keep_statements=False):
+        self.budget = budget
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.statements = [] if keep_statements else None
+
+    def record(self, statement, duration):
+        """ Records a statement and its duration in seconds """
+
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def repeated(self, limit):
+        """
+            Gets the statements run more than the limit, usually a relationship
+            loaded once per row (N+1)
+            Args:
+                limit(int): times a statement can run
+
+            Returns:
+                list: fingerprints and counts, most repeated first
+        """
+
+        return [(statement, count)
+                for statement, count in self.fingerprints.most_common()
+                if count > limit]
+
+
+def fingerprint(statement):
+    """
+        Normalizes a statement, the statements which only differ by their
+        parameters or the length of their IN lists share their fingerprint
+        Args:
+            statement(str): SQL statement
+
+        Returns:
+            str: statement fingerprint
+    """
+
+    statement = PARAMETER.sub('?', statement)
+    statement = PARAMETER_LIST.sub('(?)', statement)
+    return WHITESPACE.sub(' ', statement).strip()
+
+
+def get_recording_stats():
+    """ Gets the stats recording the statements run now, of the request and
+        of the blocks collecting them
+    """
+
+    stats = list(_collectors)
+    if has_request_context() and g.get('sql_stats') is not None:
+        stats.append(g.sql_stats)
+    return stats
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if get_recording_stats():
+        conn.info['statement_start'] = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop('statement_start', None)
+    if start is None:
+        return
+
+    duration = time.perf_counter() - start
+    for stats in get_recording_stats():
+        stats.record(statement, duration)
+
+
+def listen_to_engines():
+    """ Registers the statement events of every engine, once """
+
+    if not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+
+
+@contextmanager
+def collect_statements():
+    """ Records the SQL statements run in a block, inside or outside of the
+        requests, e.g. to check the statements budget of a test
+
+        Usage:
+            with collect_statements() as stats:
+                client.get(...)
+            stats.count, stats.statements
+    """
+
+    listen_to_engines()
+    stats = StatementStats(budget=None, keep_statements=True)
+    _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.remove(stats)
+
+
+def start_statement_stats():
+    """ Starts recording the SQL statements of the request """
+
+    g.sql_stats = StatementStats(
+        current_app.config.get('SQL_STATEMENT_BUDGET', 20))
+
+
+def stop_statement_stats(error=None):
+    """ Stops recording the SQL statements, also after a failed request """
+
+    g.pop('sql_stats', None)
+
+
+def report_statement_stats(response):
+    """ Adds the statements count and time to the Server-Timing header, and
+        warns, or raises in the tests, when the request is over its budget or
+        runs the same statement too many times
+    """
+
+    stats = g.pop('sql_stats', None)
+    if stats is None:
+        return response
+
+    config = current_app.config
+    repeated = stats.repeated(config.get('SQL_REPEATED_STATEMENT_LIMIT', 3))
+    timings = [f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} statements"']
+    if repeated:
+        timings.append(f'db-repeated;desc="{len(repeated)} statements '
+                       f'repeated up to {repeated[0][1]} times"')
+    response.headers.add('Server-Timing', ', '.join(timings))
+
+    problems = [f'{count} runs of {statement}' for statement, count in repeated]
+    if stats.count > stats.budget:
+        problems.insert(
+            0, f'{stats.count} SQL statements, the budget is {stats.budget}')
+
+    if problems:
+        message = f'{get_endpoint_name()}: ' + '; '.join(problems)
+        if config.get('SQL_BUDGET_ACTION') == 'raise':
+            raise SQLBudgetExceeded(message)
+        current_app.logger.warning(message)
+
+    return response
+
+
+def sql_budget(statements):
+    """ SQL budget decorator. Sets the SQL statements budget of an endpoint
+        when the statements are recorded
+
+        Args:
+            statements (int): statements the endpoint can run
+        Returns:
+            decorator (function): endpoint decorator
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            stats = g.get('sql_stats')
+            if stats is not None:
+                stats.budget = statements
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+def init_sql_instrumentation(app):
+    """
+        Records the SQL statements of every request of the application.
+        The engine events are only registered when the instrumentation is
+        enabled, the requests of the other applications aren't recorded.
+        Args:
+            app(Flask): application
+    """
+
+    listen_to_engines()
+    app.before_request(start_statement_stats)
+    app.after_request(report_statement_stats)
+    app.teardown_request(stop_statement_stats)
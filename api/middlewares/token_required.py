@@ -1,10 +1,9 @@
 """ Module for auth token validation """
 
-import os
 from functools import wraps
-import jwt
-from flask import request
+from flask import g, request
 from api.utilities.helpers.responses import error_response
+from api.utilities.principal import Principal, decode_auth_token
 
 
 def token_required(f):
@@ -23,15 +22,13 @@ def token_required(f):
 
         if not token:
             message = 'No authorization token provided'
-            error_response['message'] = message
-            return error_response, 401
+            return error_response(message), 401
 
         try:
-            decoded_token = jwt.decode(token, os.getenv(
-                'SECRET_KEY'), algorithms=['HS256'])
+            decoded_token = decode_auth_token(token)
         except:
-            error_response['message'] = 'The provided authorization token is invalid'
-            return error_response, 401
+            return error_response('The provided authorization token is invalid'), 401
         setattr(request, 'decoded_token', decoded_token)
+        g.principal = Principal(decoded_token)
         return f(*args, **kwargs)
     return decorated
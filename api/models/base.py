@@ -1,6 +1,8 @@
 """ Module for the base Model """
 
 import datetime
+from sqlalchemy import event
+from api.utilities.cache import invalidate
 from .database import db
 
 
@@ -9,30 +11,54 @@ class BaseModel(db.Model):
 
     __abstract__ = True
 
+    # Namespace of the cached responses serving this model and the
+    # namespaces of the responses embedding it
+    cache_namespace = None
+    cache_dependents = ()
+
     id = db.Column(db.Integer, primary_key=True)
     created_at = db.Column(db.DateTime)
     updated_at = db.Column(db.DateTime)
 
-    def save(self):
-        """ Save a model instance """
+    def save(self, commit=True):
+        """ Save a model instance, only flushed when commit is False """
 
         self.created_at = datetime.datetime.utcnow()
         db.session.add(self)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
 
-    def update(self, data):
+    def update(self, data, commit=True):
         """ Update a model instance """
 
         for key, item in data.items():
             setattr(self, key, item)
         self.updated_at = datetime.datetime.utcnow()
-        db.session.commit()
+        if commit:
+            db.session.commit()
 
-    def delete(self):
+    def delete(self, commit=True):
         """ Delete a model instance """
 
         db.session.delete(self)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+
+    @classmethod
+    def mark_changed(cls, instance_id, listed=True):
+        """ Invalidates the cached responses of an instance changed without
+            the ORM (e.g. by a bulk UPDATE) once the transaction is committed.
+            Only the responses of the instance itself are invalidated when
+            listed is False, the listings and the dependents serve the
+            change once their TTL expires.
+        """
+
+        if cls.cache_namespace:
+            db.session.info.setdefault('cache_invalidations', set()).add(
+                (cls.cache_namespace, instance_id,
+                 cls.cache_dependents if listed else (), listed))
 
     @classmethod
     def find_by_id(cls, instance_id):
@@ -42,3 +68,30 @@ class BaseModel(db.Model):
         if instance:
             return instance
         return None
+
+
+@event.listens_for(db.session, 'after_flush')
+def collect_cache_invalidations(session, flush_context):
+    """ Collects the cached model instances changed by a flush """
+
+    invalidations = session.info.setdefault('cache_invalidations', set())
+    for instance in session.new | session.dirty | session.deleted:
+        if getattr(instance, 'cache_namespace', None):
+            invalidations.add((instance.cache_namespace, instance.id,
+                               instance.cache_dependents, True))
+
+
+@event.listens_for(db.session, 'after_commit')
+def apply_cache_invalidations(session):
+    """ Invalidates the cached responses once the changes are committed """
+
+    for namespace, instance_id, dependents, listings in \
+            session.info.pop('cache_invalidations', set()):
+        invalidate(namespace, instance_id, dependents, listings)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_cache_invalidations(session):
+    """ Discards the invalidations of rolled back changes """
+
+    session.info.pop('cache_invalidations', None)
@@ -8,8 +8,10 @@ class Brand(BaseModel):
     """ Brand Model class """
 
     __tablename__ = 'brands'
+    cache_namespace = 'brands'
+    cache_dependents = ('products',)
 
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.Text, nullable=True)
     products = db.relationship(
-        'Product', backref='brand_products', lazy='joined')
+        'Product', backref='brand_products', lazy='select')
@@ -1,7 +1,13 @@
 """ Module for Cart Model """
 
+import datetime
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import lazyload, noload, selectinload
 from .database import db
 from .base import BaseModel
+from .cart_item import CartItem
+from .product import Product
 
 
 class Cart(BaseModel):
@@ -11,5 +17,115 @@ class Cart(BaseModel):
 
     user_id = db.Column(db.Integer, db.ForeignKey(
         'users.id'), unique=True, nullable=False)
+    # Summary of the items, maintained by the cart item events below
+    items_count = db.Column(db.Integer, nullable=False, default=0)
+    subtotal = db.Column(db.DECIMAL(12, 2), nullable=False, default=0)
     owner = db.relationship('User', backref='owner', lazy='joined')
     items = db.relationship('CartItem', backref='items', lazy='joined')
+
+    @classmethod
+    def find_by_user_for_update(cls, user_id):
+        """ Finds and locks the cart of a user until the end of the transaction,
+            serializing the concurrent changes of the same cart
+        """
+
+        return cls.query.options(lazyload('*'))\
+            .filter_by(user_id=user_id)\
+            .with_for_update()\
+            .first()
+
+    @classmethod
+    def find_by_user_with_items(cls, user_id):
+        """ Finds the cart of a user with the columns of its items and their
+            products shown by the cart, loaded with one query per table and
+            without the owner
+        """
+
+        return cls.query.options(
+            noload(cls.owner),
+            selectinload(cls.items)
+            .load_only(CartItem.quantity, CartItem.product_id)
+            .selectinload(CartItem.product)
+            .load_only(Product.name, Product.main_image, Product.price))\
+            .filter_by(user_id=user_id)\
+            .first()
+
+    @classmethod
+    def find_or_create_by_user_for_update(cls, user_id):
+        """ Finds and locks the cart of a user, creating it when missing.
+            The concurrent first adds of a user insert one cart, the others
+            wait for its transaction and then for its lock.
+        """
+
+        cart = cls.find_by_user_for_update(user_id)
+        if cart is None:
+            db.session.execute(insert(cls.__table__).values(
+                user_id=user_id,
+                items_count=0,
+                subtotal=0,
+                created_at=datetime.datetime.utcnow()
+            ).on_conflict_do_nothing(index_elements=[cls.user_id]))
+            cart = cls.find_by_user_for_update(user_id)
+        return cart
+
+    @classmethod
+    def add_to_summary(cls, connection, cart_id, product_id, quantity):
+        """ Adds a product quantity to the cart summary with one UPDATE
+            Args:
+                connection: connection of the flush
+                cart_id (int): cart ID
+                product_id (int): product ID
+                quantity (int): added quantity, negative when removed
+        """
+
+        price = select([Product.price]).where(Product.id == product_id).as_scalar()
+        connection.execute(cls.__table__.update()
+                           .where(cls.id == cart_id)
+                           .values(items_count=cls.items_count + quantity,
+                                   subtotal=cls.subtotal + quantity * price))
+
+    @classmethod
+    def refresh_summaries(cls, product_ids):
+        """ Recomputes the summary of the carts holding the products with
+            one UPDATE, e.g. after a change of their price
+            Args:
+                product_ids (list): product IDs
+        """
+
+        items_count = db.session.query(
+            func.coalesce(func.sum(CartItem.quantity), 0))\
+            .filter(CartItem.cart_id == cls.id)
+        subtotal = db.session.query(
+            func.coalesce(func.sum(CartItem.quantity * Product.price), 0))\
+            .join(Product, Product.id == CartItem.product_id)\
+            .filter(CartItem.cart_id == cls.id)
+        cart_ids = db.session.query(CartItem.cart_id)\
+            .filter(CartItem.product_id.in_(product_ids))
+        cls.query.filter(cls.id.in_(cart_ids)).update({
+            cls.items_count: items_count.as_scalar(),
+            cls.subtotal: subtotal.as_scalar()
+        }, synchronize_session=False)
+
+
+@event.listens_for(CartItem, 'after_insert')
+def add_item_to_summary(mapper, connection, item):
+    """ Adds a new cart item to its cart summary """
+
+    Cart.add_to_summary(connection, item.cart_id, item.product_id, item.quantity)
+
+
+@event.listens_for(CartItem, 'after_update')
+def update_item_in_summary(mapper, connection, item):
+    """ Adds the quantity change of a cart item to its cart summary """
+
+    added, _, deleted = db.inspect(item).attrs.quantity.history
+    if added and deleted:
+        Cart.add_to_summary(connection, item.cart_id, item.product_id,
+                            added[0] - deleted[0])
+
+
+@event.listens_for(CartItem, 'after_delete')
+def remove_item_from_summary(mapper, connection, item):
+    """ Removes a deleted cart item from its cart summary """
+
+    Cart.add_to_summary(connection, item.cart_id, item.product_id, -item.quantity)
@@ -1,5 +1,6 @@
 """ Module for Category Model """
 
+from sqlalchemy import func
 from .database import db
 from .base import BaseModel
 
@@ -8,10 +9,71 @@ class Category(BaseModel):
     """ Category Model class """
 
     __tablename__ = 'categories'
+    __table_args__ = (
+        db.Index('ix_categories_path', 'path',
+                 postgresql_ops={'path': 'text_pattern_ops'}),
+    )
+    cache_namespace = 'categories'
+    cache_dependents = ('products',)
 
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.Text, nullable=True)
     parent_id = db.Column(db.Integer, db.ForeignKey(
         'categories.id', ondelete='SET NULL'), nullable=True)
+    # Materialized path of the category IDs from the root, e.g. /1/4/9/
+    path = db.Column(db.Text, nullable=True)
     products = db.relationship(
-        'Product', cascade='all, delete-orphan', backref='category_products', lazy='joined')
+        'Product', cascade='all, delete-orphan', backref='category_products', lazy='select')
+
+    def make_path(self):
+        """ Generates the path of the category from its parent path """
+
+        parent_path = '/'
+        if self.parent_id:
+            parent_path = db.session.query(Category.path)\
+                .filter_by(id=self.parent_id).scalar()
+        return f'{parent_path}{self.id}/'
+
+    def save(self, commit=True):
+        """ Save a category, its path is set once its ID is generated """
+
+        super().save(commit=False)
+        self.path = self.make_path()
+        if commit:
+            db.session.commit()
+
+    def update(self, data, commit=True):
+        """ Update a category, moving its subtree when its parent changes """
+
+        moved = 'parent_id' in data and data['parent_id'] != self.parent_id
+        super().update(data, commit=False)
+
+        if moved:
+            old_path, self.path = self.path, self.make_path()
+            self.replace_subtree_path(old_path, self.path)
+
+        if commit:
+            db.session.commit()
+
+    def delete(self, commit=True):
+        """ Delete a category, its subcategories become root categories """
+
+        self.replace_subtree_path(self.path, '/')
+        # The subcategories parent_id is set to NULL by the database
+        Category.mark_changed(None)
+        super().delete(commit)
+
+    def replace_subtree_path(self, old_path, new_path):
+        """ Replaces the path prefix of the subcategories with one UPDATE """
+
+        Category.query.filter(Category.path.like(f'{old_path}%'),
+                              Category.id != self.id)\
+            .update({Category.path: func.concat(
+                new_path, func.substr(Category.path, len(old_path) + 1))},
+                synchronize_session=False)
+
+    @classmethod
+    def subtree_ids(cls, path):
+        """ Query of the IDs of the categories in the subtree of a path """
+
+        return db.session.query(cls.id).filter(cls.path.like(f'{path}%'))
@@ -1,7 +1,33 @@
 """ Module for initiliazing the database """
 
-from flask_sqlalchemy import SQLAlchemy
-from config.server import application
+from flask import g, has_app_context
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from sqlalchemy import orm
 
-# Init Database
-db = SQLAlchemy(application)
+
+class RoutingSession(SignallingSession):
+    """ Session sending the queries of the requests routed to a read replica
+        (see api/middlewares/read_replica.py) to the replica bind, the
+        flushes always go to the primary database
+    """
+
+    def __init__(self, db, **options):
+        self.db = db
+        super().__init__(db, **options)
+
+    def get_bind(self, mapper=None, clause=None):
+        replica = g.get('replica_bind') if has_app_context() else None
+        if replica is not None and not self._flushing:
+            return self.db.get_engine(self.app, bind=replica)
+        return super().get_bind(mapper, clause)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """ Flask-SQLAlchemy extension using the routing session """
+
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+# Init Database, bound to the application by create_app
+db = RoutingSQLAlchemy()
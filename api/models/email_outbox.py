@@ -0,0 +1,71 @@
+""" Module for EmailOutbox Model """
+
+import datetime
+from .database import db
+from .base import BaseModel
+
+
+class EmailOutbox(BaseModel):
+    """ EmailOutbox Model class, the emails waiting to be sent """
+
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt_at',
+                 'status', 'next_attempt_at'),
+    )
+
+    sender = db.Column(db.String(250), nullable=False)
+    recipient = db.Column(db.String(250), nullable=False)
+    subject = db.Column(db.String(250), nullable=False)
+    html = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False)
+    last_error = db.Column(db.Text)
+    sent_at = db.Column(db.DateTime)
+
+    @classmethod
+    def enqueue(cls, sender, recipient, subject, html):
+        """ Queues an email in the current transaction, it is only sent once
+            the caller commits the transaction
+        """
+
+        email = cls(sender=sender, recipient=recipient, subject=subject,
+                    html=html, next_attempt_at=datetime.datetime.utcnow())
+        email.save(commit=False)
+        db.session.info['emails_queued'] = True
+        return email
+
+    @classmethod
+    def claim_due(cls, batch_size):
+        """ Locks a batch of due emails until the end of the transaction.
+            Emails locked by another dispatcher are skipped.
+        """
+
+        return cls.query\
+            .filter(cls.status == 'pending',
+                    cls.next_attempt_at <= datetime.datetime.utcnow())\
+            .order_by(cls.next_attempt_at, cls.id)\
+            .limit(batch_size)\
+            .with_for_update(skip_locked=True)\
+            .all()
+
+    def mark_sent(self):
+        """ Marks the email as sent """
+
+        now = datetime.datetime.utcnow()
+        self.update({'status': 'sent', 'sent_at': now}, commit=False)
+
+    def mark_failed(self, error, max_attempts, backoff):
+        """ Schedules the next attempt with an exponential backoff, or gives
+            up once max_attempts is reached
+        """
+
+        attempts = self.attempts + 1
+        delay = datetime.timedelta(seconds=backoff * 2 ** (attempts - 1))
+        self.update({
+            'attempts': attempts,
+            'last_error': str(error),
+            'status': 'failed' if attempts >= max_attempts else 'pending',
+            'next_attempt_at': datetime.datetime.utcnow() + delay,
+        }, commit=False)
@@ -7,9 +7,12 @@ class Order(BaseModel):
     """ Order Model class """
 
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
 
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    # total_amount = db.Column(db.Float, nullable=False)
+    total_amount = db.Column(db.DECIMAL(12, 2), nullable=False, default=0)
     status = db.Column(db.String(50), nullable=False, default='Pending')
     user = db.relationship('User', backref='orders', lazy='joined')
     items = db.relationship('OrderItem', backref='order', lazy='joined', cascade='all, delete-orphan')
\ No newline at end of file
@@ -1,5 +1,6 @@
 """ Module for Order Items Model """
 
+import datetime
 from .database import db
 from .base import BaseModel
 
@@ -11,5 +12,24 @@ class OrderItem(BaseModel):
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id', ondelete='CASCADE'), nullable=False)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False, default=1)
+    unit_price = db.Column(db.DECIMAL(12, 2), nullable=False)
     product = db.relationship('Product', backref='order_items', lazy='joined')
 
+    @classmethod
+    def bulk_create(cls, order_id, items, prices):
+        """ Inserts the items of an order with a single INSERT statement
+
+            Args:
+                order_id (int): order ID
+                items (list): validated order items
+                prices (dict): unit price at checkout time by product ID
+        """
+
+        created_at = datetime.datetime.utcnow()
+        db.session.execute(cls.__table__.insert().values([{
+            'order_id': order_id,
+            'product_id': item['product_id'],
+            'quantity': item['quantity'],
+            'unit_price': prices[item['product_id']],
+            'created_at': created_at
+        } for item in items]))
@@ -1,22 +1,129 @@
 """ Module for Product Model """
 
-from sqlalchemy.dialects.postgresql import JSON, ARRAY
+import datetime
+from sqlalchemy import case, cast, func, Computed
+from sqlalchemy.orm import with_expression
+from sqlalchemy.dialects.postgresql import JSON, ARRAY, TSVECTOR
 from .database import db
 from .base import BaseModel
 
 
+class JSONArray(ARRAY):
+    """ Array of JSON values. psycopg2 sends the serialized items as a
+        text[] parameter, which PostgreSQL doesn't convert to json[] by itself
+    """
+
+    def bind_expression(self, bindvalue):
+        return cast(bindvalue, self)
+
+
 class Product(BaseModel):
     """ Product Model class """
 
     __tablename__ = 'products'
+    __table_args__ = (
+        db.Index('ix_products_created_at_id', 'created_at', 'id'),
+        db.Index('ix_products_category_id_price', 'category_id', 'price'),
+        db.Index('ix_products_brand_id_price', 'brand_id', 'price'),
+        db.Index('ix_products_search_vector', 'search_vector',
+                 postgresql_using='gin'),
+    )
+    cache_namespace = 'products'
+    cache_dependents = ('categories', 'brands')
 
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.Text, nullable=True)
     main_image = db.Column(JSON, nullable=False)
-    images = db.Column(ARRAY(JSON), nullable=True)
+    images = db.Column(JSONArray(JSON), nullable=True)
     category_id = db.Column(db.Integer, db.ForeignKey(
         'categories.id'), nullable=False)
     brand_id = db.Column(db.Integer, db.ForeignKey(
         'brands.id', ondelete='SET NULL'), nullable=True)
     price = db.Column(db.DECIMAL(12, 2), nullable=False)
     quantity = db.Column(db.Integer, nullable=False, default=0)
+    # Maintained by PostgreSQL, only loaded when accessed
+    search_vector = db.deferred(db.Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True)))
+    search_rank = db.query_expression()
+
+    def update(self, data, commit=True):
+        """ Update a product, refreshing the summary of the carts holding it
+            when its price changes
+        """
+
+        # Imported here since the cart model imports this module
+        from .cart import Cart
+
+        repriced = 'price' in data and data['price'] != self.price
+        super().update(data, commit=False)
+        if repriced:
+            db.session.flush()
+            Cart.refresh_summaries([self.id])
+
+        if commit:
+            db.session.commit()
+
+    @classmethod
+    def search(cls, text):
+        """ Finds the products matching a web search style text (e.g. `red
+            shoes -leather`), with their rank as search_rank
+
+            Args:
+                text (str): search text
+            Returns:
+                (tuple): products query and rank column
+        """
+
+        search_query = func.websearch_to_tsquery('english', text)
+        rank = cast(func.ts_rank(cls.search_vector, search_query),
+                    db.Float).label('search_rank')
+        query = cls.query.options(with_expression(cls.search_rank, rank))\
+            .filter(cls.search_vector.op('@@')(search_query))
+        return query, rank
+
+    @classmethod
+    def reserve_stock(cls, product_id, quantity):
+        """ Atomically takes the quantity out of the product stock
+
+            Args:
+                product_id (int): product ID
+                quantity (int): quantity to take
+            Returns:
+                (bool): False if the product doesn't exist or is not available
+        """
+
+        updated_rows = cls.query.filter(
+            cls.id == product_id, cls.quantity >= quantity).update({
+                cls.quantity: cls.quantity - quantity,
+                cls.updated_at: datetime.datetime.utcnow()
+            }, synchronize_session=False)
+        cls.mark_changed(product_id, listed=False)
+        return updated_rows == 1
+
+    @classmethod
+    def release_stock(cls, product_id, quantity):
+        """ Atomically puts the quantity back into the product stock """
+
+        cls.query.filter(cls.id == product_id).update({
+            cls.quantity: cls.quantity + quantity,
+            cls.updated_at: datetime.datetime.utcnow()
+        }, synchronize_session=False)
+        cls.mark_changed(product_id, listed=False)
+
+    @classmethod
+    def take_stock(cls, quantities):
+        """ Takes the quantities out of the products stock with one UPDATE.
+            The products must have been locked and their stock checked.
+
+            Args:
+                quantities (dict): quantity to take by product ID
+        """
+
+        cls.query.filter(cls.id.in_(quantities)).update({
+            cls.quantity: cls.quantity - case(quantities, value=cls.id),
+            cls.updated_at: datetime.datetime.utcnow()
+        }, synchronize_session=False)
+        for product_id in quantities:
+            cls.mark_changed(product_id, listed=False)
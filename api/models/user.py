@@ -8,6 +8,7 @@ class User(BaseModel):
     """ User Model class """
 
     __tablename__ = 'users'
+    cache_namespace = 'users'
 
     firstname = db.Column(db.String(100), nullable=False)
     lastname = db.Column(db.String(100), nullable=False)
@@ -11,4 +11,5 @@ class BrandSchema(BaseSchema):
 
     name = fields.String(required=True)
     description = fields.String(required=True)
+    products_count = fields.Integer(dump_only=True)
     products = fields.Nested(ProductSchema(many=True, exclude=EXCLUDED_FIELDS))
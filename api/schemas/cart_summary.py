@@ -0,0 +1,10 @@
+""" Module for the Cart Summary Schema """
+
+from marshmallow import Schema, fields
+
+
+class CartSummarySchema(Schema):
+    """ Cart Summary Schema Class """
+
+    items_count = fields.Integer(required=True)
+    subtotal = fields.Decimal(required=True, as_string=True)
@@ -12,4 +12,5 @@ class CategorySchema(BaseSchema):
     name = fields.String(required=True)
     description = fields.String(required=True)
     parent_id = fields.Integer(required=True)
+    products_count = fields.Integer(dump_only=True)
     products = fields.Nested(ProductSchema(many=True, exclude=EXCLUDED_FIELDS))
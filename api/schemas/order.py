@@ -10,4 +10,4 @@ class OrderSchema(BaseSchema):
 
     user = fields.Nested(UserSchema(exclude=['password', 'is_admin', 'is_activated']))
     items = fields.Nested(OrderItemSchema(many=True))
-    total_amount = fields.Float(dump_only=True)  # Add this line
+    total_amount = fields.Decimal(dump_only=True, as_string=True)
@@ -8,5 +8,6 @@ class OrderItemSchema(BaseSchema):
     """ OrderItem Schema Class """
 
     quantity = fields.Integer(required=True)
+    unit_price = fields.Decimal(dump_only=True, as_string=True)
     product = fields.Nested(ProductSchema(exclude=['quantity', 'brand_id', 'description', 'category_id', 'images']))
 
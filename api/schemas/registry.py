@@ -0,0 +1,193 @@
+""" Module for the schema registry and the fast dumpers """
+
+import decimal
+from marshmallow import fields, missing
+from api.utilities.helpers.constants import EXCLUDED_FIELDS
+from .brand import BrandSchema
+from .cart import CartSchema
+from .cart_summary import CartSummarySchema
+from .category import CategorySchema
+from .order import OrderSchema
+from .product import ProductSchema
+from .user import UserSchema
+
+_schemas = {}
+_dumpers = {}
+
+
+def get_schema(schema_class, exclude=(), many=False):
+    """
+        Gets the shared instance of a schema variant, built on first use
+        Args:
+            schema_class: marshmallow schema class
+            exclude(list): excluded fields
+            many(bool): True to dump lists
+
+        Returns:
+            Schema: schema instance
+    """
+
+    key = (schema_class, tuple(sorted(exclude)), many)
+    schema = _schemas.get(key)
+    if schema is None:
+        schema = _schemas[key] = schema_class(exclude=key[1], many=many)
+    return schema
+
+
+def get_dumper(schema_class, exclude=(), many=False):
+    """
+        Gets the fast dumper of a schema variant, built on first use
+        Args:
+            schema_class: marshmallow schema class
+            exclude(list): excluded fields
+            many(bool): True to dump lists
+
+        Returns:
+            FastDumper: dumper with the schema dump interface
+    """
+
+    key = (schema_class, tuple(sorted(exclude)), many)
+    dumper = _dumpers.get(key)
+    if dumper is None:
+        dumper = _dumpers[key] = FastDumper(
+            get_schema(schema_class, exclude, many))
+    return dumper
+
+
+def dump_integer(value):
+    """ Integer field serialization """
+
+    return None if value is None else int(value)
+
+
+def dump_string(value):
+    """ String field serialization """
+
+    return None if value is None else str(value)
+
+
+def dump_decimal_string(value):
+    """ Decimal field serialization with as_string """
+
+    return None if value is None else format(decimal.Decimal(str(value)), 'f')
+
+
+def dump_datetime(value):
+    """ DateTime field serialization in the ISO format """
+
+    return None if value is None else value.isoformat()
+
+
+def dump_list(value):
+    """ List of Dict fields serialization """
+
+    return None if value is None else list(value)
+
+
+def dump_raw(value):
+    """ Dict field serialization """
+
+    return value
+
+
+def make_converter(field):
+    """
+        Resolves the conversion of a field value once, None when the field
+        must go through marshmallow
+        Args:
+            field: marshmallow field
+
+        Returns:
+            function: value converter
+    """
+
+    field_type = type(field)
+    if field_type is fields.Nested:
+        nested_dumper = FastDumper(field.schema)
+        return lambda value: None if value is None else nested_dumper.dump(value)
+
+    if field_type is fields.Integer and not field.as_string:
+        return dump_integer
+
+    if field_type is fields.Decimal and field.as_string and field.places is None:
+        return dump_decimal_string
+
+    if field_type is fields.String:
+        return dump_string
+
+    if field_type is fields.DateTime and field.format in (None, 'iso', 'iso8601'):
+        return dump_datetime
+
+    if field_type is fields.Dict and not field.key_field and not field.value_field:
+        return dump_raw
+
+    if field_type is fields.List and type(field.inner) is fields.Dict \
+            and not field.inner.key_field and not field.inner.value_field:
+        return dump_list
+
+    return None
+
+
+class FastDumper:
+    """ Dumps objects like its marshmallow schema, reading the attributes
+        directly and converting them with functions resolved once per field
+        instead of the per-field dispatch of Schema.dump
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.many = schema.many
+        self.fields = [
+            (field.data_key or name, field.attribute or name, field,
+             make_converter(field))
+            for name, field in schema.dump_fields.items()
+        ]
+
+    def dump_one(self, obj):
+        """ Dumps a single object """
+
+        data = {}
+        for key, attribute, field, convert in self.fields:
+            if convert is None:
+                value = field.serialize(attribute, obj,
+                                        accessor=self.schema.get_attribute)
+            else:
+                value = getattr(obj, attribute, missing)
+                if value is not missing:
+                    value = convert(value)
+            if value is not missing:
+                data[key] = value
+        return data
+
+    def dump(self, obj):
+        """ Dumps an object, or a list of objects for a many schema """
+
+        if self.many:
+            return [self.dump_one(item) for item in obj]
+        return self.dump_one(obj)
+
+
+# Variants used by the endpoints, built once at import
+for variant in [
+        (ProductSchema, (), False),
+        (ProductSchema, (), True),
+        (CartSchema, EXCLUDED_FIELDS, False),
+        (CartSchema, EXCLUDED_FIELDS + ['owner'], False),
+        (CartSummarySchema, (), False),
+        (OrderSchema, (), False),
+        (OrderSchema, (), True)]:
+    get_dumper(*variant)
+
+for variant in [
+        (CategorySchema, ['products'], False),
+        (CategorySchema, ['products'], True),
+        (CategorySchema, [], True),
+        (CategorySchema, [], False),
+        (CategorySchema, ['products', 'products_count'], True),
+        (BrandSchema, ['products'], False),
+        (BrandSchema, ['products'], True),
+        (BrandSchema, [], True),
+        (BrandSchema, [], False),
+        (UserSchema, [], False),
+        (UserSchema, ['password'], False)]:
+    get_schema(*variant)
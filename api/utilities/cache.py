@@ -0,0 +1,301 @@
+""" Module for caching public read responses """
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, g, request, Response
+from flask.signals import Namespace
+from .conditional_request import is_not_modified, not_modified_response
+
+_cache = None
+_invalidation_callbacks = []
+GENERATION_TTL = 24 * 60 * 60
+signals = Namespace()
+# Sent by cached_response with the namespace and whether the response was
+# served from the cache
+cache_looked_up = signals.signal('cache-looked-up')
+
+
+class BaseCache:
+    """ Base cache class keeping the hit and miss counters """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _record(self, value):
+        """ Records a cache lookup """
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self):
+        """ Returns the cache counters """
+
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+class LRUCache(BaseCache):
+    """ In-process least recently used cache with a TTL per entry.
+        Every worker process holds its own copy, so an entry written by
+        another process is only refreshed once its TTL expires.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """ Gets a cached value, None when missing or expired """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return self._record(entry and entry[1])
+
+    def set(self, key, value, ttl=None):
+        """ Caches a value """
+
+        expires_at = time.monotonic() + (ttl or self.ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """ Deletes an entry """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        """ Deletes every entry whose key starts with the prefix """
+
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        """ Deletes every entry """
+
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedCache(BaseCache):
+    """ Cache shared by every worker process, backed by a key-value store
+        client exposing the redis-py get/set/mget/incr/expire interface.
+        A prefix is deleted by bumping its generation counter, stored with
+        the keys under it, rather than by scanning the store. The entries of
+        an older generation are never read again and expire with their TTL.
+    """
+
+    def __init__(self, client, ttl=60, key_prefix='dash-shop:'):
+        super().__init__(ttl)
+        self.client = client
+        self.key_prefix = key_prefix
+        # Outlives the entries, so a counter expiring and restarting from
+        # zero can't make an older generation current again
+        self.generation_ttl = max(GENERATION_TTL, 10 * ttl)
+
+    def _generation_key(self, prefix):
+        """ Gets the store key of the generation counter of a prefix """
+
+        return f'{self.key_prefix}generation#{prefix}'
+
+    def _store_key(self, key):
+        """ Gets the store key of an entry, with the current generations of
+            the whole cache, of its namespace and of its resource
+        """
+
+        parts = key.split(':', 2)
+        prefixes = [''] + [':'.join(parts[:index]) + ':'
+                           for index in range(1, min(len(parts), 3))]
+        generations = self.client.mget(
+            [self._generation_key(prefix) for prefix in prefixes])
+        version = '.'.join(str(int(generation or 0)) for generation in generations)
+        return f'{self.key_prefix}{key}#{version}'
+
+    def get(self, key):
+        """ Gets a cached value, None when missing or expired """
+
+        value = self.client.get(self._store_key(key))
+        return self._record(value and json.loads(value))
+
+    def set(self, key, value, ttl=None):
+        """ Caches a value """
+
+        self.client.set(self._store_key(key), json.dumps(value),
+                        ex=ttl or self.ttl)
+
+    def delete(self, key):
+        """ Deletes an entry """
+
+        self.client.delete(self._store_key(key))
+
+    def delete_prefix(self, prefix):
+        """ Deletes every entry whose key starts with the prefix, which must
+            be the whole cache (''), a namespace ('products:') or a resource
+            of a namespace ('products:12:')
+        """
+
+        if prefix and (not prefix.endswith(':') or prefix.count(':') > 2):
+            raise ValueError(f'Invalid cache prefix {prefix!r}')
+
+        generation_key = self._generation_key(prefix)
+        self.client.incr(generation_key)
+        self.client.expire(generation_key, self.generation_ttl)
+
+    def clear(self):
+        """ Deletes every entry """
+
+        self.delete_prefix('')
+
+
+def create_cache(config, key_prefix='dash-shop:'):
+    """
+        Creates the cache backend from the app configuration
+        Args:
+            config(dict): app configuration
+            key_prefix(str): prefix of the keys in the shared store, a store
+                apart from the application cache has its own
+
+        Returns:
+            LRUCache|SharedCache: cache backend
+    """
+
+    ttl = config.get('CACHE_TTL', 60)
+    if config.get('CACHE_BACKEND') == 'redis':
+        import redis
+
+        client = redis.Redis.from_url(config['CACHE_URL'])
+        return SharedCache(client, ttl=ttl, key_prefix=key_prefix)
+
+    return LRUCache(config.get('CACHE_MAX_ENTRIES', 1024), ttl=ttl)
+
+
+def get_cache():
+    """ Gets the application cache, creating it on first use """
+
+    global _cache
+    if _cache is None:
+        _cache = create_cache(current_app.config)
+    return _cache
+
+
+def set_cache(cache):
+    """ Replaces the application cache, e.g. with a local stand-in """
+
+    global _cache
+    _cache = cache
+
+
+def on_invalidate(callback):
+    """ Registers a function called with (namespace, instance_id) whenever
+        a cached namespace is invalidated
+    """
+
+    _invalidation_callbacks.append(callback)
+    return callback
+
+
+def invalidate(namespace, instance_id=None, dependents=(), listings=True):
+    """
+        Invalidates the cached responses of a model instance
+        Args:
+            namespace(str): cache namespace of the model
+            instance_id(int): ID of the changed instance, None clears the namespace
+            dependents(tuple): namespaces whose responses embed the model
+            listings(bool): False keeps the cached listings of the namespace
+    """
+
+    # Nothing has been cached yet when the cache was never created
+    if _cache is not None:
+        if instance_id is None:
+            _cache.delete_prefix(f'{namespace}:')
+        else:
+            _cache.delete_prefix(f'{namespace}:{instance_id}:')
+            if listings:
+                _cache.delete_prefix(f'{namespace}:list:')
+
+        for dependent in dependents:
+            _cache.delete_prefix(f'{dependent}:')
+
+    for callback in _invalidation_callbacks:
+        callback(namespace, instance_id)
+
+
+def make_cache_key(namespace, view_kwargs):
+    """
+        Generates the cache key of the current request
+        Args:
+            namespace(str): cache namespace of the resource
+            view_kwargs(dict): URL params of the resource
+
+        Returns:
+            str: cache key
+    """
+
+    resource_id = next(iter(view_kwargs.values()), 'list')
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f'{namespace}:{resource_id}:{request.path}?{query}'
+
+
+def cached_response(namespace):
+    """ Cache decorator. Serves successful GET responses from the cache,
+        with their validator headers (see conditional_get) checked against
+        the request
+
+        Args:
+            namespace(str): cache namespace of the resource
+        Returns:
+            decorator (function): Decorator
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            cache = get_cache()
+            key = make_cache_key(namespace, kwargs)
+            replica = g.get('replica_bind')
+            cached = cache.get(key)
+            # The responses read from a lagging replica are not served to
+            # the clients reading their own writes from the primary
+            hit = cached is not None and (replica or not cached[2])
+            cache_looked_up.send(None, namespace=namespace, hit=hit)
+            if hit:
+                response, status, _, headers = cached
+                if headers and is_not_modified(headers):
+                    return not_modified_response(headers)
+                return response, status, dict(headers, **{'X-Cache': 'HIT'})
+
+            result = f(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+
+            response, status, *headers = result
+            headers = dict(headers[0]) if headers else {}
+            if status == 200:
+                # and they are only cached for the read-your-writes window
+                ttl = current_app.config.get('READ_YOUR_WRITES_WINDOW', 5) \
+                    if replica else None
+                # The body is built per request and never mutated afterwards
+                cache.set(key, [response, status, replica is not None,
+                                headers], ttl)
+
+            return response, status, dict(headers, **{'X-Cache': 'MISS'})
+        return decorated
+    return decorator
@@ -0,0 +1,33 @@
+""" Module for the category tree """
+
+from api.models.category import Category
+from api.schemas.category import CategorySchema
+from api.schemas.registry import get_schema
+
+
+def build_category_tree():
+    """
+        Loads every category with one query and nests the subcategories
+        under their parent
+
+        Returns:
+            list: serialized root categories with their children
+    """
+
+    # A parent path is a prefix of its children paths, so it sorts first
+    categories = Category.query.order_by(Category.path).all()
+    categories_schema = get_schema(
+        CategorySchema, exclude=['products', 'products_count'], many=True)
+
+    nodes = {}
+    roots = []
+    for category, node in zip(categories, categories_schema.dump(categories)):
+        node['children'] = []
+        nodes[category.id] = node
+        parent = nodes.get(category.parent_id)
+        if parent is None:
+            roots.append(node)
+        else:
+            parent['children'].append(node)
+
+    return roots
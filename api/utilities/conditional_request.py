@@ -0,0 +1,154 @@
+""" Module for HTTP conditional GET requests """
+
+import hashlib
+from functools import wraps
+from flask import request, Response
+from werkzeug.http import parse_date, unquote_etag
+from sqlalchemy import func
+from api.models.database import db
+
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+def modified_at(model):
+    """ Last modification date column expression of a model """
+
+    return func.coalesce(model.updated_at, model.created_at)
+
+
+def get_resource_state(model, instance_id, dependencies):
+    """
+        Gets the state of a resource in one query: the last modification
+        date of the record and of its dependencies plus the dependencies count
+        Args:
+            model: model of the resource
+            instance_id(int): record ID, None for a listing
+            dependencies(tuple): models embedded in the resource
+
+        Returns:
+            tuple: last modification date of the record (None for a
+                listing) and the aggregates, None when the record doesn't exist
+    """
+
+    if instance_id is None:
+        models = (model,) + dependencies
+        columns = []
+    else:
+        models = dependencies
+        columns = [db.session.query(modified_at(model))
+                   .filter(model.id == instance_id).as_scalar(),
+                   db.session.query(model.id)
+                   .filter(model.id == instance_id).as_scalar()]
+
+    for dependency in models:
+        columns.append(db.session.query(
+            func.max(modified_at(dependency))).as_scalar())
+        columns.append(db.session.query(func.count(dependency.id)).as_scalar())
+
+    state = db.session.query(*columns).one()
+    if instance_id is None:
+        return None, state
+
+    if state[1] is None:
+        return None
+    return state[0], state
+
+
+def make_etag(state):
+    """
+        Generates a weak entity tag for the current request
+        Args:
+            state(tuple): state of the resource
+
+        Returns:
+            str: entity tag
+    """
+
+    query = sorted(request.args.items(multi=True))
+    digest = hashlib.sha1(
+        f'{request.path}|{query}|{state}'.encode('utf-8')).hexdigest()
+    return digest
+
+
+def get_validators(model, instance_id, dependencies):
+    """
+        Gets the validator headers of the current request: the ETag, and the
+        Last-Modified date of a single record without dependencies. The max
+        modification date of the dependencies (or of a listing) doesn't move
+        when one of them is deleted, only the count in the ETag catches it.
+        Args:
+            model: model of the resource
+            instance_id(int): record ID, None for a listing
+            dependencies(tuple): models embedded in the resource
+
+        Returns:
+            dict: validator headers, None when the record doesn't exist
+    """
+
+    resource_state = get_resource_state(model, instance_id, dependencies)
+    if resource_state is None:
+        return None
+
+    last_modified, state = resource_state
+    response = Response()
+    response.set_etag(make_etag(state), weak=True)
+    if last_modified is not None and not dependencies:
+        response.last_modified = last_modified
+
+    return {key: value for key, value in response.headers.items()
+            if key in VALIDATOR_HEADERS}
+
+
+def is_not_modified(validators):
+    """ Checks the request validators against the current ones """
+
+    if request.if_none_match:
+        etag, _ = unquote_etag(validators['ETag'])
+        return request.if_none_match.contains_weak(etag)
+
+    since = request.if_modified_since
+    last_modified = parse_date(validators.get('Last-Modified'))
+    if since is None or last_modified is None:
+        return False
+
+    return last_modified <= since
+
+
+def not_modified_response(validators):
+    """ Builds the 304 response of a fresh client copy """
+
+    return Response(status=304, headers=validators)
+
+
+def conditional_get(model, *dependencies):
+    """ Conditional GET decorator. Adds the validator headers and answers 304
+        without running the view when the client copy is still fresh.
+        Applied under cached_response, which keeps the validators with the
+        cached response and answers its hits without querying them again.
+
+        Args:
+            model: model of the resource
+            dependencies(tuple): models embedded in the resource
+        Returns:
+            decorator (function): Decorator
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            instance_id = next(iter(kwargs.values()), None)
+            validators = get_validators(model, instance_id, dependencies)
+
+            if validators is None:
+                return f(*args, **kwargs)
+
+            if is_not_modified(validators):
+                return not_modified_response(validators)
+
+            body, status, *headers = f(*args, **kwargs)
+            headers = dict(headers[0]) if headers else {}
+            if status == 200:
+                headers.update(validators)
+
+            return body, status, headers
+        return decorated
+    return decorator
@@ -0,0 +1,144 @@
+""" Module for sending the queued emails """
+
+import smtplib
+import threading
+import time
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from flask_mail import Message
+from sqlalchemy import event
+from config.server import mail
+from api.models.database import db
+from api.models.email_outbox import EmailOutbox
+
+# Errors concerning a single message, the connection remains usable
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException)
+
+_dispatcher = None
+
+
+def dispatch_emails():
+    """
+    Sends one batch of due emails over a single SMTP connection.
+    An email rejected by the server is retried with a backoff, and a
+    connection failure postpones every email not sent yet.
+
+    Returns:
+        (int): number of emails processed
+    """
+
+    config = current_app.config
+    max_attempts = config.get('EMAIL_MAX_ATTEMPTS', 5)
+    backoff = config.get('EMAIL_RETRY_BACKOFF', 30)
+    emails = EmailOutbox.claim_due(config.get('EMAIL_BATCH_SIZE', 50))
+    pending = list(emails)
+
+    try:
+        if pending:
+            with mail.connect() as connection:
+                while pending:
+                    email = pending[0]
+                    message = Message(email.subject, sender=email.sender,
+                                      recipients=[email.recipient],
+                                      html=email.html)
+                    try:
+                        connection.send(message)
+                        email.mark_sent()
+                    except MESSAGE_ERRORS as error:
+                        email.mark_failed(error, max_attempts, backoff)
+                    pending.pop(0)
+    except (smtplib.SMTPException, OSError) as error:
+        for email in pending:
+            email.mark_failed(error, max_attempts, backoff)
+
+    db.session.commit()
+    return len(emails)
+
+
+def dispatch_all_emails():
+    """ Sends the due emails batch after batch """
+
+    while dispatch_emails():
+        pass
+
+
+class EmailDispatcher:
+    """ Background thread of a worker process sending the queued emails
+        as soon as they are queued, and every poll interval for the retries
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def notify(self):
+        """ Wakes the dispatcher up, starting it on first use """
+
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name='email-dispatcher', daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+
+    def run(self):
+        """ Dispatches the emails until the process exits """
+
+        interval = self.app.config.get('EMAIL_POLL_INTERVAL', 10)
+        while True:
+            self.wakeup.wait(interval)
+            self.wakeup.clear()
+            with self.app.app_context():
+                try:
+                    dispatch_all_emails()
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception('Email dispatch failed')
+
+
+def notify_dispatcher():
+    """ Notifies the in-process dispatcher of a queued email, when emails are
+        not sent by a separate worker. Also called on the first request of a
+        worker process, the dispatcher then sends the emails left pending by
+        the previous processes.
+    """
+
+    global _dispatcher
+    if current_app.config.get('EMAIL_DISPATCHER', 'thread') != 'thread':
+        return
+
+    if _dispatcher is None:
+        _dispatcher = EmailDispatcher(current_app._get_current_object())
+    _dispatcher.notify()
+
+
+@event.listens_for(db.session, 'after_commit')
+def notify_committed_emails(session):
+    """ Notifies the dispatcher once the queued emails are committed """
+
+    if session.info.pop('emails_queued', False):
+        notify_dispatcher()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_queued_emails(session):
+    """ The emails of a rolled back transaction are never sent """
+
+    session.info.pop('emails_queued', None)
+
+
+@click.command('send-emails')
+@click.option('--once', is_flag=True, help='Send the due emails and exit.')
+@with_appcontext
+def send_emails_command(once):
+    """ Sends the queued emails """
+
+    interval = current_app.config.get('EMAIL_POLL_INTERVAL', 10)
+    while True:
+        dispatch_all_emails()
+        if once:
+            break
+        time.sleep(interval)
@@ -0,0 +1,161 @@
+""" Module for the product listing filters, sorting and facets """
+
+import decimal
+from flask import request
+from sqlalchemy import func
+from api.models.database import db
+from api.models.product import Product
+from .validators import is_positive_integer, raise_validation_error
+
+SORT_KEYS = {
+    'price': (Product.price, Product.id),
+    'created_at': (Product.created_at, Product.id),
+}
+
+
+def get_id_param(key):
+    """ Gets a positive integer request param, None when missing """
+
+    value = request.args.get(key)
+    if value is None:
+        return None
+
+    try:
+        value = int(value)
+    except ValueError:
+        value = None
+    if not is_positive_integer(value):
+        raise_validation_error(
+            f'The {key} must be a positive integer greater than 0')
+
+    return value
+
+
+def get_price_param(key):
+    """ Gets a positive decimal request param, None when missing """
+
+    value = request.args.get(key)
+    if value is None:
+        return None
+
+    try:
+        value = decimal.Decimal(value)
+    except decimal.InvalidOperation:
+        value = None
+    if value is None or not value.is_finite() or value < 0:
+        raise_validation_error(f'The {key} must be a positive number')
+
+    return value
+
+
+def get_boolean_param(key):
+    """ Gets a true or false request param, None when missing """
+
+    value = request.args.get(key)
+    if value is None:
+        return None
+
+    if value.lower() not in ('true', 'false'):
+        raise_validation_error(f'The {key} must be either true or false')
+
+    return value.lower() == 'true'
+
+
+def get_product_filters():
+    """
+        Generates the product filters from the request params
+        (category_id, brand_id, min_price, max_price and in_stock)
+
+        Returns:
+            dict: filter criteria by param name
+    """
+
+    filters = {}
+
+    category_id = get_id_param('category_id')
+    if category_id is not None:
+        filters['category_id'] = Product.category_id == category_id
+
+    brand_id = get_id_param('brand_id')
+    if brand_id is not None:
+        filters['brand_id'] = Product.brand_id == brand_id
+
+    min_price = get_price_param('min_price')
+    if min_price is not None:
+        filters['min_price'] = Product.price >= min_price
+
+    max_price = get_price_param('max_price')
+    if max_price is not None:
+        filters['max_price'] = Product.price <= max_price
+
+    in_stock = get_boolean_param('in_stock')
+    if in_stock is not None:
+        if in_stock:
+            filters['in_stock'] = Product.quantity > 0
+        else:
+            filters['in_stock'] = Product.quantity == 0
+
+    return filters
+
+
+def get_sort_params():
+    """
+        Generates the sort keys from the `sort` request param, a key name
+        optionally prefixed by `-` for a descending order
+
+        Returns:
+            tuple: sort columns and direction
+    """
+
+    sort = request.args.get('sort', 'created_at')
+    descending = sort.startswith('-')
+    keys = SORT_KEYS.get(sort[1:] if descending else sort)
+
+    if keys is None:
+        choices = ', '.join(f'{key}, -{key}' for key in SORT_KEYS)
+        raise_validation_error(f'The sort must be one of: {choices}')
+
+    return keys, descending
+
+
+def get_product_facets(filters):
+    """
+        Counts the filtered products per category and per brand with one
+        GROUPING SETS query. Each facet ignores its own filter, so that the
+        other categories (or brands) remain countable once one is selected.
+        Args:
+            filters(dict): filter criteria by param name
+
+        Returns:
+            dict: products count per category ID and per brand ID
+    """
+
+    common_filters = [criterion for key, criterion in filters.items()
+                      if key not in ('category_id', 'brand_id')]
+    category_count = func.count(Product.id)
+    brand_count = func.count(Product.id)
+    if 'brand_id' in filters:
+        category_count = category_count.filter(filters['brand_id'])
+    if 'category_id' in filters:
+        brand_count = brand_count.filter(filters['category_id'])
+
+    rows = db.session.query(
+        func.grouping(Product.category_id),
+        Product.category_id,
+        Product.brand_id,
+        category_count,
+        brand_count)\
+        .filter(*common_filters)\
+        .group_by(func.grouping_sets(Product.category_id, Product.brand_id))\
+        .all()
+
+    facets = {'categories': [], 'brands': []}
+    for is_brand_row, category_id, brand_id, category_count, brand_count \
+            in sorted(rows, key=lambda row: (row[0], row[1] or 0, row[2] or 0)):
+        if not is_brand_row and category_count:
+            facets['categories'].append(
+                {'id': category_id, 'count': category_count})
+        elif is_brand_row and brand_id is not None and brand_count:
+            facets['brands'].append({'id': brand_id, 'count': brand_count})
+
+    return facets
@@ -1,6 +1,7 @@
 """ Module for generating the tokens """
 
 import datetime
+import functools
 import os
 import jwt
 from itsdangerous import TimedJSONWebSignatureSerializer as Serializer
@@ -10,6 +11,18 @@ from api.models.user import User
 load_dotenv()
 
 
+@functools.lru_cache(maxsize=1)
+def get_secret_key():
+    """
+    Gets the secret key signing the tokens, read once per process
+
+    Returns:
+        key(str): secret key
+    """
+
+    return os.getenv('SECRET_KEY')
+
+
 def generate_auth_token(user: dict):
     """
     Generates the authentication token
@@ -27,7 +40,7 @@ def generate_auth_token(user: dict):
     }
     token = jwt.encode(
         payload,
-        os.getenv('SECRET_KEY'),
+        get_secret_key(),
         algorithm='HS256'
     )
     return token.decode('UTF-8')
@@ -42,7 +55,7 @@ def generate_user_token(user_id, expires_sec=1800):
     Returns:
         token(str): a string Token
     """
-    s = Serializer(os.getenv('SECRET_KEY'), expires_sec)
+    s = Serializer(get_secret_key(), expires_sec)
     return s.dumps({'user_id': user_id}).decode('utf-8')
 
 
@@ -55,7 +68,7 @@ def verify_user_token(token):
     Returns:
         user(User): user
     """
-    s = Serializer(os.getenv('SECRET_KEY'))
+    s = Serializer(get_secret_key())
     try:
         user_id = s.loads(token)['user_id']
     except:
@@ -1,5 +1,7 @@
 """ Module for helpers """
 
+from flask import current_app, request
+
 
 def request_data_strip(request_data):
     """
@@ -16,3 +18,19 @@ def request_data_strip(request_data):
             request_data[key] = value.strip()
 
     return request_data
+
+
+def get_endpoint_name():
+    """
+    Gets the name of the resource method handling the request
+    Returns:
+        (str): resource class and method, like ProductResource.get, or the
+            Flask endpoint of the views which aren't resources
+    """
+
+    view = current_app.view_functions.get(request.endpoint)
+    view_class = getattr(view, 'view_class', None)
+    if view_class is None:
+        return request.endpoint
+
+    return f'{view_class.__name__}.{request.method.lower()}'
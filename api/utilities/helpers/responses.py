@@ -1,12 +1,36 @@
 """ Module for endpoints responses """
 
-success_response = {
-    'status': 'success',
-    'message': '',
-    'data': ''
-}
-
-error_response = {
-    'status': 'error',
-    'message': ''
-}
+
+def success_response(message, data=''):
+    """
+        Builds the body of a successful response. A new dict is built for
+        every response, so nothing is shared between concurrent requests
+        Args:
+            message(str): response message
+            data: response data
+
+        Returns:
+            dict: response body
+    """
+
+    return {
+        'status': 'success',
+        'message': message,
+        'data': data
+    }
+
+
+def error_response(message):
+    """
+        Builds the body of an error response
+        Args:
+            message(str): error message
+
+        Returns:
+            dict: response body
+    """
+
+    return {
+        'status': 'error',
+        'message': message
+    }
@@ -1,30 +1,34 @@
 """ Module for swagger collections """
 
-from config.server import api
+from flask_restx import Namespace
 
-# Remove default namespace
-api.namespaces.clear()
-
-user_namespace = api.namespace(
+user_namespace = Namespace(
     'Users',
     description='A Collection of User related endpoints',
     path='/auth'
 )
 
-category_namespace = api.namespace(
+category_namespace = Namespace(
     'Categories',
     description='A Collection of Category related endpoints',
     path='/categories'
 )
 
-brand_namespace = api.namespace(
+brand_namespace = Namespace(
     'Brands',
     description='A Collection of Brand related endpoints',
     path='/brands'
 )
 
-product_namespace = api.namespace(
+product_namespace = Namespace(
     'Products',
     description='A Collection of Product related endpoints',
     path='/products'
 )
+
+NAMESPACES = [
+    user_namespace,
+    category_namespace,
+    brand_namespace,
+    product_namespace,
+]
@@ -0,0 +1,85 @@
+""" Module for the JSON serialization of the responses """
+
+import datetime
+import decimal
+import json
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_default(value):
+    """
+        Serializes the values JSON has no type for
+        Args:
+            value: value to serialize
+
+        Returns:
+            str: serialized value
+    """
+
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class JSONEncoder(json.JSONEncoder):
+    """ Flask JSON encoder handling Decimal and datetime values """
+
+    def default(self, o):  # pylint: disable=method-hidden
+        return encode_default(o)
+
+
+def encode_json(data):
+    """ Serializes data with the standard library encoder """
+
+    return json.dumps(data, default=encode_default, separators=(',', ':'))
+
+
+def encode_orjson(data):
+    """ Serializes data with orjson, several times faster """
+
+    return orjson.dumps(data, default=encode_default,
+                        option=orjson.OPT_NON_STR_KEYS)
+
+
+ENCODERS = {
+    'json': encode_json,
+    'orjson': encode_orjson,
+}
+
+
+def get_encoder(name):
+    """
+        Gets the encode function of a JSON backend. orjson is an optional
+        dependency, the standard library is used when it isn't installed
+        Args:
+            name(str): backend name, orjson or json
+
+        Returns:
+            function: encode function
+    """
+
+    if name not in ENCODERS:
+        raise ValueError(f'The JSON encoder must be one of {", ".join(ENCODERS)}')
+
+    if name == 'orjson' and orjson is None:
+        return encode_json
+    return ENCODERS[name]
+
+
+def output_json(data, code, headers=None):
+    """ Flask-RESTX representation of the application/json responses """
+
+    encode = get_encoder(current_app.config.get('JSON_ENCODER', 'orjson'))
+    response = make_response(encode(data), code)
+    response.mimetype = 'application/json'
+    response.headers.extend(headers or {})
+    return response
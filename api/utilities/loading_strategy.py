@@ -0,0 +1,65 @@
+""" Module for per-endpoint relationship loading strategies """
+
+from flask import request
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from api.models.product import Product
+from .validators import raise_validation_error
+
+
+def get_include_params(*allowed):
+    """
+        Gets the relationships requested through the `include` param
+        Args:
+            allowed(tuple): relationships that can be included
+
+        Returns:
+            set: requested relationships
+    """
+
+    include = request.args.get('include')
+    if not include:
+        return set()
+
+    includes = {value.strip() for value in include.split(',') if value.strip()}
+    if not includes.issubset(allowed):
+        raise_validation_error(
+            f'The include param must be one of: {", ".join(allowed)}')
+
+    return includes
+
+
+def load_with_products(model, query, includes):
+    """
+        Loads catalog records (categories or brands) and their products count.
+        The products are only loaded, with a separate SELECT ... IN query,
+        when they were requested.
+        Args:
+            model: Category or Brand model
+            query: records query
+            includes(set): requested relationships
+
+        Returns:
+            list: records with a products_count attribute
+    """
+
+    if 'products' in includes:
+        records = query.options(selectinload(model.products))\
+            .order_by(model.id)\
+            .all()
+        for record in records:
+            record.products_count = len(record.products)
+        return records
+
+    rows = query.add_columns(func.count(Product.id))\
+        .outerjoin(Product, model.products)\
+        .group_by(model.id)\
+        .order_by(model.id)\
+        .all()
+
+    records = []
+    for record, products_count in rows:
+        record.products_count = products_count
+        records.append(record)
+
+    return records
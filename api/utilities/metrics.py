@@ -0,0 +1,195 @@
+""" Module for the Prometheus metrics of the application.
+
+    The gunicorn workers write their metrics to memory mapped files in the
+    PROMETHEUS_MULTIPROC_DIR directory (set by gunicorn.conf.py), /metrics
+    aggregates the files of every worker. This module is only imported by
+    create_app when the metrics are enabled. /metrics is only served when
+    METRICS_ENDPOINT is enabled, to the addresses of METRICS_ALLOWED_NETWORKS.
+"""
+
+import ipaddress
+import os
+import threading
+import time
+from flask import Response, abort, current_app, g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry,
+                               Counter, Gauge, Histogram, generate_latest,
+                               multiprocess)
+from sqlalchemy.pool import QueuePool
+from .cache import cache_looked_up
+from .helpers import get_endpoint_name
+from .password_hasher import password_hashed
+
+UNMATCHED_ENDPOINT = 'unmatched'
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency',
+    ['endpoint', 'method'])
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Requests being served',
+    ['endpoint', 'method'], multiprocess_mode='livesum')
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size',
+    ['endpoint', 'method'], buckets=SIZE_BUCKETS)
+RESPONSES = Counter(
+    'http_responses', 'Responses by status code',
+    ['endpoint', 'method', 'status'])
+POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Wait for a free database connection of the pool, without the time '
+    'spent opening a new one',
+    buckets=(.0005, .001, .005, .01, .05, .1, .5, 1, 5, 10))
+POOL_CONNECT_DURATION = Histogram(
+    'db_pool_connect_duration_seconds',
+    'Opening of a new database connection by the pool (TCP, auth and first '
+    'connect)',
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 5))
+CACHE_HITS = Counter(
+    'cache_hits', 'Responses served from the cache', ['namespace'])
+CACHE_MISSES = Counter(
+    'cache_misses', 'Responses missing from the cache', ['namespace'])
+PASSWORD_HASH_LATENCY = Histogram(
+    'password_hash_duration_seconds', 'bcrypt hash and check duration',
+    ['operation'], buckets=(.01, .025, .05, .1, .25, .5, 1, 2.5))
+
+
+class TimedQueuePool(QueuePool):
+    """ Connection pool recording how long the requests wait for a connection,
+        apart from how long the connections it opens take to connect
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkouts = threading.local()
+
+    def _do_get(self):
+        self._checkouts.connect_duration = 0
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start
+                                       - self._checkouts.connect_duration)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            duration = time.perf_counter() - start
+            POOL_CONNECT_DURATION.observe(duration)
+            self._checkouts.connect_duration = \
+                getattr(self._checkouts, 'connect_duration', 0) + duration
+
+
+def start_request_metrics():
+    """ Counts the request in progress and starts its timer """
+
+    g.metrics_labels = (get_endpoint_name() or UNMATCHED_ENDPOINT, request.method)
+    g.metrics_start = time.perf_counter()
+    REQUESTS_IN_PROGRESS.labels(*g.metrics_labels).inc()
+
+
+def record_request_metrics(response):
+    """ Records the latency, size and status of the response """
+
+    labels = g.get('metrics_labels')
+    start = g.pop('metrics_start', None)
+    if labels is None or start is None:
+        return response
+
+    REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - start)
+    RESPONSES.labels(*labels, str(response.status_code)).inc()
+    if response.content_length is not None:
+        RESPONSE_SIZE.labels(*labels).observe(response.content_length)
+    return response
+
+
+def stop_request_metrics(error=None):
+    """ Removes the request from the requests in progress, and records a
+        500 for an unhandled exception which skipped the after request hooks
+    """
+
+    labels = g.pop('metrics_labels', None)
+    if labels is None:
+        return
+
+    REQUESTS_IN_PROGRESS.labels(*labels).dec()
+    start = g.pop('metrics_start', None)
+    if start is not None and error is not None:
+        REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - start)
+        RESPONSES.labels(*labels, '500').inc()
+
+
+def record_cache_lookup(sender, namespace, hit):
+    """ Records a response cache hit or miss """
+
+    (CACHE_HITS if hit else CACHE_MISSES).labels(namespace).inc()
+
+
+def record_password_hash(sender, operation, duration):
+    """ Records the duration of a bcrypt hash or check """
+
+    PASSWORD_HASH_LATENCY.labels(operation).observe(duration)
+
+
+def is_allowed_address(address, networks):
+    """
+        Checks if a client address is in one of the networks
+        Args:
+            address(str): client IP address
+            networks(str): comma separated networks (e.g. 10.0.0.0/8)
+
+        Returns:
+            bool: True if the address is allowed
+    """
+
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+
+    return any(address in ipaddress.ip_network(network.strip())
+               for network in networks.split(',') if network.strip())
+
+
+def metrics():
+    """ Endpoint serving the metrics in the Prometheus text format, unknown
+        to the clients outside of the allowed networks
+    """
+
+    if not is_allowed_address(
+            request.remote_addr,
+            current_app.config.get('METRICS_ALLOWED_NETWORKS', '127.0.0.1/32')):
+        abort(404)
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    """
+        Records the metrics of the requests, of the database pool, of the
+        response cache and of the password hashing, and serves them from
+        /metrics
+        Args:
+            app(Flask): application, before its first database connection
+    """
+
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(
+        app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {},
+        poolclass=TimedQueuePool)
+    password_hashed.connect(record_password_hash)
+    cache_looked_up.connect(record_cache_lookup)
+
+    app.before_request(start_request_metrics)
+    app.after_request(record_request_metrics)
+    app.teardown_request(stop_request_metrics)
+    if app.config.get('METRICS_ENDPOINT', True):
+        app.add_url_rule('/metrics', 'metrics', metrics)
@@ -1,6 +1,14 @@
 """ Module for pagination helpers """
 
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import math
+from urllib.parse import urlencode
 from flask import request
+from sqlalchemy import tuple_
 from .validators import is_positive_integer, raise_validation_error
 
 
@@ -42,32 +50,199 @@ def get_pagination_params():
     return int(page), int(limit)
 
 
-def paginate_resource(query, schema):
+def make_page_url(**params):
+    """
+        Generates the URL of another page of the current request, keeping
+        its other params (e.g. filters or a search query)
+        Args:
+            params(dict): pagination params of the page
+
+        Returns:
+            str: page url
+    """
+
+    args = request.args.to_dict(flat=False)
+    args.update((key, [value]) for key, value in params.items())
+    root_url = request.url_root.strip('/')
+    return f'{root_url}{request.path}?{urlencode(args, doseq=True)}'
+
+
+def encode_cursor(values):
+    """
+        Encodes the sort key values of a record into an opaque cursor
+        Args:
+            values(list): sort key values of the last record of a page
+
+        Returns:
+            str: url safe cursor
+    """
+
+    payload = []
+    for value in values:
+        if isinstance(value, datetime.datetime):
+            payload.append(['d', value.isoformat()])
+        elif isinstance(value, decimal.Decimal):
+            payload.append(['n', str(value)])
+        else:
+            payload.append(['v', value])
+
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('utf-8').rstrip('=')
+
+
+def is_cursor_scalar(value):
+    """ Checks if a plain cursor value can be compared to a column, a
+        forged cursor could otherwise send objects or lists to the database
+    """
+
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, str):
+        return '\x00' not in value
+    return value is None or isinstance(value, int)
+
+
+def matches_key_type(value, key):
+    """ Checks if a cursor value has the Python type of its sort key, e.g.
+        an int for the primary key
+    """
+
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        return True
+
+    if value is None:
+        return key.nullable if hasattr(key, 'nullable') else True
+    if python_type is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, python_type)
+
+
+def decode_cursor(cursor, keys):
+    """
+        Decodes a cursor generated by encode_cursor
+        Args:
+            cursor(str): opaque cursor
+            keys(tuple): sort keys the cursor must contain a value of
+
+        Returns:
+            list: sort key values
+    """
+
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        values = []
+        for kind, value in payload:
+            if kind == 'd':
+                value = datetime.datetime.fromisoformat(value)
+            elif kind == 'n':
+                value = decimal.Decimal(value)
+            elif kind != 'v' or not is_cursor_scalar(value):
+                raise ValueError(f'Invalid cursor value {value!r}')
+            values.append(value)
+    except (binascii.Error, ValueError, TypeError, decimal.InvalidOperation):
+        values = None
+
+    if not values or len(values) != len(keys) or not all(
+            matches_key_type(value, key) for value, key in zip(values, keys)):
+        raise_validation_error('The cursor provided is invalid')
+
+    return values
+
+
+def paginate_resource_by_cursor(query, schema, keys, descending=False):
+    """
+        Paginate the given resource using keyset pagination
+        Args:
+            query: resource query
+            schema: model schema
+            keys(tuple): columns identifying the position of a record,
+                the last one must be unique (e.g. the primary key)
+            descending(bool): sort direction of the keys
+
+        Returns:
+            dict: paginated data and metadata
+    """
+
+    _, limit = get_pagination_params()
+    cursor = request.args.get('cursor') or None
+    with_count = request.args.get('count', '').lower() == 'true'
+
+    total_count = query.order_by(None).count() if with_count else None
+
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        position = tuple_(*keys)
+        if descending:
+            query = query.filter(position < tuple_(*values))
+        else:
+            query = query.filter(position > tuple_(*values))
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    records = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    next_page_url = None
+    if len(records) > limit:
+        records = records[:limit]
+        last_record = records[-1]
+        next_cursor = encode_cursor(
+            [getattr(last_record, key.key) for key in keys])
+        next_page_url = make_page_url(cursor=next_cursor, limit=limit)
+
+    data = schema.dump(records)
+    meta = {
+        'current_page': request.url,
+        'next_page': next_page_url,
+        'cursor': cursor,
+        'next_cursor': next_cursor,
+        'limit': limit,
+        'total_count': total_count
+    }
+
+    return data, meta
+
+
+def paginate_resource(query, schema, cursor_keys=None, descending=False):
     """
         Paginate the given resource
         Args:
             query: resource query
             schema: model schema
+            cursor_keys(tuple): columns used for keyset pagination, the client
+                opts into it by sending a `cursor` param (empty for the first page).
+                Pages are sorted by these columns in both modes.
+            descending(bool): sort direction of the cursor keys
 
         Returns:
             dict: paginated data and metadata
     """
 
+    if cursor_keys is not None and 'cursor' in request.args:
+        return paginate_resource_by_cursor(
+            query, schema, cursor_keys, descending)
+
+    if cursor_keys is not None:
+        query = query.order_by(
+            *[key.desc() if descending else key.asc() for key in cursor_keys])
+
     page, limit = get_pagination_params()
 
     records_query = query.paginate(page=page, max_per_page=limit)
-    root_url = request.url_root.strip('/')
-    path = request.path
-    base_url = f'{root_url}{path}'
     current_page_url = request.url
     next_page_url = None
     previous_page_url = None
 
     if records_query.has_next:
-        next_page_url = f'{base_url}?page={records_query.next_num}&limit={limit}'
+        next_page_url = make_page_url(page=records_query.next_num, limit=limit)
 
     if records_query.has_prev:
-        previous_page_url = f'{base_url}?page={records_query.prev_num}&limit={limit}'
+        previous_page_url = make_page_url(
+            page=records_query.prev_num, limit=limit)
 
     current_page_num = records_query.page
     pages_count = records_query.pages
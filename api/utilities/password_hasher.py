@@ -0,0 +1,158 @@
+""" Module for hashing passwords in a bounded worker pool """
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from flask import current_app
+from flask.signals import Namespace
+from werkzeug.exceptions import ServiceUnavailable
+
+_password_hasher = None
+_password_hasher_lock = threading.Lock()
+signals = Namespace()
+# Sent with the operation (hash or check) and the bcrypt duration in seconds
+password_hashed = signals.signal('password-hashed')
+
+
+def raise_service_unavailable(message):
+    """
+    Raises service unavailable error
+
+    Args:
+        message (str): error message
+    Raises:
+        (ServiceUnavailable): raise an exception
+    """
+
+    error = ServiceUnavailable()
+    error.data = {
+        'status': 'error',
+        'message': message
+    }
+    raise error
+
+
+class PasswordHasher:
+    """ Runs bcrypt in a dedicated pool of threads (bcrypt releases the GIL)
+        so that a burst of logins can only use a bounded share of the CPU.
+        Requests waiting longer than wait_timeout for a free slot are
+        rejected instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers=2, queue_size=8, rounds=10, wait_timeout=1):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='password-hasher')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.rounds = rounds
+        self.wait_timeout = wait_timeout
+
+    @staticmethod
+    def _timed(operation, function, *args):
+        """ Runs a bcrypt function and sends its duration """
+
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            password_hashed.send(None, operation=operation,
+                                 duration=time.perf_counter() - start)
+
+    def _run(self, operation, function, *args):
+        """ Runs a function in the pool and waits for its result """
+
+        if not self.slots.acquire(timeout=self.wait_timeout):
+            raise_service_unavailable(
+                'The server is busy, please try again later')
+
+        try:
+            future = self.executor.submit(self._timed, operation, function, *args)
+        except:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future.result()
+
+    def hash(self, password):
+        """ Hashes a password with the configured cost """
+
+        hashed = self._run('hash', bcrypt.hashpw, password.encode('utf-8'),
+                           bcrypt.gensalt(self.rounds))
+        return hashed.decode('utf-8')
+
+    def check(self, password, hashed):
+        """ Checks a password against its hash """
+
+        return self._run('check', bcrypt.checkpw, password.encode('utf-8'),
+                         hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed):
+        """ Checks if a hash was computed with another cost """
+
+        return int(hashed.split('$')[2]) != self.rounds
+
+
+def get_password_hasher():
+    """ Gets the process password hasher, creating it on first use. The
+        concurrent first requests share one hasher, so its pool and queue
+        limits hold.
+    """
+
+    global _password_hasher
+    if _password_hasher is None:
+        with _password_hasher_lock:
+            if _password_hasher is None:
+                config = current_app.config
+                _password_hasher = PasswordHasher(
+                    workers=config.get('PASSWORD_HASH_WORKERS', 2),
+                    queue_size=config.get('PASSWORD_HASH_QUEUE_SIZE', 8),
+                    rounds=config.get('BCRYPT_LOG_ROUNDS', 10),
+                    wait_timeout=config.get('PASSWORD_HASH_WAIT_TIMEOUT', 1))
+    return _password_hasher
+
+
+def set_password_hasher(password_hasher):
+    """ Replaces the process password hasher """
+
+    global _password_hasher
+    _password_hasher = password_hasher
+
+
+def hash_password(password):
+    """
+    Hashes a password
+
+    Args:
+        password (str): plain password
+    Returns:
+        (str): password hash
+    """
+
+    return get_password_hasher().hash(password)
+
+
+def check_password(password, hashed):
+    """
+    Checks a password against its hash
+
+    Args:
+        password (str): plain password
+        hashed (str): password hash
+    Returns:
+        (bool): True if the password matches
+    """
+
+    return get_password_hasher().check(password, hashed)
+
+
+def password_needs_rehash(hashed):
+    """
+    Checks if a password hash must be recomputed with the configured cost
+
+    Args:
+        hashed (str): password hash
+    Returns:
+        (bool): True if the cost changed
+    """
+
+    return get_password_hasher().needs_rehash(hashed)
@@ -0,0 +1,113 @@
+""" Module for the authenticated principal of a request """
+
+import hashlib
+import time
+import jwt
+from flask import current_app
+from api.models.database import db
+from api.models.user import User
+from .cache import LRUCache, on_invalidate
+from .generate_token import get_secret_key
+
+_verified_tokens = None
+_admin_roles = None
+
+
+def get_verified_tokens():
+    """ Gets the process cache of verified token payloads """
+
+    global _verified_tokens
+    if _verified_tokens is None:
+        _verified_tokens = LRUCache(
+            current_app.config.get('TOKEN_CACHE_MAX_ENTRIES', 4096),
+            ttl=current_app.config.get('TOKEN_CACHE_TTL', 300))
+    return _verified_tokens
+
+
+def get_admin_roles():
+    """ Gets the process cache of user admin roles """
+
+    global _admin_roles
+    if _admin_roles is None:
+        _admin_roles = LRUCache(
+            current_app.config.get('TOKEN_CACHE_MAX_ENTRIES', 4096),
+            ttl=current_app.config.get('ADMIN_ROLE_CACHE_TTL', 30))
+    return _admin_roles
+
+
+def decode_auth_token(token):
+    """
+    Decodes an authentication token, reusing the payload of a token
+    verified recently until the earliest of its expiry and the cache TTL
+    Args:
+        token(str): Json Web Token
+
+    Returns:
+        payload(dict): token payload, shared between requests
+
+    Raises:
+        (jwt.InvalidTokenError): raises an exception if the token is invalid
+    """
+
+    verified_tokens = get_verified_tokens()
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    payload = verified_tokens.get(key)
+
+    if payload is None:
+        payload = jwt.decode(token, get_secret_key(), algorithms=['HS256'])
+        time_to_expiry = payload['exp'] - time.time()
+        if time_to_expiry >= 1:
+            verified_tokens.set(
+                key, payload, ttl=min(time_to_expiry, verified_tokens.ttl))
+
+    return payload
+
+
+def is_admin_user(user_id):
+    """
+    Checks if a user is an admin. The role is cached for a few seconds in
+    every worker process, and dropped by the process changing it.
+    Args:
+        user_id(int): user ID
+
+    Returns:
+        (bool): True if the user is an admin
+    """
+
+    admin_roles = get_admin_roles()
+    is_admin = admin_roles.get(user_id)
+
+    if is_admin is None:
+        is_admin = bool(db.session.query(User.is_admin)
+                        .filter_by(id=user_id).scalar())
+        admin_roles.set(user_id, is_admin)
+
+    return is_admin
+
+
+@on_invalidate
+def invalidate_admin_role(namespace, instance_id):
+    """ Drops the cached role of an updated user """
+
+    if namespace == User.cache_namespace and _admin_roles is not None:
+        if instance_id is None:
+            _admin_roles.clear()
+        else:
+            _admin_roles.delete(instance_id)
+
+
+class Principal:
+    """ Authenticated user of the current request """
+
+    def __init__(self, token_payload):
+        self.token_payload = token_payload
+        self.user_id = token_payload['user']['id']
+        self._is_admin = None
+
+    @property
+    def is_admin(self):
+        """ Checks if the principal is an admin """
+
+        if self._is_admin is None:
+            self._is_admin = is_admin_user(self.user_id)
+        return self._is_admin
@@ -0,0 +1,221 @@
+""" Module for the bulk product import and export """
+
+import csv
+import datetime
+import decimal
+import io
+import json
+from flask import current_app
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import BadRequest
+from api.models.database import db
+from api.models.brand import Brand
+from api.models.cart import Cart
+from api.models.category import Category
+from api.models.product import Product
+from .validators import raise_validation_error
+from .validators.product import ProductValidators
+
+NDJSON = 'application/x-ndjson'
+CSV = 'text/csv'
+CSV_COLUMNS = ['name', 'description', 'main_image_url', 'main_image_public_id',
+               'category_id', 'brand_id', 'price', 'quantity']
+PRODUCT_FIELDS = ['name', 'description', 'main_image', 'images',
+                  'category_id', 'brand_id', 'price', 'quantity']
+# The CSV format has no column for the other images, they are kept
+CSV_FIELDS = [field for field in PRODUCT_FIELDS if field != 'images']
+MAX_REPORTED_ERRORS = 100
+
+
+def read_ndjson(stream):
+    """ Reads the products of a NDJSON stream, one per line """
+
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def parse_csv_number(value, number_type):
+    """ Converts a CSV cell, returning it unchanged when it's invalid """
+
+    if value is None or not value.strip():
+        return None
+    try:
+        return number_type(value)
+    except (ValueError, decimal.InvalidOperation):
+        return value
+
+
+def read_csv(stream):
+    """ Reads the products of a CSV stream with a header row """
+
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {
+            'name': row.get('name'),
+            'description': row.get('description'),
+            'main_image': {'url': row.get('main_image_url'),
+                           'public_id': row.get('main_image_public_id')},
+            'category_id': parse_csv_number(row.get('category_id'), int),
+            'brand_id': parse_csv_number(row.get('brand_id'), int),
+            'price': parse_csv_number(row.get('price'), decimal.Decimal),
+            'quantity': parse_csv_number(row.get('quantity'), int),
+        }
+
+
+def upsert_products(products, fields):
+    """
+        Inserts the products, or updates the existing ones with the same
+        name, with one statement
+        Args:
+            products(list): products data
+            fields(list): fields of every product, the others are left
+                unchanged
+
+        Returns:
+            tuple: number of created products and IDs of the updated ones
+    """
+
+    now = datetime.datetime.utcnow()
+    statement = insert(Product.__table__).values(
+        [dict(product, created_at=now) for product in products])
+    excluded = statement.excluded
+    updates = {field: excluded[field] for field in fields if field != 'name'}
+    statement = statement.on_conflict_do_update(
+        index_elements=[Product.name],
+        set_={**updates, 'updated_at': now})\
+        .returning(Product.id, literal_column('xmax = 0'))
+
+    rows = db.session.execute(statement).fetchall()
+    return (sum(1 for _, created in rows if created),
+            [product_id for product_id, created in rows if not created])
+
+
+def import_products(stream, content_type):
+    """
+        Imports the products of a NDJSON or CSV text stream, chunk by chunk.
+        The fields missing from a NDJSON line are left unchanged.
+        Every product is validated against the category and brand IDs
+        fetched once, invalid products are skipped and reported, as well as
+        the products of a chunk the database rejects.
+        Args:
+            stream: text stream of the request body
+            content_type(str): NDJSON or CSV mimetype
+
+        Returns:
+            dict: created, updated and failed counts with the first errors
+    """
+
+    chunk_size = current_app.config.get('PRODUCT_IMPORT_CHUNK_SIZE', 500)
+    category_ids = {category_id for category_id, in db.session.query(Category.id)}
+    brand_ids = {brand_id for brand_id, in db.session.query(Brand.id)}
+    reader, fields = (read_csv, CSV_FIELDS) if content_type == CSV \
+        else (read_ndjson, PRODUCT_FIELDS)
+    report = {'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    # Line and data keyed by name, a product repeated in a chunk keeps its
+    # last values
+    chunk = {}
+
+    def add_error(line_number, message):
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'line': line_number, 'message': message})
+
+    def flush_chunk():
+        # One upsert per set of fields, a field missing from a line is kept
+        groups = {}
+        for _, product in chunk.values():
+            groups.setdefault(tuple(product), []).append(product)
+        try:
+            # A chunk the database rejects is reported, the committed
+            # chunks and the next ones are kept
+            with db.session.begin_nested():
+                created, updated_ids = 0, []
+                for product_fields, products in groups.items():
+                    group_created, group_updated_ids = upsert_products(
+                        products, product_fields)
+                    created += group_created
+                    updated_ids += group_updated_ids
+                if updated_ids:
+                    Cart.refresh_summaries(updated_ids)
+        except SQLAlchemyError:
+            report['failed'] += len(chunk)
+            for line_number, _ in chunk.values():
+                add_error(line_number, 'The product could not be saved')
+        else:
+            # Clears the whole products namespace once per chunk, not per product
+            Product.mark_changed(None)
+            report['created'] += created
+            report['updated'] += len(chunk) - created
+        db.session.commit()
+        chunk.clear()
+
+    for line_number, data in reader(stream):
+        try:
+            if not isinstance(data, dict):
+                raise_validation_error('The line is not a valid JSON object')
+            ProductValidators.validate_bulk_item(data, category_ids, brand_ids)
+        except BadRequest as error:
+            report['failed'] += 1
+            add_error(line_number, error.data['message'])
+            continue
+
+        product = {field: data[field] for field in fields if field in data}
+        product['name'] = product['name'].strip().lower()
+        chunk[product['name']] = (line_number, product)
+        if len(chunk) >= chunk_size:
+            flush_chunk()
+
+    if chunk:
+        flush_chunk()
+
+    return report
+
+
+def export_products(export_format):
+    """
+        Streams every product as NDJSON or CSV. The rows are fetched in
+        batches through a server side cursor, so memory stays flat.
+        Args:
+            export_format(str): NDJSON or CSV mimetype
+
+        Yields:
+            str: chunks of the export
+    """
+
+    chunk_size = current_app.config.get('PRODUCT_IMPORT_CHUNK_SIZE', 500)
+    columns = [getattr(Product, field) for field in PRODUCT_FIELDS]
+    rows = db.session.query(Product.id, *columns)\
+        .order_by(Product.id)\
+        .yield_per(chunk_size)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == CSV:
+        writer.writerow(['id'] + CSV_COLUMNS)
+
+    for index, row in enumerate(rows, 1):
+        product = dict(zip(['id'] + PRODUCT_FIELDS, row))
+        if export_format == CSV:
+            main_image = product['main_image'] or {}
+            writer.writerow([
+                product['id'], product['name'], product['description'],
+                main_image.get('url'), main_image.get('public_id'),
+                product['category_id'], product['brand_id'],
+                product['price'], product['quantity']])
+        else:
+            product['price'] = str(product['price'])
+            buffer.write(json.dumps(product))
+            buffer.write('\n')
+
+        if index % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
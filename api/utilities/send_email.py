@@ -1,8 +1,8 @@
 """ Module for sending emails """
 
+from email.utils import formataddr
 from flask import render_template
-from flask_mail import Message
-from config.server import mail
+from api.models.email_outbox import EmailOutbox
 from .generate_token import generate_user_token
 from dotenv import load_dotenv
 from os import getenv
@@ -11,12 +11,14 @@ load_dotenv()
 
 
 def send_email(user, subject, template):
-    """Send email"""
+    """Queue an email in the current transaction, sent in the background by
+    the email dispatcher once the caller commits"""
 
     token = generate_user_token(user["id"])
-    msg = Message(
-        subject, sender=("Dash Shop", getenv("SENDER")), recipients=[user["email"]]
+    html = render_template(template, user=user, token=token)
+    EmailOutbox.enqueue(
+        formataddr(("Dash Shop", getenv("SENDER") or "")),
+        user["email"],
+        subject,
+        html,
     )
-    msg.html = render_template(template, user=user, token=token)
-
-    mail.send(msg)
@@ -3,23 +3,25 @@
 from flask import request
 from api.models.brand import Brand
 from . import raise_validation_error
+from .context import ValidationContext
 
 
 class BrandValidators:
     """ Brand validators class """
 
     @classmethod
-    def validate_name(cls, name, brand_id=None):
+    def validate_name(cls, name, context, brand_id=None):
         """
             Checks if the provided name doesn't exist
 
             Args:
                 name (str): brand name
+                context (ValidationContext): records referenced by the request
             Raises:
                 (ValidationError): raises an exception if the name already exists in the database
         """
 
-        brand = Brand.query.filter(Brand.name == name.lower().strip()).first()
+        brand = context.find(Brand, name=name)
 
         if brand:
             if request.method == 'PUT':
@@ -39,4 +41,6 @@ class BrandValidators:
         if not name or not name.strip():
             raise_validation_error('The brand name is required')
 
-        cls.validate_name(name, brand_id)
+        context = ValidationContext()
+        context.add(Brand, name=name)
+        cls.validate_name(name, context, brand_id)
@@ -1,6 +1,5 @@
 """ Module for cart validators """
 
-from flask import request
 from api.models.product import Product
 from . import raise_validation_error, is_positive_integer
 
@@ -19,11 +18,6 @@ class CartValidators:
             raise_validation_error(
                 'The product ID should be a positive integer')
 
-        product = Product.find_by_id(product_id)
-
-        if not product:
-            raise_validation_error('The product ID provided doesn\'t exist')
-
     @classmethod
     def validate_quantity(cls, quantity):
         """ Validates the product ID """
@@ -45,9 +39,21 @@ class CartValidators:
         cls.validate_product_id(product_id)
         cls.validate_quantity(quantity)
 
-        product = Product.find_by_id(product_id)
-        product_quantity = product.quantity
-        user_needed_quantity = quantity
+    @classmethod
+    def validate_unreserved_item(cls, product_id):
+        """ Explains why the stock of the product couldn't be reserved
+
+            Args:
+                product_id (int): product ID
+            Raises:
+                (ValidationError): raises an exception if the product doesn't
+                exist or if its stock is lower than the requested quantity
+        """
+
+        product = Product.query.with_entities(
+            Product.id).filter_by(id=product_id).first()
+
+        if not product:
+            raise_validation_error('The product ID provided doesn\'t exist')
 
-        if product_quantity - user_needed_quantity < 0:
-            raise_validation_error('The product is not available')
+        raise_validation_error('The product is not available')
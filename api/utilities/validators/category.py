@@ -3,24 +3,25 @@
 from flask import request
 from api.models.category import Category
 from . import raise_validation_error
+from .context import ValidationContext
 
 
 class CategoryValidators:
     """ Category validators class """
 
     @classmethod
-    def validate_name(cls, name, category_id=None):
+    def validate_name(cls, name, context, category_id=None):
         """
             Checks if the provided name doesn't exist
 
             Args:
                 name (str): category name
+                context (ValidationContext): records referenced by the request
             Raises:
                 (ValidationError): raises an exception if the name already exists in the database
         """
 
-        category = Category.query.filter(
-            Category.name == name.lower().strip()).first()
+        category = context.find(Category, name=name)
 
         if category:
             if request.method == 'PUT':
@@ -33,17 +34,24 @@ class CategoryValidators:
 
     @classmethod
     def validate(cls, data: dict, category_id=None):
-        """ Validates the category """
+        """ Validates the category, its name and parent are fetched with one query """
 
         name = data.get('name')
         parent_id = data.get('parent_id')
         if not name or not name.strip():
             raise_validation_error('The category name is required')
 
-        cls.validate_name(name, category_id)
+        context = ValidationContext()
+        context.add(Category, columns=['path'], name=name, id=parent_id)
+        cls.validate_name(name, context, category_id)
 
         if parent_id:
-            category = Category.find_by_id(parent_id)
-            if not category:
+            parent = context.find(Category, id=parent_id)
+            if not parent:
                 raise_validation_error(
                     'The parent category provided doesn\'t exist')
+
+            if category_id is not None and \
+                    f'/{category_id}/' in (parent.path or ''):
+                raise_validation_error(
+                    'The parent category can\'t be the category itself or one of its subcategories')
@@ -0,0 +1,78 @@
+""" Module for the validation context """
+
+from sqlalchemy import or_
+from api.models.database import db
+from . import is_positive_integer
+
+
+class ValidationContext:
+    """ Records referenced by a request. The validators gather their IDs
+        and unique names first, then every table is fetched with a single
+        query on its first lookup, reading only the checked columns.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.columns = {}
+        self.records = {}
+
+    def add(self, model, columns=(), **keys):
+        """
+            Gathers the keys of a record referenced by the request, the
+            invalid IDs and names are left to the validators
+
+            Args:
+                model: model class
+                columns (tuple): columns read by the validators, besides the ID and the name
+                keys: ID or name of the record
+        """
+
+        model_keys = self.keys.setdefault(model, {})
+        model_columns = self.columns.setdefault(model, ['id', 'name'])
+        model_columns.extend(
+            column for column in columns if column not in model_columns)
+
+        for column, value in keys.items():
+            if column == 'id' and is_positive_integer(value):
+                model_keys.setdefault('id', set()).add(value)
+            elif column == 'name' and isinstance(value, str) and value.strip():
+                model_keys.setdefault('name', set()).add(value.lower().strip())
+
+    def fetch(self, model):
+        """
+            Fetches the gathered records of a table with one query
+
+            Args:
+                model: model class
+            Returns:
+                list: records with the gathered columns
+        """
+
+        model_keys = self.keys.get(model, {})
+        if not model_keys:
+            return []
+
+        columns = [getattr(model, column) for column in self.columns[model]]
+        return db.session.query(*columns).filter(or_(*[
+            getattr(model, column).in_(sorted(values))
+            for column, values in model_keys.items()])).all()
+
+    def find(self, model, **keys):
+        """
+            Finds a gathered record by its ID or its name
+
+            Args:
+                model: model class
+                keys: ID or name of the record
+            Returns:
+                record with the gathered columns, None if it doesn't exist
+        """
+
+        if model not in self.records:
+            self.records[model] = self.fetch(model)
+
+        (column, value), = keys.items()
+        if column == 'name':
+            value = value.lower().strip()
+        return next((record for record in self.records[model]
+                     if getattr(record, column) == value), None)
@@ -16,6 +16,38 @@ class OrderValidators:
         for item in items:
             cls.validate_item(item)
 
+    @classmethod
+    def validate_stock(cls, items: list):
+        """ Locks the ordered products and checks their stock with one query
+
+            Args:
+                items (list): validated order items
+            Returns:
+                (tuple): ordered quantity and unit price by product ID
+        """
+        quantities = {}
+        for item in items:
+            product_id = item['product_id']
+            quantities[product_id] = quantities.get(product_id, 0) + item['quantity']
+
+        products = Product.query.with_entities(
+            Product.id, Product.quantity, Product.price)\
+            .filter(Product.id.in_(quantities))\
+            .order_by(Product.id)\
+            .with_for_update()\
+            .all()
+        stock = {product.id: product.quantity for product in products}
+
+        for product_id, quantity in quantities.items():
+            if product_id not in stock:
+                raise_validation_error('The product ID provided doesn\'t exist')
+
+            if stock[product_id] < quantity:
+                raise_validation_error('The product is not available in the requested quantity')
+
+        prices = {product.id: product.price for product in products}
+        return quantities, prices
+
     @classmethod
     def validate_item(cls, item: dict):
         """ Validates an order item """
@@ -28,16 +60,9 @@ class OrderValidators:
         if not is_positive_integer(product_id):
             raise_validation_error('The product ID should be a positive integer')
 
-        product = Product.find_by_id(product_id)
-        if not product:
-            raise_validation_error('The product ID provided doesn\'t exist')
-
         if quantity is None:
             raise_validation_error('The product quantity is required')
 
         if not is_positive_integer(quantity):
             raise_validation_error('The product quantity should be a positive integer')
 
-        if product.quantity < quantity:
-            raise_validation_error('The product is not available in the requested quantity')
-
@@ -1,23 +1,51 @@
 """ Module for product validators """
 
+import decimal
 import numbers
 from flask import request
 from api.models.product import Product
 from api.models.category import Category
 from api.models.brand import Brand
 from . import raise_validation_error, is_positive_integer
+from .context import ValidationContext
+
+# Bounds of the INTEGER and DECIMAL(12, 2) columns written by the bulk import
+MAX_INTEGER = 2 ** 31 - 1
+MAX_PRICE = decimal.Decimal('9999999999.99')
+
+
+def is_column_integer(value):
+    """ Checks if a value is a positive integer fitting an INTEGER column """
+
+    return is_positive_integer(value) and not isinstance(value, bool) \
+        and value <= MAX_INTEGER
+
+
+def is_column_price(value):
+    """ Checks if a value is a positive number fitting the price column once
+        rounded to cents
+    """
+
+    if not isinstance(value, numbers.Number) or isinstance(value, bool):
+        return False
+    try:
+        return 0 <= decimal.Decimal(value).quantize(decimal.Decimal('0.01')) \
+            <= MAX_PRICE
+    except decimal.InvalidOperation:
+        return False
 
 
 class ProductValidators:
     """ Product validators class """
 
     @classmethod
-    def validate_name(cls, name, product_id=None):
+    def validate_name(cls, name, context, product_id=None):
         """
             Checks if the provided name doesn't exist
 
             Args:
                 name (str): product name
+                context (ValidationContext): records referenced by the request
             Raises:
                 (ValidationError): raises an exception if the name already exists in the database
         """
@@ -26,8 +54,7 @@ class ProductValidators:
             raise_validation_error(
                 'The product name is required')
 
-        product = Product.query.filter(
-            Product.name == name.lower().strip()).first()
+        product = context.find(Product, name=name)
 
         if product:
             if request.method == 'PUT':
@@ -54,7 +81,7 @@ class ProductValidators:
             raise_validation_error(
                 'The image must be an object which has a url and a public_id')
 
-        if not image.get('url') or not image.get('public_id')\
+        if not isinstance(image.get('url'), str) or not image.get('public_id')\
                 or len(image.get('url').strip()) < 1\
                 or len(image.get('url').strip()) < 1:
             raise_validation_error(
@@ -86,12 +113,13 @@ class ProductValidators:
                 cls.validate_image(image)
 
     @classmethod
-    def validate_category(cls, category_id):
+    def validate_category(cls, category_id, context):
         """
         Checks if the provided category ID is valid
 
         Args:
             category_id (int): category ID
+            context (ValidationContext): records referenced by the request
         Raises:
             (ValidationError): raise an exception if the category ID doesn't exist in the database
         """
@@ -104,16 +132,17 @@ class ProductValidators:
             raise_validation_error(
                 'The category ID should be a positive integer')
 
-        if not Category.find_by_id(category_id):
+        if not context.find(Category, id=category_id):
             raise_validation_error('The category ID provided doesn\'t exist')
 
     @classmethod
-    def validate_brand(cls, brand_id):
+    def validate_brand(cls, brand_id, context):
         """
         Checks if the provided brand ID is valid
 
         Args:
             brand_id (int): brand ID
+            context (ValidationContext): records referenced by the request
         Raises:
             (ValidationError): raise an exception if the brand ID doesn't exist in the database
         """
@@ -123,13 +152,31 @@ class ProductValidators:
                 raise_validation_error(
                     'The brand ID should be a positive integer')
 
-            if not Brand.find_by_id(brand_id):
+            if not context.find(Brand, id=brand_id):
                 raise_validation_error(
                     'The brand ID provided doesn\'t exist')
 
+    @classmethod
+    def validate_search_query(cls, text):
+        """
+        Checks if the provided search text is valid
+
+        Args:
+            text (str): search text
+        Raises:
+            (ValidationError): raise an exception if the search text is missing or too long
+        """
+
+        if not text or not text.strip():
+            raise_validation_error('The search query is required')
+
+        if len(text) > 200:
+            raise_validation_error(
+                'The search query must not exceed 200 characters')
+
     @classmethod
     def validate(cls, data: dict, product_id=None):
-        """ Validates the product """
+        """ Validates the product with one query per referenced table """
 
         name = data.get('name')
         main_image = data.get('main_image')
@@ -139,13 +186,22 @@ class ProductValidators:
         price = data.get('price')
         quantity = data.get('quantity')
 
-        print(brand_id)
+        context = ValidationContext()
+        context.add(Product, name=name)
+        context.add(Category, id=category_id)
+        context.add(Brand, id=brand_id)
 
-        cls.validate_name(name, product_id)
+        cls.validate_name(name, context, product_id)
         cls.validate_main_image(main_image)
         cls.validate_other_images(images)
-        cls.validate_category(category_id)
-        cls.validate_brand(brand_id)
+        cls.validate_category(category_id, context)
+        cls.validate_brand(brand_id, context)
+
+        cls.validate_stock(price, quantity)
+
+    @classmethod
+    def validate_stock(cls, price, quantity):
+        """ Validates the product price and quantity """
 
         if price is None:
             raise_validation_error('The price is required')
@@ -158,3 +214,69 @@ class ProductValidators:
 
         if not is_positive_integer(quantity):
             raise_validation_error('The quantity must be a positive integer')
+
+    @classmethod
+    def validate_bulk_item(cls, data: dict, category_ids, brand_ids):
+        """
+            Validates a product of a bulk import without any query, the
+            name being the key of the upsert
+
+            Args:
+                data (dict): product data
+                category_ids (set): existing category IDs
+                brand_ids (set): existing brand IDs
+            Raises:
+                (ValidationError): raises an exception if the product is invalid
+        """
+
+        name = data.get('name')
+        description = data.get('description')
+        main_image = data.get('main_image')
+        images = data.get('images')
+        category_id = data.get('category_id')
+        brand_id = data.get('brand_id')
+        price = data.get('price')
+        quantity = data.get('quantity')
+
+        if not isinstance(name, str) or not name.strip():
+            raise_validation_error('The product name is required')
+
+        if len(name.strip()) > 100:
+            raise_validation_error(
+                'The product name must not exceed 100 characters')
+
+        if description is not None and not isinstance(description, str):
+            raise_validation_error('The product description must be a string')
+
+        if main_image is None:
+            raise_validation_error('The product main image is required')
+        cls.validate_image(main_image)
+        if images is not None and not isinstance(images, list):
+            raise_validation_error('The product images must be a list')
+        cls.validate_other_images(images)
+
+        if not category_id:
+            raise_validation_error('The category ID is required')
+
+        if not is_column_integer(category_id):
+            raise_validation_error('The category ID should be a positive integer')
+
+        if category_id not in category_ids:
+            raise_validation_error('The category ID provided doesn\'t exist')
+
+        if brand_id is not None:
+            if not is_column_integer(brand_id):
+                raise_validation_error('The brand ID should be a positive integer')
+
+            if brand_id not in brand_ids:
+                raise_validation_error('The brand ID provided doesn\'t exist')
+
+        if price is not None and not is_column_price(price):
+            raise_validation_error(
+                f'The price must be a positive number up to {MAX_PRICE}')
+
+        if quantity is not None and not is_column_integer(quantity):
+            raise_validation_error(
+                f'The quantity must be a positive integer up to {MAX_INTEGER}')
+
+        cls.validate_stock(price, quantity)
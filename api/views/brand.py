@@ -3,12 +3,20 @@
 from flask import request
 from flask_restx import Resource
 from api.models.brand import Brand
+from api.models.product import Product
 from api.schemas.brand import BrandSchema
+from api.schemas.product import ProductSchema
+from api.schemas.registry import get_schema, get_dumper
 from api.middlewares.permission_required import permission_required
 from api.middlewares.token_required import token_required
+from api.middlewares.read_replica import read_replica
 from api.utilities.helpers.swagger.collections import brand_namespace
 from api.utilities.helpers.swagger.models.brand import brand_model
 from api.utilities.validators.brand import BrandValidators
+from api.utilities.loading_strategy import get_include_params, load_with_products
+from api.utilities.pagination_handler import paginate_resource
+from api.utilities.cache import cached_response
+from api.utilities.conditional_request import conditional_get
 from api.utilities.helpers.responses import success_response, error_response
 from api.utilities.helpers import request_data_strip
 
@@ -32,51 +40,52 @@ class BrandResource(Resource):
         new_brand = Brand(**request_data)
         new_brand.save()
 
-        brand_schema = BrandSchema()
+        brand_schema = get_schema(BrandSchema, exclude=['products'])
         brand_data = brand_schema.dump(new_brand)
 
-        success_response['message'] = 'Brand successfully created'
-        success_response['data'] = {
+        return success_response('Brand successfully created', {
             'brand': brand_data
-        }
-
-        return success_response, 201
+        }), 201
 
+    @read_replica
+    @cached_response('brands')
+    @conditional_get(Brand, Product)
     def get(self):
         """ Endpoint to get all brands """
 
-        brands_schema = BrandSchema(many=True)
+        includes = get_include_params('products')
+        brands_schema = get_schema(
+            BrandSchema, exclude=[] if includes else ['products'], many=True)
         brands = brands_schema.dump(
-            Brand.query.all())
+            load_with_products(Brand, Brand.query, includes))
 
-        success_response['message'] = 'Brands successfully fetched'
-        success_response['data'] = {
+        return success_response('Brands successfully fetched', {
             'brands': brands
-        }
-
-        return success_response, 200
+        }), 200
 
 
 @brand_namespace.route('/<int:brand_id>')
 class SingleBrandResource(Resource):
     """" Resource class for single brand endpoints """
 
+    @read_replica
+    @cached_response('brands')
+    @conditional_get(Brand, Product)
     def get(self, brand_id):
         """" Endpoint to get a single brand """
 
-        brand_schema = BrandSchema()
-        brand = brand_schema.dump(Brand.find_by_id(brand_id))
-
-        if not brand:
-            error_response['message'] = 'Brand not found'
-            return error_response, 404
+        includes = get_include_params('products')
+        brand_schema = get_schema(
+            BrandSchema, exclude=[] if includes else ['products'])
+        brands = load_with_products(
+            Brand, Brand.query.filter_by(id=brand_id), includes)
 
-        success_response['message'] = 'Brand successfully fetched'
-        success_response['data'] = {
-            'brand': brand
-        }
+        if not brands:
+            return error_response('Brand not found'), 404
 
-        return success_response, 200
+        return success_response('Brand successfully fetched', {
+            'brand': brand_schema.dump(brands[0])
+        }), 200
 
     @token_required
     @permission_required
@@ -84,12 +93,11 @@ class SingleBrandResource(Resource):
     def put(self, brand_id):
         """" Endpoint to update brand """
 
-        brand_schema = BrandSchema()
+        brand_schema = get_schema(BrandSchema, exclude=['products'])
         brand = Brand.find_by_id(brand_id)
 
         if not brand:
-            error_response['message'] = 'Brand not found'
-            return error_response, 404
+            return error_response('Brand not found'), 404
 
         request_data = request.get_json()
         BrandValidators.validate(request_data, brand_id=brand_id)
@@ -98,30 +106,48 @@ class SingleBrandResource(Resource):
 
         brand.update(request_data)
 
-        success_response['message'] = 'Brand successfully updated'
-        success_response['data'] = {
+        return success_response('Brand successfully updated', {
             'brand': brand_schema.dump(brand)
-        }
-
-        return success_response, 200
+        }), 200
 
     @token_required
     @permission_required
     def delete(self, brand_id):
         """" Endpoint to delete a brand """
 
-        brand_schema = BrandSchema()
+        brand_schema = get_schema(BrandSchema, exclude=['products'])
         brand = Brand.find_by_id(brand_id)
 
         if not brand:
-            error_response['message'] = 'Brand not found'
-            return error_response, 404
+            return error_response('Brand not found'), 404
 
+        brand_data = brand_schema.dump(brand)
         brand.delete()
 
-        success_response['message'] = 'Brand successfully deleted'
-        success_response['data'] = {
-            'brand': brand_schema.dump(brand)
-        }
+        return success_response('Brand successfully deleted', {
+            'brand': brand_data
+        }), 200
+
+
+@brand_namespace.route('/<int:brand_id>/products')
+class BrandProductsResource(Resource):
+    """" Resource class for brand products endpoints """
+
+    @read_replica
+    @cached_response('brands')
+    @conditional_get(Brand, Product)
+    def get(self, brand_id):
+        """" Endpoint to get the products of a brand """
+
+        if not Brand.query.with_entities(Brand.id).filter_by(id=brand_id).first():
+            return error_response('Brand not found'), 404
+
+        products_schema = get_dumper(ProductSchema, many=True)
+        products, meta = paginate_resource(
+            Product.query.filter_by(brand_id=brand_id), products_schema,
+            cursor_keys=(Product.created_at, Product.id))
 
-        return success_response, 200
+        return success_response('Brand products successfully fetched', {
+            'products': products,
+            'meta': meta
+        }), 200
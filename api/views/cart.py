@@ -2,11 +2,16 @@
 
 from flask import request
 from flask_restx import Resource
+from api.models.database import db
 from api.models.cart import Cart
 from api.models.product import Product
 from api.models.cart_item import CartItem
 from api.schemas.cart import CartSchema
+from api.schemas.cart_summary import CartSummarySchema
+from api.schemas.user import UserSchema
+from api.schemas.registry import get_dumper, get_schema
 from api.middlewares.token_required import token_required
+from api.middlewares.sql_instrumentation import sql_budget
 from api.utilities.helpers.swagger.collections import user_namespace
 from api.utilities.helpers.swagger.models.cart import cart_item_model
 from api.utilities.helpers.responses import success_response, error_response
@@ -14,26 +19,33 @@ from api.utilities.helpers import request_data_strip
 from api.utilities.helpers.constants import EXCLUDED_FIELDS
 from api.utilities.validators.cart import CartValidators
 
+EMPTY_SUMMARY = {'items_count': 0, 'subtotal': '0.00'}
+CART_EXCLUDED_FIELDS = EXCLUDED_FIELDS + ['owner']
+
 
 @user_namespace.route('/cart')
 class SingleCartResource(Resource):
     """" Resource class for single cart endpoints """
 
+    @sql_budget(3)
     @token_required
     def get(self):
         """ Endpoint to get user cart """
 
-        cart_schema = CartSchema(exclude=EXCLUDED_FIELDS)
-        user_id = request.decoded_token['user']['id']
-        cart = Cart.query.filter_by(user_id=user_id).first()
+        cart_schema = get_dumper(CartSchema, exclude=CART_EXCLUDED_FIELDS)
+        summary_schema = get_dumper(CartSummarySchema)
+        user = request.decoded_token['user']
+        cart = Cart.find_by_user_with_items(user['id'])
         cart_data = cart_schema.dump(cart)
+        if cart:
+            # The owner is the authenticated user, dumped from its token
+            cart_data['owner'] = get_schema(
+                UserSchema, exclude=CartSchema.user_excluded_fields).dump(user)
 
-        success_response['message'] = 'Cart successfully fetched'
-        success_response['data'] = {
-            'cart': cart_data
-        }
-
-        return success_response, 200
+        return success_response('Cart successfully fetched', {
+            'cart': cart_data,
+            'summary': summary_schema.dump(cart) if cart else EMPTY_SUMMARY
+        }), 200
 
     @token_required
     @user_namespace.expect(cart_item_model)
@@ -43,40 +55,54 @@ class SingleCartResource(Resource):
         request_data = request.get_json()
         CartValidators.validate_item(request_data)
         request_data = request_data_strip(request_data)
+        product_id = request_data['product_id']
+        quantity = request_data['quantity']
 
         user_id = request.decoded_token['user']['id']
-        cart = Cart.query.filter_by(user_id=user_id).first()
-        
-        # Create a new cart if it doesn't exist
-        if cart is None:
-            cart = Cart(user_id=user_id)
-            cart.save()
-            
-        request_data.update({'cart_id': cart.id})
+        cart = Cart.find_or_create_by_user_for_update(user_id)
+
+        if not Product.reserve_stock(product_id, quantity):
+            db.session.rollback()
+            CartValidators.validate_unreserved_item(product_id)
+
         cart_item = CartItem.query.filter_by(
-            cart_id=cart.id, product_id=request_data['product_id']).first()
-        product = Product.find_by_id(request_data['product_id'])
+            cart_id=cart.id, product_id=product_id).first()
 
         if cart_item:
-            updated_quantity = product.quantity - request_data['quantity']
-            request_data['quantity'] += cart_item.quantity
-            CartValidators.validate_item(request_data)
-            cart_item.update(request_data)
-            product.update({'quantity': updated_quantity})
-
+            cart_item.update(
+                {'quantity': cart_item.quantity + quantity}, commit=False)
         else:
-            new_cart_item = CartItem(**request_data)
-            new_cart_item.save()
-            new_quantity = product.quantity - request_data['quantity']
-            product.update({'quantity': new_quantity})
+            new_cart_item = CartItem(
+                cart_id=cart.id, product_id=product_id, quantity=quantity)
+            new_cart_item.save(commit=False)
+
+        db.session.commit()
+
+        cart_schema = get_dumper(CartSchema, exclude=EXCLUDED_FIELDS)
+        summary_schema = get_dumper(CartSummarySchema)
+        return success_response('Item successfully added to the cart', {
+            'cart': cart_schema.dump(cart),
+            'summary': summary_schema.dump(cart)
+        }), 200
+
 
-        cart_schema = CartSchema(exclude=EXCLUDED_FIELDS)
-        success_response['message'] = 'Item successfully added to the cart'
-        success_response['data'] = {
-            'cart': cart_schema.dump(cart)
-        }
+@user_namespace.route('/cart/summary')
+class CartSummaryResource(Resource):
+    """" Resource class for cart summary endpoint """
 
-        return success_response, 200
+    @sql_budget(1)
+    @token_required
+    def get(self):
+        """ Endpoint to get the user cart summary, read from the cart row alone """
+
+        summary_schema = get_dumper(CartSummarySchema)
+        user_id = request.decoded_token['user']['id']
+        summary = db.session.query(Cart.items_count, Cart.subtotal)\
+            .filter(Cart.user_id == user_id).first()
+
+        return success_response('Cart summary successfully fetched', {
+            'summary': summary_schema.dump(summary) if summary else EMPTY_SUMMARY
+        }), 200
 
 
 @user_namespace.route('/cart/items/<int:cart_item_id>')
@@ -87,24 +113,22 @@ class SingleCartItemResource(Resource):
     def delete(self, cart_item_id):
         """" Endpoint to remove an item from the cart """
 
-        cart_schema = CartSchema(exclude=EXCLUDED_FIELDS)
+        cart_schema = get_dumper(CartSchema, exclude=EXCLUDED_FIELDS)
         user_id = request.decoded_token['user']['id']
-        cart = Cart.query.filter_by(user_id=user_id).first()
-        cart_item = CartItem.query.filter_by(
+        cart = Cart.find_by_user_for_update(user_id)
+        cart_item = cart and CartItem.query.filter_by(
             id=cart_item_id, cart_id=cart.id).first()
 
         if not cart_item:
-            error_response['message'] = 'Cart Item not found'
-            return error_response, 404
-
-        product = Product.find_by_id(cart_item.product_id)
-        quantity = product.quantity + cart_item.quantity
-        product.update({'quantity': quantity})
-        cart_item.delete()
-
-        success_response['message'] = 'Item successfully removed from the cart'
-        success_response['data'] = {
-            'cart': cart_schema.dump(cart)
-        }
-
-        return success_response, 200
+            db.session.rollback()
+            return error_response('Cart Item not found'), 404
+
+        Product.release_stock(cart_item.product_id, cart_item.quantity)
+        cart_item.delete(commit=False)
+        db.session.commit()
+
+        summary_schema = get_dumper(CartSummarySchema)
+        return success_response('Item successfully removed from the cart', {
+            'cart': cart_schema.dump(cart),
+            'summary': summary_schema.dump(cart)
+        }), 200
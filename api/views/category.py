@@ -3,12 +3,22 @@
 from flask import request
 from flask_restx import Resource
 from api.models.category import Category
+from api.models.product import Product
 from api.schemas.category import CategorySchema
+from api.schemas.product import ProductSchema
+from api.schemas.registry import get_schema, get_dumper
 from api.middlewares.permission_required import permission_required
 from api.middlewares.token_required import token_required
+from api.middlewares.read_replica import read_replica
 from api.utilities.helpers.swagger.collections import category_namespace
 from api.utilities.helpers.swagger.models.category import category_model
 from api.utilities.validators.category import CategoryValidators
+from api.utilities.loading_strategy import get_include_params, load_with_products
+from api.utilities.category_tree import build_category_tree
+from api.utilities.filter_handler import get_boolean_param
+from api.utilities.pagination_handler import paginate_resource
+from api.utilities.cache import cached_response
+from api.utilities.conditional_request import conditional_get
 from api.utilities.helpers.responses import success_response, error_response
 from api.utilities.helpers import request_data_strip
 
@@ -31,50 +41,66 @@ class CategoryResource(Resource):
         new_category = Category(**request_data)
         new_category.save()
 
-        category_schema = CategorySchema()
+        category_schema = get_schema(CategorySchema, exclude=['products'])
         category_data = category_schema.dump(new_category)
 
-        success_response['message'] = 'Category successfully created'
-        success_response['data'] = {
+        return success_response('Category successfully created', {
             'category': category_data
-        }
-
-        return success_response, 201
+        }), 201
 
+    @read_replica
+    @cached_response('categories')
+    @conditional_get(Category, Product)
     def get(self):
         """ Endpoint to get all categories """
 
-        categories_schema = CategorySchema(many=True)
+        includes = get_include_params('products')
+        categories_schema = get_schema(
+            CategorySchema, exclude=[] if includes else ['products'], many=True)
         categories = categories_schema.dump(
-            Category.query.all())
+            load_with_products(Category, Category.query, includes))
 
-        success_response['message'] = 'Categories successfully fetched'
-        success_response['data'] = {
+        return success_response('Categories successfully fetched', {
             'categories': categories
-        }
+        }), 200
+
+
+@category_namespace.route('/tree')
+class CategoryTreeResource(Resource):
+    """" Resource class for category tree endpoint """
+
+    @read_replica
+    @cached_response('categories')
+    @conditional_get(Category)
+    def get(self):
+        """ Endpoint to get the categories nested under their parent """
 
-        return success_response, 200
+        return success_response('Category tree successfully fetched', {
+            'categories': build_category_tree()
+        }), 200
 
 
 @category_namespace.route('/<int:category_id>')
 class SingleCategoryResource(Resource):
     """" Resource class for single category endpoints """
 
+    @read_replica
+    @cached_response('categories')
+    @conditional_get(Category, Product)
     def get(self, category_id):
         """" Endpoint to get a single category """
 
-        category_schema = CategorySchema()
-        category = category_schema.dump(Category.find_by_id(category_id))
-
-        if not category:
-            error_response['message'] = 'Category not found'
-            return error_response, 404
-        success_response['message'] = 'Category successfully fetched'
-        success_response['data'] = {
-            'category': category
-        }
+        includes = get_include_params('products')
+        category_schema = get_schema(
+            CategorySchema, exclude=[] if includes else ['products'])
+        categories = load_with_products(
+            Category, Category.query.filter_by(id=category_id), includes)
 
-        return success_response, 200
+        if not categories:
+            return error_response('Category not found'), 404
+        return success_response('Category successfully fetched', {
+            'category': category_schema.dump(categories[0])
+        }), 200
 
     @token_required
     @permission_required
@@ -82,12 +108,11 @@ class SingleCategoryResource(Resource):
     def put(self, category_id):
         """" Endpoint to update category """
 
-        category_schema = CategorySchema()
+        category_schema = get_schema(CategorySchema, exclude=['products'])
         category = Category.find_by_id(category_id)
 
         if not category:
-            error_response['message'] = 'Category not found'
-            return error_response, 404
+            return error_response('Category not found'), 404
 
         request_data = request.get_json()
         CategoryValidators.validate(request_data, category_id=category_id)
@@ -96,30 +121,58 @@ class SingleCategoryResource(Resource):
 
         category.update(request_data)
 
-        success_response['message'] = 'Category successfully updated'
-        success_response['data'] = {
+        return success_response('Category successfully updated', {
             'category': category_schema.dump(category)
-        }
-
-        return success_response, 200
+        }), 200
 
     @token_required
     @permission_required
     def delete(self, category_id):
         """" Endpoint to delete a category """
 
-        category_schema = CategorySchema()
+        category_schema = get_schema(CategorySchema, exclude=['products'])
         category = Category.find_by_id(category_id)
 
         if not category:
-            error_response['message'] = 'Category not found'
-            return error_response, 404
+            return error_response('Category not found'), 404
 
+        category_data = category_schema.dump(category)
         category.delete()
 
-        success_response['message'] = 'Category successfully deleted'
-        success_response['data'] = {
-            'category': category_schema.dump(category)
-        }
+        return success_response('Category successfully deleted', {
+            'category': category_data
+        }), 200
+
+
+@category_namespace.route('/<int:category_id>/products')
+class CategoryProductsResource(Resource):
+    """" Resource class for category products endpoints """
 
-        return success_response, 200
+    @read_replica
+    @cached_response('categories')
+    @conditional_get(Category, Product)
+    def get(self, category_id):
+        """" Endpoint to get the products of a category, including the
+            products of its subcategories with subtree=true
+        """
+
+        subtree = get_boolean_param('subtree')
+        category = Category.query.with_entities(Category.path)\
+            .filter_by(id=category_id).first()
+        if not category:
+            return error_response('Category not found'), 404
+
+        products = Product.query.filter_by(category_id=category_id)
+        if subtree:
+            products = Product.query.filter(
+                Product.category_id.in_(Category.subtree_ids(category.path)))
+
+        products_schema = get_dumper(ProductSchema, many=True)
+        products, meta = paginate_resource(
+            products, products_schema,
+            cursor_keys=(Product.created_at, Product.id))
+
+        return success_response('Category products successfully fetched', {
+            'products': products,
+            'meta': meta
+        }), 200
@@ -2,10 +2,14 @@
 
 from flask import request
 from flask_restx import Resource
+from api.models.database import db
 from api.models.order import Order
 from api.models.order_item import OrderItem
+from api.models.product import Product
 from api.schemas.order import OrderSchema
+from api.schemas.registry import get_dumper
 from api.middlewares.token_required import token_required
+from api.middlewares.sql_instrumentation import sql_budget
 from api.utilities.helpers.swagger.collections import user_namespace
 from api.utilities.helpers.swagger.models.order import order_item_model
 from api.utilities.pagination_handler import paginate_resource
@@ -17,29 +21,22 @@ from api.utilities.validators.order import OrderValidators
 class OrderResource(Resource):
     """ Resource class for order endpoints """
 
+    @sql_budget(2)
     @token_required
     def get(self):
         """ Endpoint to get user orders """
-        order_schema = OrderSchema(many=True)
+        order_schema = get_dumper(OrderSchema, many=True)
         user_id = request.decoded_token['user']['id']
         orders = Order.query.filter_by(user_id=user_id)
-        
-        # Paginate orders
-        orders_data, meta = paginate_resource(orders, order_schema)
-        
-        # Calculate total amount for each order
-        for order in orders:
-            total_amount = sum(item.product.price * item.quantity for item in order.items)
-            order.total_amount = total_amount
 
-        orders_data = order_schema.dump(orders)
+        # Paginate orders, their total amount is stored at checkout
+        orders_data, meta = paginate_resource(
+            orders, order_schema, cursor_keys=(Order.created_at, Order.id))
 
-        success_response['message'] = 'Orders successfully fetched'
-        success_response['data'] = {
+        return success_response('Orders successfully fetched', {
             'orders': orders_data,
             'meta': meta
-        }
-        return success_response, 200
+        }), 200
 
     @token_required
     @user_namespace.expect(order_item_model)
@@ -52,41 +49,41 @@ class OrderResource(Resource):
 
         # Extract items from request data
         items_data = request_data.pop('items', [])
-        request_data.update({'user_id': user_id})
+        quantities, prices = OrderValidators.validate_stock(items_data)
+        total_amount = sum(prices[product_id] * quantity
+                           for product_id, quantity in quantities.items())
+        request_data.update({'user_id': user_id, 'total_amount': total_amount})
 
-        # Create the new order
+        # Create the new order, its items and take their stock in one transaction
         new_order = Order(**request_data)
-        new_order.save()
-
-        # Create order items
-        for item_data in items_data:
-            item_data.update({'order_id': new_order.id})
-            new_order_item = OrderItem(**item_data)
-            new_order_item.save()
+        new_order.save(commit=False)
+        OrderItem.bulk_create(new_order.id, items_data, prices)
+        Product.take_stock(quantities)
+        db.session.commit()
 
-        order_schema = OrderSchema()
-        success_response['message'] = 'Order successfully created'
-        success_response['data'] = {'order': order_schema.dump(new_order)}
-        return success_response, 201
+        order_schema = get_dumper(OrderSchema)
+        return success_response('Order successfully created', {
+            'order': order_schema.dump(new_order)
+        }), 201
 
 @user_namespace.route('/orders/<int:order_id>')
 class SingleOrderResource(Resource):
     """ Resource class for single order endpoints """
 
+    @sql_budget(2)
     @token_required
     def get(self, order_id):
         """ Endpoint to get a single order """
-        order_schema = OrderSchema()
+        order_schema = get_dumper(OrderSchema)
         user_id = request.decoded_token['user']['id']
         order = Order.query.filter_by(id=order_id, user_id=user_id).first()
 
         if not order:
-            error_response['message'] = 'Order not found'
-            return error_response, 404
+            return error_response('Order not found'), 404
 
-        success_response['message'] = 'Order successfully fetched'
-        success_response['data'] = {'order': order_schema.dump(order)}
-        return success_response, 200
+        return success_response('Order successfully fetched', {
+            'order': order_schema.dump(order)
+        }), 200
 
     @token_required
     def delete(self, order_id):
@@ -95,14 +92,11 @@ class SingleOrderResource(Resource):
         order = Order.query.filter_by(id=order_id, user_id=user_id).first()
 
         if not order:
-            error_response['message'] = 'Order not found'
-            return error_response, 404
+            return error_response('Order not found'), 404
         
         if order.status != "Pending":
-            error_response['message'] = 'Order cannot be deleted'
-            return error_response, 400
+            return error_response('Order cannot be deleted'), 400
 
         order.delete()
-        success_response['message'] = 'Order successfully deleted'
-        return success_response, 200
+        return success_response('Order successfully deleted'), 200
 
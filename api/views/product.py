@@ -1,15 +1,30 @@
 """ Module for products endpoints """
 
-from flask import request
+import io
+from flask import request, Response, stream_with_context
 from flask_restx import Resource
 from api.models.product import Product
 from api.schemas.product import ProductSchema
+from api.schemas.registry import get_schema, get_dumper
 from api.middlewares.permission_required import permission_required
 from api.middlewares.token_required import token_required
-from api.utilities.pagination_handler import paginate_resource
+from api.middlewares.read_replica import read_replica
+from api.middlewares.sql_instrumentation import sql_budget
+from api.utilities.pagination_handler import (paginate_resource,
+                                              paginate_resource_by_cursor)
 from api.utilities.helpers.swagger.collections import product_namespace
 from api.utilities.helpers.swagger.models.product import product_model
 from api.utilities.validators.product import ProductValidators
+from api.utilities.filter_handler import (get_product_filters,
+                                          get_sort_params,
+                                          get_product_facets)
+from api.utilities.product_import import (import_products,
+                                          export_products,
+                                          NDJSON,
+                                          CSV)
+from api.utilities.validators import raise_validation_error
+from api.utilities.cache import cached_response
+from api.utilities.conditional_request import conditional_get
 from api.utilities.helpers.responses import success_response, error_response
 from api.utilities.helpers import request_data_strip
 
@@ -32,49 +47,120 @@ class ProductResource(Resource):
         new_product = Product(**request_data)
         new_product.save()
 
-        product_schema = ProductSchema()
+        product_schema = get_schema(ProductSchema)
         product_data = product_schema.dump(new_product)
 
-        success_response['message'] = 'Product successfully created'
-        success_response['data'] = {
+        return success_response('Product successfully created', {
             'product': product_data
-        }
-        return success_response, 201
+        }), 201
 
+    @sql_budget(4)
+    @read_replica
+    @cached_response('products')
+    @conditional_get(Product)
     def get(self):
-        """ Endpoint to get all products """
+        """ Endpoint to get all products, filtered by category_id,
+            brand_id, min_price, max_price and in_stock and sorted by
+            sort (price, -price, created_at or -created_at)
+        """
 
-        products_schema = ProductSchema(many=True)
-        data, meta = paginate_resource(Product.query, products_schema)
+        filters = get_product_filters()
+        sort_keys, descending = get_sort_params()
 
-        success_response['message'] = 'Products successfully fetched'
-        success_response['data'] = {
+        products_schema = get_dumper(ProductSchema, many=True)
+        data, meta = paginate_resource(
+            Product.query.filter(*filters.values()), products_schema,
+            cursor_keys=sort_keys, descending=descending)
+        meta['facets'] = get_product_facets(filters)
+
+        return success_response('Products successfully fetched', {
             'products': data,
             'meta': meta
-        }
+        }), 200
+
+
+@product_namespace.route('/bulk')
+class ProductBulkResource(Resource):
+    """" Resource class for product bulk import endpoint """
+
+    @token_required
+    @permission_required
+    def post(self):
+        """ Endpoint to create or update products from a NDJSON or CSV body,
+            matched by name
+        """
+
+        if request.mimetype not in (NDJSON, CSV):
+            raise_validation_error(
+                f'The content type must be either {NDJSON} or {CSV}')
 
-        return success_response, 200
+        stream = io.TextIOWrapper(request.stream, encoding='utf-8')
+        report = import_products(stream, request.mimetype)
+
+        return success_response('Products successfully imported', report), 200
+
+
+@product_namespace.route('/export')
+class ProductExportResource(Resource):
+    """" Resource class for product export endpoint """
+
+    @token_required
+    @permission_required
+    def get(self):
+        """ Endpoint to download every product as NDJSON or CSV """
+
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            raise_validation_error('The format must be either ndjson or csv')
+
+        mimetype = CSV if export_format == 'csv' else NDJSON
+        return Response(stream_with_context(export_products(mimetype)),
+                        mimetype=mimetype)
+
+
+@product_namespace.route('/search')
+class ProductSearchResource(Resource):
+    """" Resource class for product search endpoint """
+
+    @sql_budget(2)
+    @read_replica
+    @cached_response('products')
+    def get(self):
+        """ Endpoint to search products, best matches first """
+
+        text = request.args.get('q')
+        ProductValidators.validate_search_query(text)
+
+        products, rank = Product.search(text)
+        products_schema = get_dumper(ProductSchema, many=True)
+        data, meta = paginate_resource_by_cursor(
+            products, products_schema, (rank, Product.id), descending=True)
+
+        return success_response('Products successfully fetched', {
+            'products': data,
+            'meta': meta
+        }), 200
 
 
 @product_namespace.route('/<int:product_id>')
 class SingleProductResource(Resource):
     """" Resource class for single product endpoints """
 
+    @sql_budget(2)
+    @read_replica
+    @cached_response('products')
+    @conditional_get(Product)
     def get(self, product_id):
         """" Endpoint to get a single product """
 
-        product_schema = ProductSchema()
+        product_schema = get_dumper(ProductSchema)
         product = product_schema.dump(Product.find_by_id(product_id))
 
         if not product:
-            error_response['message'] = 'Product not found'
-            return error_response, 404
-        success_response['message'] = 'Product successfully fetched'
-        success_response['data'] = {
+            return error_response('Product not found'), 404
+        return success_response('Product successfully fetched', {
             'product': product
-        }
-
-        return success_response, 200
+        }), 200
 
     @token_required
     @permission_required
@@ -82,12 +168,11 @@ class SingleProductResource(Resource):
     def put(self, product_id):
         """" Endpoint to update product """
 
-        product_schema = ProductSchema()
+        product_schema = get_schema(ProductSchema)
         product = Product.find_by_id(product_id)
 
         if not product:
-            error_response['message'] = 'Product not found'
-            return error_response, 404
+            return error_response('Product not found'), 404
 
         request_data = request.get_json()
         ProductValidators.validate(request_data, product_id=product_id)
@@ -96,30 +181,23 @@ class SingleProductResource(Resource):
 
         product.update(request_data)
 
-        success_response['message'] = 'Product successfully updated'
-        success_response['data'] = {
+        return success_response('Product successfully updated', {
             'product': product_schema.dump(product)
-        }
-
-        return success_response, 200
+        }), 200
 
     @token_required
     @permission_required
     def delete(self, product_id):
         """" Endpoint to delete a product """
 
-        product_schema = ProductSchema()
+        product_schema = get_schema(ProductSchema)
         product = Product.find_by_id(product_id)
 
         if not product:
-            error_response['message'] = 'Product not found'
-            return error_response, 404
+            return error_response('Product not found'), 404
 
         product.delete()
 
-        success_response['message'] = 'Product successfully deleted'
-        success_response['data'] = {
+        return success_response('Product successfully deleted', {
             'product': product_schema.dump(product)
-        }
-
-        return success_response, 200
+        }), 200
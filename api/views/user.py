@@ -2,7 +2,6 @@
 
 from flask import request
 from flask_restx import Resource
-import bcrypt
 import random
 import string
 from api.utilities.helpers import request_data_strip
@@ -19,9 +18,16 @@ from api.utilities.helpers.responses import success_response, error_response
 from api.utilities.validators.user import UserValidators
 from api.utilities.generate_token import generate_auth_token, verify_user_token
 from api.utilities.send_email import send_email
+from api.utilities.password_hasher import (
+    hash_password,
+    check_password,
+    password_needs_rehash,
+)
+from api.models.database import db
 from api.models.user import User
 from api.models.cart import Cart
 from api.schemas.user import UserSchema
+from api.schemas.registry import get_schema
 
 
 @user_namespace.route("/signup")
@@ -37,20 +43,19 @@ class UserSignupResource(Resource):
 
         request_data = request_data_strip(request_data)
 
-        bytes_password = bytes(request_data["password"], encoding="utf-8")
-        hashed = bcrypt.hashpw(bytes_password, bcrypt.gensalt(10))
-        request_data["password"] = hashed.decode("utf-8")
+        request_data["password"] = hash_password(request_data["password"])
 
         confirmation_code = "".join(random.choices(string.digits, k=6))
         request_data["confirmation_code"] = confirmation_code
 
         new_user = User(**request_data)
-        new_user.save()
+        new_user.save(commit=False)
 
-        user_schema = UserSchema()
+        user_schema = get_schema(UserSchema)
         user_data = user_schema.dump(new_user)
 
         send_email(user_data, "Confirmation Email", "confirmation_email.html")
+        db.session.commit()
 
         return {
             "status": "success",
@@ -67,12 +72,10 @@ class UserActivateResource(Resource):
 
         user = verify_user_token(token)
         if user is None:
-            error_response["message"] = "Account activation token is invalid"
-            return error_response, 400
+            return error_response("Account activation token is invalid"), 400
 
         if user.is_activated:
-            error_response["message"] = "User account already activated"
-            return error_response, 400
+            return error_response("User account already activated"), 400
 
         user.update({"is_activated": True})
         user_cart = Cart(user_id=user.id)
@@ -91,29 +94,27 @@ class UserLoginResource(Resource):
 
         request_data = request.get_json()
         email = request_data["email"]
-        password = bytes(request_data["password"], encoding="utf-8")
+        password = request_data["password"]
         user: User = User.query.filter(User.email == email).first()
-        error_response["message"] = "Incorrect username or password"
-        user_schema = UserSchema()
+        message = "Incorrect username or password"
 
         if user:
             if not user.is_activated:
-                error_response["message"] = "Your account has not yet been verified"
-                return error_response, 434
+                return error_response("Your account has not yet been verified"), 434
 
-            user_data = user_schema.dump(user)
-            hashed = bytes(user_data["password"], encoding="utf-8")
+            if check_password(password, user.password):
+                if password_needs_rehash(user.password):
+                    user.update({"password": hash_password(password)})
 
-            if bcrypt.checkpw(password, hashed):
-                user_schema = UserSchema(exclude=["password"])
+                user_schema = get_schema(UserSchema, exclude=["password"])
                 logged_in_user = user_schema.dump(user)
                 token = generate_auth_token(logged_in_user)
-                success_response["message"] = "User successfully logged in"
-                success_response["data"] = {"token": token, "user": logged_in_user}
-
-                return success_response, 200
-            return error_response, 404
-        return error_response, 404
+                return success_response(
+                    "User successfully logged in",
+                    {"token": token, "user": logged_in_user},
+                ), 200
+            return error_response(message), 404
+        return error_response(message), 404
 
 
 @user_namespace.route("/reset-password")
@@ -129,18 +130,18 @@ class ResetRequestResource(Resource):
         user = User.find_by_email(email)
 
         if not user:
-            error_response["message"] = "User not found"
-            return error_response, 404
+            return error_response("User not found"), 404
 
         reset_code = ''.join(random.choices(string.digits, k=6))
-        user.update({"reset_code": reset_code})
+        user.update({"reset_code": reset_code}, commit=False)
 
-        user_schema = UserSchema()
+        user_schema = get_schema(UserSchema)
         send_email(
             user_schema.dump(user),
             "Password Reset Request",
             "password_reset_email.html",
         )
+        db.session.commit()
 
         return {
             "status": "success",
@@ -164,13 +165,10 @@ class PasswordResetVerifyCodeResource(Resource):
         user = User.query.filter_by(email=email).first()
 
         if user is None or user.reset_code != reset_code:
-            error_response["message"] = "Invalid reset code"
-            return error_response, 400
+            return error_response("Invalid reset code"), 400
 
         UserValidators.validate_password(new_password)
-        bytes_password = bytes(new_password, encoding="utf-8")
-        hashed = bcrypt.hashpw(bytes_password, bcrypt.gensalt(10))
-        password = hashed.decode("utf-8")
+        password = hash_password(new_password)
 
         user.update({"password": password, "reset_code": None})
 
@@ -195,12 +193,10 @@ class UserVerifyCodeResource(Resource):
         user = User.query.filter_by(email=email).first()
 
         if user.is_activated:
-            error_response["message"] = "User account already activated"
-            return error_response, 400
+            return error_response("User account already activated"), 400
 
         if user is None or user.confirmation_code != confirmation_code:
-            error_response["message"] = "Invalid confirmation code"
-            return error_response, 400
+            return error_response("Invalid confirmation code"), 400
 
 
         user.update({"is_activated": True, "confirmation_code": None})
@@ -224,20 +220,19 @@ class ResendCodeResource(Resource):
         user = User.query.filter_by(email=email).first()
 
         if user is None:
-            error_response["message"] = "User not found"
-            return error_response, 404
+            return error_response("User not found"), 404
 
         if user.is_activated:
-            error_response["message"] = "User account already activated"
-            return error_response, 400
+            return error_response("User account already activated"), 400
 
         confirmation_code = "".join(random.choices(string.digits, k=6))
-        user.update({"confirmation_code": confirmation_code})
+        user.update({"confirmation_code": confirmation_code}, commit=False)
 
-        user_schema = UserSchema()
+        user_schema = get_schema(UserSchema)
         user_data = user_schema.dump(user)
 
         send_email(user_data, "Confirmation Email", "confirmation_email.html")
+        db.session.commit()
 
         return {
             "status": "success",
@@ -0,0 +1,291 @@
+""" Synthetic dataset of the load tests
+
+    Seeds users, a category tree, brands, products, carts and orders into
+    the database of DATABASE_URL with a few server side statements
+    (generate_series), so millions of products take minutes, not hours.
+    Every seeded record is named with the bench- prefix and removed by the
+    clean command. Use a dedicated database.
+
+    Usage:
+        python -m benchmarks.dataset seed --users 1000 --products 1000000
+        python -m benchmarks.dataset clean
+"""
+
+import argparse
+import time
+import bcrypt
+from app import application
+from api.models.database import db
+from api.models.user import User
+from api.schemas.registry import get_schema
+from api.schemas.user import UserSchema
+
+PREFIX = 'bench-'
+PASSWORD = 'bench-password'
+WORDS = ['phone', 'laptop', 'camera', 'shoes', 'jacket', 'watch', 'leather',
+         'wireless', 'charger', 'cotton', 'running', 'gaming', 'steel',
+         'organic', 'portable', 'vintage', 'smart', 'classic', 'mini', 'pro']
+
+
+def seed_users(users):
+    """ Inserts activated users sharing the bcrypt hash of PASSWORD """
+
+    rounds = application.config.get('BCRYPT_LOG_ROUNDS', 10)
+    password = bcrypt.hashpw(PASSWORD.encode('utf-8'),
+                             bcrypt.gensalt(rounds)).decode('utf-8')
+    db.session.execute(f"""
+        INSERT INTO users (firstname, lastname, email, password, is_admin,
+                           is_activated, created_at)
+        SELECT 'bench', 'user ' || i, '{PREFIX}user-' || i || '@example.com',
+               :password, false, true, now()
+        FROM generate_series(1, :users) AS i
+    """, {'users': users, 'password': password})
+
+
+def seed_categories(depth, fanout):
+    """ Inserts a category tree, every category has fanout subcategories
+        down to the depth level, the products go to the leaves
+    """
+
+    db.session.execute(f"""
+        INSERT INTO categories (name, description, created_at)
+        SELECT '{PREFIX}category-1-' || i, 'Benchmark category', now()
+        FROM generate_series(1, :fanout) AS i
+    """, {'fanout': fanout})
+    db.session.execute(f"""
+        UPDATE categories SET path = '/' || id || '/'
+        WHERE name LIKE '{PREFIX}category-1-%'
+    """)
+
+    for level in range(2, depth + 1):
+        db.session.execute(f"""
+            INSERT INTO categories (name, description, parent_id, created_at)
+            SELECT '{PREFIX}category-{level}-' || parent.id || '-' || i,
+                   'Benchmark category', parent.id, now()
+            FROM categories AS parent, generate_series(1, :fanout) AS i
+            WHERE parent.name LIKE '{PREFIX}category-{level - 1}-%'
+        """, {'fanout': fanout})
+        db.session.execute(f"""
+            UPDATE categories SET path = parent.path || categories.id || '/'
+            FROM categories AS parent
+            WHERE categories.parent_id = parent.id
+              AND categories.name LIKE '{PREFIX}category-{level}-%'
+        """)
+
+
+def seed_brands(brands):
+    """ Inserts the brands """
+
+    db.session.execute(f"""
+        INSERT INTO brands (name, description, created_at)
+        SELECT '{PREFIX}brand-' || i, 'Benchmark brand', now()
+        FROM generate_series(1, :brands) AS i
+    """, {'brands': brands})
+
+
+def seed_products(products, depth):
+    """ Inserts the products into the leaf categories, with a stock large
+        enough for the checkouts of the load tests
+    """
+
+    words = ', '.join(f"'{word}'" for word in WORDS)
+    db.session.execute(f"""
+        INSERT INTO products (name, description, main_image, category_id,
+                              brand_id, price, quantity, created_at)
+        SELECT '{PREFIX}product-' || i,
+               w[1 + i % 20] || ' ' || w[1 + (i / 20) % 20] || ' ' ||
+               w[1 + (i / 400) % 20] || ' ' || w[1 + (i / 7) % 20],
+               '{{"url": "http://image.url", "public_id": "bench"}}',
+               leaves.ids[1 + i % array_length(leaves.ids, 1)],
+               brands.ids[1 + i % array_length(brands.ids, 1)],
+               1 + i % 1000, 1000000, now()
+        FROM generate_series(1, :products) AS i,
+             (SELECT ARRAY[{words}] AS w) AS vocabulary,
+             (SELECT array_agg(id ORDER BY id) AS ids FROM categories
+              WHERE name LIKE '{PREFIX}category-{depth}-%') AS leaves,
+             (SELECT array_agg(id ORDER BY id) AS ids FROM brands
+              WHERE name LIKE '{PREFIX}brand-%') AS brands
+    """, {'products': products})
+
+
+def seed_carts(items):
+    """ Inserts a cart of a few items for every user, with its summary """
+
+    db.session.execute(f"""
+        INSERT INTO carts (user_id, items_count, subtotal, created_at)
+        SELECT id, 0, 0, now() FROM users WHERE email LIKE '{PREFIX}%'
+    """)
+    db.session.execute(f"""
+        INSERT INTO cart_items (cart_id, product_id, quantity, created_at)
+        SELECT carts.id, products.ids[1 + (carts.id * 31 + i * 7919)
+                                      % array_length(products.ids, 1)],
+               1 + i % 3, now()
+        FROM carts JOIN users ON users.id = carts.user_id,
+             generate_series(1, :items) AS i,
+             (SELECT array_agg(id) AS ids FROM (
+                 SELECT id FROM products WHERE name LIKE '{PREFIX}%'
+                 ORDER BY id LIMIT 10000) AS popular) AS products
+        WHERE users.email LIKE '{PREFIX}%'
+    """, {'items': items})
+    db.session.execute(f"""
+        UPDATE carts SET
+            items_count = summary.items_count,
+            subtotal = summary.subtotal
+        FROM (SELECT cart_items.cart_id,
+                     sum(cart_items.quantity) AS items_count,
+                     sum(cart_items.quantity * products.price) AS subtotal
+              FROM cart_items JOIN products ON products.id = cart_items.product_id
+              GROUP BY cart_items.cart_id) AS summary
+        WHERE summary.cart_id = carts.id
+          AND carts.user_id IN (SELECT id FROM users WHERE email LIKE '{PREFIX}%')
+    """)
+
+
+def seed_orders(orders, items):
+    """ Inserts the past orders of every user, with their items """
+
+    db.session.execute(f"""
+        INSERT INTO orders (user_id, total_amount, status, created_at)
+        SELECT users.id, 0, 'Delivered', now() - i * interval '1 day'
+        FROM users, generate_series(1, :orders) AS i
+        WHERE users.email LIKE '{PREFIX}%'
+    """, {'orders': orders})
+    db.session.execute(f"""
+        INSERT INTO order_items (order_id, product_id, quantity, unit_price,
+                                 created_at)
+        SELECT orders.id, product.id, 1 + i % 2, product.price, now()
+        FROM orders JOIN users ON users.id = orders.user_id,
+             generate_series(1, :items) AS i,
+             LATERAL (SELECT id, price FROM products
+                      WHERE name = '{PREFIX}product-' || (1 + (orders.id * 13 + i) % 10000)
+                     ) AS product
+        WHERE users.email LIKE '{PREFIX}%'
+    """, {'items': items})
+    db.session.execute(f"""
+        UPDATE orders SET total_amount = totals.amount
+        FROM (SELECT order_id, sum(quantity * unit_price) AS amount
+              FROM order_items GROUP BY order_id) AS totals
+        WHERE totals.order_id = orders.id
+          AND orders.user_id IN (SELECT id FROM users WHERE email LIKE '{PREFIX}%')
+    """)
+
+
+def seed(users=100, products=100000, brands=50, depth=3, fanout=5,
+         cart_items=3, orders=5, order_items=3):
+    """
+        Seeds the dataset, step by step
+
+        Returns:
+            dict: duration of every step, in seconds
+    """
+
+    steps = [
+        ('users', lambda: seed_users(users)),
+        ('categories', lambda: seed_categories(depth, fanout)),
+        ('brands', lambda: seed_brands(brands)),
+        ('products', lambda: seed_products(products, depth)),
+        ('carts', lambda: seed_carts(cart_items)),
+        ('orders', lambda: seed_orders(orders, order_items)),
+    ]
+    durations = {}
+    for name, step in steps:
+        started_at = time.perf_counter()
+        step()
+        db.session.commit()
+        durations[name] = round(time.perf_counter() - started_at, 1)
+
+    for table in ['users', 'categories', 'brands', 'products', 'carts',
+                  'cart_items', 'orders', 'order_items']:
+        db.session.execute(f'ANALYZE {table}')
+    return durations
+
+
+def clean():
+    """ Removes every seeded record """
+
+    users = f"SELECT id FROM users WHERE email LIKE '{PREFIX}%'"
+    products = f"SELECT id FROM products WHERE name LIKE '{PREFIX}%'"
+    for statement in [
+            f'DELETE FROM order_items WHERE product_id IN ({products})',
+            f'DELETE FROM orders WHERE user_id IN ({users})',
+            f'DELETE FROM cart_items WHERE cart_id IN '
+            f'(SELECT id FROM carts WHERE user_id IN ({users}))',
+            f'DELETE FROM cart_items WHERE product_id IN ({products})',
+            f'DELETE FROM carts WHERE user_id IN ({users})',
+            f"DELETE FROM products WHERE name LIKE '{PREFIX}%'",
+            f"DELETE FROM categories WHERE name LIKE '{PREFIX}%'",
+            f"DELETE FROM brands WHERE name LIKE '{PREFIX}%'",
+            f"DELETE FROM users WHERE email LIKE '{PREFIX}%'"]:
+        db.session.execute(statement)
+    db.session.commit()
+
+
+def load(users):
+    """
+        Loads the seeded records the scenarios pick from
+
+        Args:
+            users (int): users acting in the load test
+        Returns:
+            dict: users (token payloads and emails), product IDs, leaf
+                category IDs and search words
+    """
+
+    bench_users = User.query.filter(User.email.like(f'{PREFIX}%'))\
+        .order_by(User.id).limit(users).all()
+    leaf_depth = db.session.execute(f"""
+        SELECT max(length(path) - length(replace(path, '/', ''))) FROM categories
+        WHERE name LIKE '{PREFIX}%'
+    """).scalar()
+    leaves = db.session.execute(f"""
+        SELECT id FROM categories WHERE name LIKE '{PREFIX}%'
+          AND length(path) - length(replace(path, '/', '')) = :depth
+    """, {'depth': leaf_depth}).fetchall()
+    product_ids = db.session.execute(f"""
+        SELECT min(id), max(id) FROM products WHERE name LIKE '{PREFIX}%'
+    """).fetchone()
+
+    if not bench_users or not leaves or product_ids[0] is None:
+        raise SystemExit('No dataset, run python -m benchmarks.dataset seed first')
+
+    user_schema = get_schema(UserSchema, exclude=['password'])
+    return {
+        'users': [user_schema.dump(user) for user in bench_users],
+        'password': PASSWORD,
+        'category_ids': [category_id for category_id, in leaves],
+        # The products are inserted by a single statement, their IDs follow
+        'product_ids': (product_ids[0], product_ids[1]),
+        'words': WORDS,
+    }
+
+
+def main():
+    """ Seeds or cleans the dataset """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=['seed', 'clean'])
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--brands', type=int, default=50)
+    parser.add_argument('--category-depth', type=int, default=3)
+    parser.add_argument('--category-fanout', type=int, default=5)
+    parser.add_argument('--cart-items', type=int, default=3)
+    parser.add_argument('--orders', type=int, default=5)
+    parser.add_argument('--order-items', type=int, default=3)
+    args = parser.parse_args()
+
+    with application.app_context():
+        if args.command == 'clean':
+            clean()
+            print('Removed the benchmark dataset')
+            return
+
+        durations = seed(args.users, args.products, args.brands,
+                         args.category_depth, args.category_fanout,
+                         args.cart_items, args.orders, args.order_items)
+        for name, duration in durations.items():
+            print(f'{name:<12}{duration:>8.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+""" Benchmark of the cold-start import time
+
+    Imports a few entry points in fresh interpreters with
+    python -X importtime and reports the median cumulative import time of
+    each, plus the slowest packages loaded by the application. The run
+    fails when --budget is given and the application import exceeds it.
+
+    Usage:
+        python -m benchmarks.import_time --repeat 5 --budget 800
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ['app', 'config.server', 'api.models.product', 'api.views.product']
+
+
+def import_times(module):
+    """
+    Imports a module in a fresh interpreter
+
+    Args:
+        module (str): module to import
+    Returns:
+        (dict): cumulative import time of every loaded module, in milliseconds
+    """
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        stderr=subprocess.PIPE, stdout=subprocess.DEVNULL,
+        universal_newlines=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def main():
+    """ Runs the benchmark """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--budget', type=float,
+                        help='maximum import time of app, in milliseconds')
+    args = parser.parse_args()
+
+    print(f'{"module":<24}{"median ms":>12}')
+    medians = {}
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        medians[module] = statistics.median(run[module] for run in runs)
+        print(f'{module:<24}{medians[module]:>12.1f}')
+
+    # Top level packages only, their submodules are included in their time
+    packages = {name: cumulative for name, cumulative in runs[0].items()
+                if '.' not in name}
+    print(f'\nSlowest packages loaded by {MODULES[-1]}:')
+    for name, cumulative in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f'  {name:<22}{cumulative:>12.1f}')
+
+    if args.budget and medians['app'] > args.budget:
+        sys.exit(f'The app import takes {medians["app"]:.0f} ms, '
+                 f'over the {args.budget:.0f} ms budget')
+
+
+if __name__ == '__main__':
+    main()
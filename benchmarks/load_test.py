@@ -0,0 +1,327 @@
+""" Load test of the API on the seeded dataset
+
+    Runs virtual users, one thread each, playing a weighted mix of the
+    scenarios of benchmarks/scenarios.py for a fixed duration. The target
+    is the application in process (Flask test client), a local gunicorn
+    started for the run, or the URL of a running server. Reports the
+    requests per second and the p50/p95/p99 latencies of every route, and
+    writes them as a JSON baseline. A previous baseline given with
+    --compare is diffed, the run fails when a route regressed by more
+    than the tolerance.
+
+    Usage:
+        python -m benchmarks.dataset seed --users 100 --products 1000000
+        python -m benchmarks.load_test --target gunicorn --users 16 \\
+            --duration 60 --output baseline.json
+        python -m benchmarks.load_test --compare baseline.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+from app import application
+from api.utilities.generate_token import generate_auth_token
+from .dataset import load
+from .scenarios import SCENARIOS
+
+DEFAULT_MIX = 'browse=5,search=2,add_to_cart=2,checkout=1,login=1'
+
+
+class Client:
+    """ Client of a virtual user, recording the latency of every request """
+
+    def __init__(self, user):
+        self.user = user
+        self.token = generate_auth_token(user)
+        self.samples = []
+
+    def request(self, method, path, name, query=None, body=None, auth=False,
+                expected=200):
+        """
+            Sends a request and records its latency under the route name
+
+            Args:
+                method (str): HTTP method
+                path (str): URL path
+                name (str): route name of the request
+                query (dict): query string params
+                body (dict): JSON body
+                auth (bool): True to send the token of the user
+                expected (int): status code of a successful response
+        """
+
+        headers = {'Content-Type': 'application/json'}
+        if auth:
+            headers['Authorization'] = self.token
+        if query:
+            path = f'{path}?{urlencode(query)}'
+        data = None if body is None else json.dumps(body)
+
+        started_at = time.perf_counter()
+        status = self.send(method, path, data, headers)
+        self.samples.append(
+            (name, time.perf_counter() - started_at, status == expected))
+
+    def send(self, method, path, data, headers):
+        """ Sends a request, returns the response status code """
+
+        raise NotImplementedError
+
+
+class InProcessClient(Client):
+    """ Client calling the application through the Flask test client """
+
+    def __init__(self, user):
+        super().__init__(user)
+        self.client = application.test_client()
+
+    def send(self, method, path, data, headers):
+        response = self.client.open(path, method=method, data=data,
+                                    headers=headers)
+        response.get_data()
+        return response.status_code
+
+
+class HTTPClient(Client):
+    """ Client calling a server over a keep-alive HTTP connection """
+
+    def __init__(self, user, url):
+        super().__init__(user)
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.connection = http.client.HTTPConnection(self.host, self.port,
+                                                     timeout=30)
+
+    def send(self, method, path, data, headers):
+        try:
+            self.connection.request(method, path, body=data, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            # The server closed the connection, reopened by the next request
+            self.connection.close()
+            return 0
+
+
+def parse_mix(mix):
+    """
+        Parses the scenarios mix
+
+        Args:
+            mix (str): comma separated scenario=weight pairs
+        Returns:
+            dict: weight of every scenario
+    """
+
+    weights = {}
+    for pair in mix.split(','):
+        name, _, weight = pair.partition('=')
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f'Unknown scenario {name}, '
+                             f'choose from {", ".join(SCENARIOS)}')
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def percentile(values, fraction):
+    """ Gets the nearest-rank percentile of sorted values """
+
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def summarize(samples, elapsed):
+    """
+        Summarizes the samples of a route
+
+        Args:
+            samples (list): latency in seconds and success of every request
+            elapsed (float): measured duration in seconds
+        Returns:
+            dict: requests, errors, requests per second and latencies in ms
+    """
+
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, ok in samples if not ok),
+        'rps': round(len(samples) / elapsed, 1),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+    }
+
+
+def run(make_client, dataset, weights, users, duration, warmup, seed):
+    """
+        Runs the virtual users, the requests of the warmup aren't measured
+
+        Returns:
+            tuple: samples of every route and measured duration
+    """
+
+    started_at = time.perf_counter() + warmup
+    stopped_at = started_at + duration
+    names, scenario_weights = list(weights), list(weights.values())
+
+    def virtual_user(index):
+        generator = random.Random(seed + index)
+        client = make_client(dataset['users'][index % len(dataset['users'])])
+        measured = False
+        while time.perf_counter() < stopped_at:
+            if not measured and time.perf_counter() >= started_at:
+                client.samples.clear()
+                measured = True
+            scenario = generator.choices(names, scenario_weights)[0]
+            SCENARIOS[scenario](client, dataset, generator)
+        return client.samples
+
+    routes = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=users) as executor:
+        for samples in executor.map(virtual_user, range(users)):
+            for name, latency, ok in samples:
+                routes[name].append((latency, ok))
+
+    return routes, time.perf_counter() - started_at
+
+
+def compare(baseline, report, tolerance):
+    """
+        Diffs the routes of two reports
+
+        Args:
+            baseline (dict): previous report
+            report (dict): current report
+            tolerance (float): accepted relative change
+        Returns:
+            list: regressed routes
+    """
+
+    regressions = []
+    print(f'\n{"route":<26}{"p95 ms":>19}{"change":>9}{"req/s":>19}{"change":>9}')
+    for name, current in report['endpoints'].items():
+        previous = baseline['endpoints'].get(name)
+        if previous is None:
+            continue
+        p95_change = current['p95_ms'] / previous['p95_ms'] - 1
+        rps_change = current['rps'] / previous['rps'] - 1 if previous['rps'] else 0
+        print(f'{name:<26}{previous["p95_ms"]:>8} -> {current["p95_ms"]:<7}'
+              f'{p95_change:>+9.0%}{previous["rps"]:>8} -> {current["rps"]:<7}'
+              f'{rps_change:>+9.0%}')
+        if p95_change > tolerance or rps_change < -tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def start_gunicorn(port):
+    """ Starts a local gunicorn with gunicorn.conf.py, once it accepts requests """
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py',
+         'app:application'], env=dict(os.environ, PORT=str(port)))
+    url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f'{url}/metrics', timeout=1)
+            return server, url
+        except urllib.error.HTTPError:
+            return server, url
+        except OSError:
+            if server.poll() is not None:
+                raise SystemExit('gunicorn failed to start')
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit('gunicorn is not accepting requests')
+
+
+def main():
+    """ Runs the load test and writes the report """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', default='inprocess',
+                        help='inprocess, gunicorn or the URL of a server')
+    parser.add_argument('--port', type=int, default=8100,
+                        help='port of the gunicorn target')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help='comma separated scenario=weight pairs')
+    parser.add_argument('--users', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--warmup', type=float, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='JSON report path')
+    parser.add_argument('--compare', help='JSON report of a previous run')
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    with application.app_context():
+        dataset = load(args.users)
+
+    server = None
+    if args.target == 'inprocess':
+        make_client = InProcessClient
+    else:
+        url = args.target
+        if args.target == 'gunicorn':
+            server, url = start_gunicorn(args.port)
+        make_client = lambda user: HTTPClient(user, url)
+
+    try:
+        routes, elapsed = run(make_client, dataset, weights, args.users,
+                              args.duration, args.warmup, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        'meta': {
+            'target': args.target,
+            'mix': weights,
+            'users': args.users,
+            'duration': round(elapsed, 1),
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'endpoints': {name: summarize(samples, elapsed)
+                      for name, samples in sorted(routes.items())},
+        'total': summarize([sample for samples in routes.values()
+                            for sample in samples], elapsed),
+    }
+
+    print(f'{"route":<26}{"requests":>9}{"errors":>7}{"req/s":>8}'
+          f'{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}')
+    for name, result in list(report['endpoints'].items()) + \
+            [('total', report['total'])]:
+        print(f'{name:<26}{result["requests"]:>9}{result["errors"]:>7}'
+              f'{result["rps"]:>8}{result["p50_ms"]:>9}{result["p95_ms"]:>9}'
+              f'{result["p99_ms"]:>9}')
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(json.load(baseline_file), report, args.tolerance)
+        if regressions:
+            raise SystemExit(f'Regressed by more than {args.tolerance:.0%}: '
+                             f'{", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
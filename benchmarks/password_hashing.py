@@ -0,0 +1,87 @@
+""" Benchmark of the login throughput versus the password hashing pool size
+
+    Simulates concurrent logins (the password check dominates the login
+    cost) against PasswordHasher instances of growing pool sizes, and
+    reports the checks per second and the share of rejected requests.
+
+    Usage:
+        python -m benchmarks.password_hashing --rounds 10 --clients 16
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from werkzeug.exceptions import ServiceUnavailable
+from api.utilities.password_hasher import PasswordHasher
+
+
+def run(pool_size, queue_size, rounds, clients, logins, wait_timeout):
+    """
+    Runs concurrent password checks through a hasher
+
+    Args:
+        pool_size (int): hashing workers
+        queue_size (int): requests allowed to wait for a worker
+        rounds (int): bcrypt cost
+        clients (int): concurrent clients
+        logins (int): logins per client
+        wait_timeout (float): seconds a request waits for a free slot
+    Returns:
+        (dict): benchmark results
+    """
+
+    password_hasher = PasswordHasher(workers=pool_size, queue_size=queue_size,
+                                     rounds=rounds, wait_timeout=wait_timeout)
+    hashed = bcrypt.hashpw(b'Password1234', bcrypt.gensalt(rounds))\
+        .decode('utf-8')
+
+    def client():
+        accepted = rejected = 0
+        for _ in range(logins):
+            try:
+                password_hasher.check('Password1234', hashed)
+                accepted += 1
+            except ServiceUnavailable:
+                rejected += 1
+        return accepted, rejected
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(lambda _: client(), range(clients)))
+    elapsed = time.perf_counter() - started_at
+    password_hasher.executor.shutdown()
+
+    accepted = sum(result[0] for result in results)
+    rejected = sum(result[1] for result in results)
+    return {
+        'pool_size': pool_size,
+        'logins_per_second': round(accepted / elapsed, 1),
+        'rejected': rejected,
+        'elapsed': round(elapsed, 2),
+    }
+
+
+def main():
+    """ Runs the benchmark for every pool size """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=5)
+    parser.add_argument('--queue-size', type=int, default=8)
+    parser.add_argument('--wait-timeout', type=float, default=1)
+    parser.add_argument('--pool-sizes', type=int, nargs='+',
+                        default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f'{"pool":>4} {"logins/s":>10} {"rejected":>9} {"elapsed":>8}')
+    for pool_size in args.pool_sizes:
+        result = run(pool_size, args.queue_size, args.rounds, args.clients,
+                     args.logins, args.wait_timeout)
+        print(f'{result["pool_size"]:>4} {result["logins_per_second"]:>10} '
+              f'{result["rejected"]:>9} {result["elapsed"]:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+""" Benchmark of the product search endpoint on a synthetic catalog
+
+    Seeds synthetic products (server side, with generate_series) into the
+    database of DATABASE_URL, then reports the latency percentiles of
+    GET /products/search for a few queries of growing selectivity.
+    Use a dedicated database: the seeded products are deleted at the end
+    unless --keep is given.
+
+    Usage:
+        python -m benchmarks.product_search --products 1000000
+"""
+
+import argparse
+import statistics
+import time
+from app import application
+from api.models.database import db
+from api.models.brand import Brand
+from api.models.category import Category
+from api.utilities.cache import LRUCache, set_cache
+
+NAME_PREFIX = 'bench-product-'
+WORDS = ['phone', 'laptop', 'camera', 'shoes', 'jacket', 'watch', 'leather',
+         'wireless', 'charger', 'cotton', 'running', 'gaming', 'steel',
+         'organic', 'portable', 'vintage', 'smart', 'classic', 'mini', 'pro']
+QUERIES = ['phone', 'wireless charger', 'vintage leather jacket',
+           'gaming -laptop', '"smart watch"', 'xyzzy']
+
+
+def seed(products, category_id, brand_id):
+    """ Inserts the synthetic products with a single statement """
+
+    words = ', '.join(f"'{word}'" for word in WORDS)
+    db.session.execute(f"""
+        INSERT INTO products (name, description, main_image, category_id,
+                              brand_id, price, quantity, created_at)
+        SELECT '{NAME_PREFIX}' || i,
+               w[1 + i % 20] || ' ' || w[1 + (i / 20) % 20] || ' ' ||
+               w[1 + (i / 400) % 20] || ' ' || w[1 + (i / 7) % 20],
+               '{{"url": "http://image.url", "public_id": "bench"}}',
+               :category_id, :brand_id, 1 + i % 1000, i % 50, now()
+        FROM generate_series(1, :products) AS i,
+             (SELECT ARRAY[{words}] AS w) AS vocabulary
+    """, {'products': products, 'category_id': category_id,
+          'brand_id': brand_id})
+    db.session.commit()
+    db.session.execute('ANALYZE products')
+
+
+def measure(client, query, repeat):
+    """ Measures the latency of a search, in milliseconds """
+
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        response = client.get('/api/v1/products/search',
+                              query_string={'q': query, 'limit': 20})
+        timings.append((time.perf_counter() - started_at) * 1000)
+        assert response.status_code == 200, response.json
+
+    timings.sort()
+    return {
+        'p50': round(statistics.median(timings), 1),
+        'p95': round(timings[int(len(timings) * 0.95) - 1], 1),
+        'results': len(response.json['data']['products']),
+    }
+
+
+def main():
+    """ Seeds the catalog and runs the searches """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--keep', action='store_true')
+    args = parser.parse_args()
+
+    # Every request must reach the database
+    set_cache(LRUCache(max_entries=0))
+
+    with application.app_context():
+        category = Category(name='benchmark category')
+        brand = Brand(name='benchmark brand')
+        category.save()
+        brand.save()
+
+        started_at = time.perf_counter()
+        seed(args.products, category.id, brand.id)
+        print(f'Seeded {args.products} products in '
+              f'{time.perf_counter() - started_at:.1f}s')
+
+        try:
+            client = application.test_client()
+            print(f'{"query":<26} {"p50 ms":>8} {"p95 ms":>8} {"results":>8}')
+            for query in QUERIES:
+                result = measure(client, query, args.repeat)
+                print(f'{query:<26} {result["p50"]:>8} {result["p95"]:>8} '
+                      f'{result["results"]:>8}')
+        finally:
+            if not args.keep:
+                db.session.rollback()
+                db.session.execute(
+                    f"DELETE FROM products WHERE name LIKE '{NAME_PREFIX}%'")
+                db.session.delete(category)
+                db.session.delete(brand)
+                db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+""" Scenarios of the load tests
+
+    Every scenario plays the requests of a user journey through a client
+    (see benchmarks/load_test.py) and picks its records from the seeded
+    dataset (see benchmarks/dataset.py). The requests are recorded under
+    the name of their route, not their URL, so the percentiles of
+    /products/1 and /products/2 add up.
+"""
+
+API_PREFIX = '/api/v1'
+
+
+def pick_product(dataset, random):
+    """ Picks a seeded product ID """
+
+    return random.randint(*dataset['product_ids'])
+
+
+def browse(client, dataset, random):
+    """ Lists the products of a category, opens one and the category tree """
+
+    client.request('GET', f'{API_PREFIX}/products', 'GET /products', query={
+        'category_id': random.choice(dataset['category_ids']), 'limit': 20})
+    client.request('GET', f'{API_PREFIX}/products/{pick_product(dataset, random)}',
+                   'GET /products/<id>')
+    client.request('GET', f'{API_PREFIX}/categories/tree', 'GET /categories/tree')
+
+
+def search(client, dataset, random):
+    """ Searches the products with two words """
+
+    words = random.sample(dataset['words'], 2)
+    client.request('GET', f'{API_PREFIX}/products/search', 'GET /products/search',
+                   query={'q': ' '.join(words), 'limit': 20})
+
+
+def add_to_cart(client, dataset, random):
+    """ Adds a product to the cart and reads the cart summary """
+
+    client.request('POST', f'{API_PREFIX}/auth/cart', 'POST /auth/cart',
+                   body={'product_id': pick_product(dataset, random),
+                         'quantity': 1}, auth=True)
+    client.request('GET', f'{API_PREFIX}/auth/cart/summary',
+                   'GET /auth/cart/summary', auth=True)
+
+
+def checkout(client, dataset, random):
+    """ Orders two products and lists the orders """
+
+    client.request('POST', f'{API_PREFIX}/auth/orders', 'POST /auth/orders', body={
+        'items': [{'product_id': pick_product(dataset, random), 'quantity': 1}
+                  for _ in range(2)]}, auth=True, expected=201)
+    client.request('GET', f'{API_PREFIX}/auth/orders', 'GET /auth/orders',
+                   query={'limit': 10}, auth=True)
+
+
+def login(client, dataset, random):
+    """ Logs in with the password of the client user """
+
+    client.request('POST', f'{API_PREFIX}/auth/login', 'POST /auth/login', body={
+        'email': client.user['email'], 'password': dataset['password']})
+
+
+SCENARIOS = {
+    'browse': browse,
+    'search': search,
+    'add_to_cart': add_to_cart,
+    'checkout': checkout,
+    'login': login,
+}
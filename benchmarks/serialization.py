@@ -0,0 +1,71 @@
+""" Benchmark of the product list serialization
+
+    Dumps a list of transient products with a new ProductSchema per call
+    (the previous behavior of the endpoints), with the shared schema of
+    the registry and with the precompiled fast dumper, and reports the
+    dumps per second of each. No database is needed.
+
+    Usage:
+        python -m benchmarks.serialization --products 1000 --repeat 50
+"""
+
+import argparse
+import datetime
+import time
+from api.models.product import Product
+from api.schemas.product import ProductSchema
+from api.schemas.registry import get_dumper, get_schema
+
+
+def make_products(count):
+    """ Builds transient products """
+
+    now = datetime.datetime.utcnow()
+    return [
+        Product(id=index, name=f'product {index}', description='Some product',
+                main_image={'url': 'http://image.url', 'public_id': 'bench'},
+                images=[{'url': 'http://image.url', 'public_id': 'other'}],
+                category_id=1, brand_id=1, price=index + 0.5, quantity=index,
+                created_at=now, updated_at=now)
+        for index in range(count)
+    ]
+
+
+def measure(dump, products, repeat):
+    """ Measures the dumps of the whole list per second """
+
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        dump(products)
+    return repeat / (time.perf_counter() - started_at)
+
+
+def main():
+    """ Runs the benchmark """
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    products = make_products(args.products)
+    serializers = [
+        ('new ProductSchema per dump',
+         lambda items: ProductSchema(many=True).dump(items)),
+        ('shared ProductSchema', get_schema(ProductSchema, many=True).dump),
+        ('fast dumper', get_dumper(ProductSchema, many=True).dump),
+    ]
+    expected = ProductSchema(many=True).dump(products)
+    for _, dump in serializers:
+        assert dump(products) == expected
+
+    baseline = None
+    print(f'{"serializer":<28}{"dumps/s":>10}{"speedup":>10}')
+    for name, dump in serializers:
+        rate = measure(dump, products, args.repeat)
+        baseline = baseline or rate
+        print(f'{name:<28}{rate:>10.1f}{rate / baseline:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
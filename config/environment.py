@@ -7,6 +7,77 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def get_pool_plan(workers, threads, max_connections, reserved_connections,
+                  pool_size=None, max_overflow=5):
+    """
+        Sizes the connection pool of each web worker so that every worker
+        with a full pool never uses more than the Postgres connection budget
+        Args:
+            workers(int): gunicorn worker processes
+            threads(int): threads per worker
+            max_connections(int): connections allowed by the database
+            reserved_connections(int): connections kept for the email
+                worker, migrations and maintenance
+            pool_size(int): connections kept open per worker, a connection
+                per thread plus one for the email dispatcher by default
+            max_overflow(int): extra connections opened under load
+
+        Returns:
+            dict: pool size, overflow and connections per worker and in total
+    """
+
+    budget = (max_connections - reserved_connections) // workers
+    if budget < 1:
+        raise ValueError(
+            f'{max_connections - reserved_connections} database connections '
+            f"can't be shared by {workers} workers")
+
+    pool_size = min(pool_size or threads + 1, budget)
+    max_overflow = max(0, min(max_overflow, budget - pool_size))
+    return {
+        'workers': workers,
+        'threads': threads,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'worker_connections': pool_size + max_overflow,
+        'total_connections': workers * (pool_size + max_overflow),
+        'max_connections': max_connections,
+    }
+
+
+def load_pool_plan():
+    """
+        Sizes the connection pool from the WEB_CONCURRENCY, GUNICORN_THREADS
+        and DATABASE_* env vars, see get_pool_plan
+
+        Returns:
+            dict: pool size, overflow and connections per worker and in total
+    """
+
+    return get_pool_plan(
+        int(getenv("WEB_CONCURRENCY", "2")),
+        int(getenv("GUNICORN_THREADS", "4")),
+        int(getenv("DATABASE_MAX_CONNECTIONS", "20")),
+        int(getenv("DATABASE_RESERVED_CONNECTIONS", "4")),
+        int(getenv("DATABASE_POOL_SIZE", "0")),
+        int(getenv("DATABASE_MAX_OVERFLOW", "5")),
+    )
+
+
+def make_replica_binds(urls):
+    """
+        Generates the SQLAlchemy binds of the read replicas
+        Args:
+            urls(str): comma separated database URLs of the replicas
+
+        Returns:
+            dict: replica0, replica1... bind keys and their URL
+    """
+
+    urls = [url.strip() for url in urls.split(",") if url.strip()]
+    return {f"replica{index}": url for index, url in enumerate(urls)}
+
+
 class Config(object):
     """App base configuration"""
 
@@ -17,6 +88,49 @@ class Config(object):
     MAIL_USE_TLS = getenv("MAIL_USE_TLS")
     MAIL_USERNAME = getenv("MAIL_USERNAME")
     MAIL_PASSWORD = getenv("MAIL_PASSWORD")
+    CACHE_BACKEND = getenv("CACHE_BACKEND", "memory")
+    CACHE_URL = getenv("CACHE_URL")
+    CACHE_TTL = int(getenv("CACHE_TTL", "60"))
+    CACHE_MAX_ENTRIES = int(getenv("CACHE_MAX_ENTRIES", "1024"))
+    TOKEN_CACHE_MAX_ENTRIES = int(getenv("TOKEN_CACHE_MAX_ENTRIES", "4096"))
+    TOKEN_CACHE_TTL = int(getenv("TOKEN_CACHE_TTL", "300"))
+    ADMIN_ROLE_CACHE_TTL = int(getenv("ADMIN_ROLE_CACHE_TTL", "30"))
+    BCRYPT_LOG_ROUNDS = int(getenv("BCRYPT_LOG_ROUNDS", "10"))
+    PASSWORD_HASH_WORKERS = int(getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE_SIZE = int(getenv("PASSWORD_HASH_QUEUE_SIZE", "8"))
+    PASSWORD_HASH_WAIT_TIMEOUT = float(getenv("PASSWORD_HASH_WAIT_TIMEOUT", "1"))
+    EMAIL_DISPATCHER = getenv("EMAIL_DISPATCHER", "thread")
+    EMAIL_BATCH_SIZE = int(getenv("EMAIL_BATCH_SIZE", "50"))
+    EMAIL_MAX_ATTEMPTS = int(getenv("EMAIL_MAX_ATTEMPTS", "5"))
+    EMAIL_RETRY_BACKOFF = int(getenv("EMAIL_RETRY_BACKOFF", "30"))
+    EMAIL_POLL_INTERVAL = int(getenv("EMAIL_POLL_INTERVAL", "10"))
+    PRODUCT_IMPORT_CHUNK_SIZE = int(getenv("PRODUCT_IMPORT_CHUNK_SIZE", "500"))
+    JSON_ENCODER = getenv("JSON_ENCODER", "orjson")
+    API_DOCS = getenv("API_DOCS", "true").lower() == "true"
+    SQLALCHEMY_BINDS = make_replica_binds(getenv("DATABASE_REPLICA_URLS", ""))
+    READ_YOUR_WRITES_WINDOW = int(getenv("READ_YOUR_WRITES_WINDOW", "5"))
+    SQL_INSTRUMENTATION = getenv("SQL_INSTRUMENTATION", "false").lower() == "true"
+    SQL_STATEMENT_BUDGET = int(getenv("SQL_STATEMENT_BUDGET", "20"))
+    SQL_REPEATED_STATEMENT_LIMIT = int(getenv("SQL_REPEATED_STATEMENT_LIMIT", "3"))
+    SQL_BUDGET_ACTION = getenv("SQL_BUDGET_ACTION", "warn")
+    METRICS = getenv("METRICS", "true").lower() == "true"
+    METRICS_ENDPOINT = getenv("METRICS_ENDPOINT", "true").lower() == "true"
+    METRICS_ALLOWED_NETWORKS = getenv(
+        "METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128")
+    METRICS_PORT = int(getenv("METRICS_PORT") or "0")
+    PROFILING = getenv("PROFILING", "false").lower() == "true"
+    PROFILE_DIR = getenv("PROFILE_DIR")
+    PROFILE_MAX_FILES = int(getenv("PROFILE_MAX_FILES", "100"))
+    DATABASE_POOL_PLAN = load_pool_plan()
+    WEB_CONCURRENCY = DATABASE_POOL_PLAN["workers"]
+    GUNICORN_THREADS = DATABASE_POOL_PLAN["threads"]
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": DATABASE_POOL_PLAN["pool_size"],
+        "max_overflow": DATABASE_POOL_PLAN["max_overflow"],
+        "pool_pre_ping": True,
+        "pool_recycle": int(getenv("DATABASE_POOL_RECYCLE", "1800")),
+        "pool_timeout": int(getenv("DATABASE_POOL_TIMEOUT", "10")),
+    }
 
 
 class ProductionConfig(Config):
@@ -1,11 +1,11 @@
 """ Module for Server configuration """
 
 from flask import Flask, Blueprint
-from flask_restx import Api
 from flask_mail import Mail
 from config.environment import AppConfig
+from api.utilities.json_encoder import JSONEncoder
 
-api_blueprint = Blueprint('api_blueprint', __name__, url_prefix='/api/v1')
+mail = Mail()
 authorizations = {
     'Token Auth': {
         'type': 'apiKey',
@@ -14,24 +14,87 @@ authorizations = {
     }
 }
 
-api = Api(
-    api_blueprint,
-    title='Dash Shop API',
-    description='Online shopping API',
-    security='Token Auth',
-    doc='/documentation',
-    authorizations=authorizations)
+
+def create_api_blueprint(docs=True):
+    """
+        Creates the API blueprint with the endpoints of every namespace.
+        The endpoints modules are only imported here, so importing the
+        models or the config doesn't load Flask-RESTX and the views
+        Args:
+            docs(bool): False to disable the Swagger documentation
+
+        Returns:
+            Blueprint: API blueprint
+    """
+
+    from flask_restx import Api
+    from api.utilities.json_encoder import output_json
+    from api.utilities.helpers.swagger.collections import NAMESPACES
+    import api.views.user
+    import api.views.category
+    import api.views.brand
+    import api.views.product
+    import api.views.cart
+    import api.views.order
+
+    api_blueprint = Blueprint('api_blueprint', __name__, url_prefix='/api/v1')
+    rest_api = Api(
+        title='Dash Shop API',
+        description='Online shopping API',
+        security='Token Auth',
+        doc='/documentation' if docs else False,
+        authorizations=authorizations)
+    # add_specs is only read by init_app, it removes the swagger.json endpoint
+    rest_api.init_app(api_blueprint, add_specs=docs)
+    rest_api.representations['application/json'] = output_json
+
+    # Remove default namespace
+    rest_api.namespaces.clear()
+    for namespace in NAMESPACES:
+        rest_api.add_namespace(namespace)
+
+    return api_blueprint
+
+
+def page_not_found(error):
+    """ Page not found error handling """
+
+    return {
+        'status': 'error',
+        'message': 'Undefined route'
+    }, 404
 
 
 def create_app(config=AppConfig):
     """ Create the flask application """
 
+    from api.models.database import db
+    from api.middlewares.read_replica import (check_replica_config,
+                                              stick_to_primary)
+    from api.middlewares.sql_instrumentation import init_sql_instrumentation
+    from api.middlewares.profiler import init_profiler
+    from api.utilities.email_dispatcher import (notify_dispatcher,
+                                                send_emails_command)
+
     app = Flask(__name__, template_folder='../templates')
     app.config.from_object(config)
-    app.register_blueprint(api_blueprint)
-
-    return app
+    check_replica_config(app.config)
+    app.json_encoder = JSONEncoder
 
+    db.init_app(app)
+    mail.init_app(app)
+    app.register_blueprint(create_api_blueprint(app.config.get('API_DOCS', True)))
+    app.register_error_handler(404, page_not_found)
+    app.after_request(stick_to_primary)
+    if app.config.get('SQL_INSTRUMENTATION'):
+        init_sql_instrumentation(app)
+    if app.config.get('METRICS'):
+        # Imported here, prometheus_client is slow to import
+        from api.utilities.metrics import init_metrics
+        init_metrics(app)
+    if app.config.get('PROFILING'):
+        init_profiler(app)
+    app.before_first_request(notify_dispatcher)
+    app.cli.add_command(send_emails_command)
 
-application = create_app()
-mail = Mail(application)
+    return app
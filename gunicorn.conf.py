@@ -0,0 +1,78 @@
+""" Gunicorn configuration, every setting can be overridden by env vars.
+    The database connection pool of each worker is sized from the same
+    workers and threads settings, see get_pool_plan in config/environment.py
+"""
+
+import glob
+import os
+import tempfile
+from os import getenv
+from config.environment import Config
+
+bind = f':{getenv("PORT", "8000")}'
+workers = Config.WEB_CONCURRENCY
+threads = Config.GUNICORN_THREADS
+# The response bodies are built per request, threaded workers are safe
+worker_class = getenv('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+preload_app = getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+# Restarts the workers periodically, the jitter spreads the restarts
+max_requests = int(getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+timeout = int(getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(getenv('GUNICORN_KEEPALIVE', '5'))
+
+# The workers write their metrics to this directory, before the app and
+# prometheus_client are imported. The files of the previous run are removed.
+if Config.METRICS:
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR'] = \
+        getenv('PROMETHEUS_MULTIPROC_DIR') or \
+        os.path.join(tempfile.gettempdir(), 'dash-shop-metrics')
+    os.makedirs(metrics_dir, exist_ok=True)
+    for metrics_file in glob.glob(os.path.join(metrics_dir, '*.db')):
+        os.remove(metrics_file)
+
+
+def when_ready(server):
+    """ Logs the workers and connection pool plan at startup, and serves
+        the metrics on METRICS_PORT when it's set
+    """
+
+    plan = Config.DATABASE_POOL_PLAN
+    server.log.info(
+        'Serving with %s %s workers x %s threads, database pool of %s + %s '
+        'overflow connections per worker: %s of %s connections at most',
+        workers, worker_class, threads, plan['pool_size'],
+        plan['max_overflow'], plan['total_connections'],
+        plan['max_connections'])
+
+    # The metrics of every worker on a port apart from the API
+    if Config.METRICS and Config.METRICS_PORT:
+        from prometheus_client import (CollectorRegistry, multiprocess,
+                                       start_http_server)
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(Config.METRICS_PORT, registry=registry)
+        server.log.info('Serving the metrics on port %s', Config.METRICS_PORT)
+
+
+def post_fork(server, worker):
+    """ The workers must not share the connections opened by the preloaded app """
+
+    if preload_app:
+        from app import application
+        from api.models.database import db
+
+        # The default engine and the read replica engines
+        for bind in [None] + list(application.config.get('SQLALCHEMY_BINDS') or {}):
+            db.get_engine(application, bind=bind).dispose()
+
+
+def child_exit(server, worker):
+    """ The in progress requests of a dead worker are no longer counted """
+
+    if Config.METRICS:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
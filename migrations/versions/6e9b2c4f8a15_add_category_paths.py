@@ -0,0 +1,44 @@
+"""Add the category materialized paths
+
+Revision ID: 6e9b2c4f8a15
+Revises: a73e0c5d1f48
+Create Date: 2026-10-18 14:02:36.118470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e9b2c4f8a15'
+down_revision = 'a73e0c5d1f48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('categories', sa.Column('path', sa.Text(), nullable=True))
+    op.create_index('ix_categories_path', 'categories', ['path'], unique=False, postgresql_ops={'path': 'text_pattern_ops'})
+
+    # Backfill the paths walking the hierarchy down from the root categories
+    op.execute("""
+        WITH RECURSIVE tree(id, path) AS (
+            SELECT id, '/' || id || '/' FROM categories WHERE parent_id IS NULL
+            UNION ALL
+            SELECT categories.id, tree.path || categories.id || '/'
+            FROM categories JOIN tree ON categories.parent_id = tree.id
+        )
+        UPDATE categories SET path = tree.path
+        FROM tree WHERE categories.id = tree.id
+    """)
+    # Categories unreachable from a root belong to a parent cycle, which
+    # is broken by making them root categories
+    op.execute("""
+        UPDATE categories SET parent_id = NULL, path = '/' || id || '/'
+        WHERE path IS NULL
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_categories_path', table_name='categories')
+    op.drop_column('categories', 'path')
@@ -0,0 +1,41 @@
+"""Store order totals and item unit prices
+
+Revision ID: 8b3e5f0a2c91
+Revises: 1f6d2b9c4a7e
+Create Date: 2026-10-18 10:02:17.553904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3e5f0a2c91'
+down_revision = '1f6d2b9c4a7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('order_items', sa.Column('unit_price', sa.DECIMAL(precision=12, scale=2), nullable=True))
+    op.add_column('orders', sa.Column('total_amount', sa.DECIMAL(precision=12, scale=2), nullable=True))
+
+    # Backfill the existing orders with the current product prices
+    op.execute("""
+        UPDATE order_items SET unit_price = products.price
+        FROM products WHERE products.id = order_items.product_id
+    """)
+    op.execute("""
+        UPDATE orders SET total_amount = COALESCE((
+            SELECT SUM(order_items.unit_price * order_items.quantity)
+            FROM order_items WHERE order_items.order_id = orders.id
+        ), 0)
+    """)
+
+    op.alter_column('order_items', 'unit_price', nullable=False)
+    op.alter_column('orders', 'total_amount', nullable=False)
+
+
+def downgrade():
+    op.drop_column('orders', 'total_amount')
+    op.drop_column('order_items', 'unit_price')
@@ -0,0 +1,26 @@
+"""Add the product filter indexes
+
+Revision ID: a73e0c5d1f48
+Revises: d2f84a61c7b3
+Create Date: 2026-10-18 13:15:52.640183
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a73e0c5d1f48'
+down_revision = 'd2f84a61c7b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_products_category_id_price', 'products', ['category_id', 'price'], unique=False)
+    op.create_index('ix_products_brand_id_price', 'products', ['brand_id', 'price'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_products_brand_id_price', table_name='products')
+    op.drop_index('ix_products_category_id_price', table_name='products')
@@ -0,0 +1,43 @@
+"""Add the cart summary
+
+Revision ID: b91d3e7a2f64
+Revises: 6e9b2c4f8a15
+Create Date: 2026-10-18 18:05:41.207318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b91d3e7a2f64'
+down_revision = '6e9b2c4f8a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('carts', sa.Column('items_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('carts', sa.Column('subtotal', sa.DECIMAL(precision=12, scale=2), nullable=False, server_default='0'))
+
+    # Backfill the summaries of the existing carts
+    op.execute("""
+        UPDATE carts SET items_count = summary.items_count,
+                         subtotal = summary.subtotal
+        FROM (
+            SELECT cart_items.cart_id,
+                   SUM(cart_items.quantity) AS items_count,
+                   SUM(cart_items.quantity * products.price) AS subtotal
+            FROM cart_items JOIN products ON products.id = cart_items.product_id
+            GROUP BY cart_items.cart_id
+        ) AS summary
+        WHERE summary.cart_id = carts.id
+    """)
+
+    op.alter_column('carts', 'items_count', server_default=None)
+    op.alter_column('carts', 'subtotal', server_default=None)
+
+
+def downgrade():
+    op.drop_column('carts', 'subtotal')
+    op.drop_column('carts', 'items_count')
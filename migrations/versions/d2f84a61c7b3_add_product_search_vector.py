@@ -0,0 +1,31 @@
+"""Add the product full-text search vector
+
+Revision ID: d2f84a61c7b3
+Revises: 4c1a7d2e9b60
+Create Date: 2026-10-18 12:08:41.902716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f84a61c7b3'
+down_revision = '4c1a7d2e9b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated column, computed for the existing rows by the table rewrite
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True), nullable=True))
+    op.create_index('ix_products_search_vector', 'products', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    op.drop_index('ix_products_search_vector', table_name='products')
+    op.drop_column('products', 'search_vector')
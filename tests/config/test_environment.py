@@ -0,0 +1,91 @@
+""" Module for testing the connection pool sizing """
+
+import os
+import runpy
+import pytest
+from config.environment import get_pool_plan, load_pool_plan
+
+GUNICORN_CONF = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'gunicorn.conf.py')
+POOL_ENV_VARS = ['WEB_CONCURRENCY', 'GUNICORN_THREADS',
+                 'DATABASE_MAX_CONNECTIONS', 'DATABASE_RESERVED_CONNECTIONS',
+                 'DATABASE_POOL_SIZE', 'DATABASE_MAX_OVERFLOW']
+
+
+@pytest.fixture
+def pool_env(monkeypatch):
+    """ Pool env vars fixture, unset until a test sets them """
+
+    for name in POOL_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+class TestPoolPlan:
+    """ Class for testing the connection pool sizing """
+
+    def test_default_plan_fits_the_connection_budget(self, pool_env):
+        """ Testing the default pool has a connection per thread plus one """
+
+        assert load_pool_plan() == {
+            'workers': 2,
+            'threads': 4,
+            'pool_size': 5,
+            'max_overflow': 3,
+            'worker_connections': 8,
+            'total_connections': 16,
+            'max_connections': 20,
+        }
+
+    def test_plan_from_the_env_vars(self, pool_env):
+        """ Testing the env vars override the defaults """
+
+        for name, value in zip(POOL_ENV_VARS, ['3', '2', '100', '10', '10', '20']):
+            pool_env.setenv(name, value)
+
+        plan = load_pool_plan()
+
+        assert plan['workers'] == 3
+        assert plan['threads'] == 2
+        assert plan['pool_size'] == 10
+        assert plan['max_overflow'] == 20
+        assert plan['total_connections'] == 90
+
+    def test_plan_shrinks_the_pools_to_the_budget(self):
+        """ Testing more threads than connections never exceed the budget """
+
+        plan = get_pool_plan(workers=4, threads=8, max_connections=20,
+                             reserved_connections=4)
+
+        assert plan['pool_size'] == 4
+        assert plan['max_overflow'] == 0
+        assert plan['total_connections'] == 16
+
+        for workers in range(1, 17):
+            for threads in range(1, 17):
+                for pool_size in (None, 1, 10, 50):
+                    plan = get_pool_plan(workers, threads, 100, 10,
+                                         pool_size=pool_size, max_overflow=10)
+
+                    assert plan['pool_size'] >= 1
+                    assert plan['total_connections'] <= 90
+
+    def test_plan_with_more_workers_than_connections_fails(self):
+        """ Testing workers which can't all get a connection are refused """
+
+        with pytest.raises(ValueError):
+            get_pool_plan(workers=20, threads=4, max_connections=20,
+                          reserved_connections=4)
+
+    def test_gunicorn_workers_match_the_plan(self, pool_env, tmp_path):
+        """ Testing gunicorn runs the workers and threads the pools are
+            sized for
+        """
+
+        pool_env.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+        settings = runpy.run_path(GUNICORN_CONF)
+        plan = settings['Config'].DATABASE_POOL_PLAN
+
+        assert settings['workers'] == plan['workers']
+        assert settings['threads'] == plan['threads']
+        assert settings['worker_class'] == 'gthread'
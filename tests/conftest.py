@@ -1,28 +1,56 @@
 """ Module for tests configuration """
 
 import pytest
-from config.server import application
+from config.environment import AppConfig
+from config.server import create_app
 from api.models.database import db
+from api.models.user import User
+from api.middlewares.read_replica import set_primary_reads
+from api.utilities.cache import set_cache, invalidate
 
 pytest_plugins = ['tests.fixtures.user',
                   'tests.fixtures.category',
                   'tests.fixtures.authorization',
                   'tests.fixtures.brand',
                   'tests.fixtures.product',
-                  'tests.fixtures.cart']
+                  'tests.fixtures.cart',
+                  'tests.fixtures.cache',
+                  'tests.fixtures.smtp',
+                  'tests.fixtures.queries']
+
+
+class TestConfig(AppConfig):
+    """ Test configuration, a request over its SQL statements budget fails
+        and the requests of the admins can be profiled
+    """
+
+    SQL_INSTRUMENTATION = True
+    SQL_BUDGET_ACTION = 'raise'
+    PROPAGATE_EXCEPTIONS = True
+    PROFILING = True
+
+
+application = create_app(TestConfig)
 
 
 @pytest.fixture(scope='module')
 def app():
     """ Setup flask test application """
 
-    return application
+    # The tests send the queued emails themselves
+    application.config['EMAIL_DISPATCHER'] = 'worker'
+    # The module fixtures use the database outside of the test requests
+    with application.app_context():
+        yield application
 
 
 @pytest.fixture(scope='module')
 def init_db(app):
     """ Initialize the test database """
 
+    set_cache(None)
+    set_primary_reads(None)
+    invalidate(User.cache_namespace)
     db.drop_all()
     db.create_all()
     yield db
@@ -0,0 +1,41 @@
+""" Module for cache fixtures """
+
+import pytest
+from api.utilities.cache import SharedCache, set_cache
+
+
+class LocalKeyValueStore:
+    """ Local stand-in for the shared cache key-value store """
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key) or 0) + 1
+        return self.values[key]
+
+    def expire(self, key, seconds):
+        return key in self.values
+
+
+@pytest.fixture
+def shared_cache(init_db):
+    """ Shared cache fixture backed by a local key-value store """
+
+    cache = SharedCache(LocalKeyValueStore())
+    set_cache(cache)
+    yield cache
+    set_cache(None)
@@ -0,0 +1,29 @@
+""" Module for SQL statements fixtures """
+
+from contextlib import contextmanager
+import pytest
+from api.middlewares.sql_instrumentation import collect_statements
+
+
+@pytest.fixture
+def max_queries(app):
+    """
+        Fixture counting the SQL statements of a block with the SQL
+        instrumentation, the block fails if they exceed the budget. The
+        statements are yielded for finer checks.
+
+        Usage:
+            with max_queries(3) as statements:
+                client.post(...)
+    """
+
+    @contextmanager
+    def assert_max_queries(budget):
+        with collect_statements() as stats:
+            yield stats.statements
+
+        assert stats.count <= budget, \
+            f'{stats.count} SQL statements, the budget is {budget}:\n' + \
+            '\n'.join(stats.statements)
+
+    return assert_max_queries
@@ -0,0 +1,26 @@
+""" Module for order mocking data """
+
+VALID_ORDER = {
+    'items': [
+        {'product_id': 1, 'quantity': 2},
+        {'product_id': 1, 'quantity': 3}
+    ]
+}
+
+INVALID_ORDER_WITHOUT_ITEMS = {
+    'items': []
+}
+
+INVALID_ORDER_WITH_UNEXISTED_PRODUCT_ID = {
+    'items': [
+        {'product_id': 1, 'quantity': 1},
+        {'product_id': 20, 'quantity': 1}
+    ]
+}
+
+INVALID_ORDER_WITH_UNAVAILABLE_QUANTITY = {
+    'items': [
+        {'product_id': 1, 'quantity': 30},
+        {'product_id': 1, 'quantity': 30}
+    ]
+}
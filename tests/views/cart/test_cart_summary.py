@@ -0,0 +1,88 @@
+""" Module for testing the cart summary """
+
+from flask import json
+import api.views.cart
+import api.views.product
+from tests.constants import API_BASE_URL
+from tests.mocks.product import UPDATED_VALID_PRODUCT
+
+
+class TestCartSummaryEndpoints:
+    """ Class for testing the cart summary """
+
+    def test_add_item_to_cart_updates_summary_succeeds(self,
+                                                       client,
+                                                       init_db,
+                                                       new_cart,
+                                                       new_product,
+                                                       user_auth_header):
+        """ Testing the summary is returned with the cart """
+
+        new_cart.save()
+        new_product.save()
+        item = json.dumps({'product_id': new_product.id, 'quantity': 2})
+        client.post(f'{API_BASE_URL}/auth/cart', data=item, headers=user_auth_header)
+        response = client.post(f'{API_BASE_URL}/auth/cart', data=item, headers=user_auth_header)
+        cart = client.get(f'{API_BASE_URL}/auth/cart', headers=user_auth_header)
+
+        assert response.status_code == 200
+        assert response.json['data']['summary'] == \
+            {'items_count': 4, 'subtotal': '800000.00'}
+        assert cart.json['data']['summary'] == response.json['data']['summary']
+        assert len(cart.json['data']['cart']) == 3
+
+    def test_get_cart_summary_succeeds(self,
+                                       client,
+                                       init_db,
+                                       user_auth_header,
+                                       max_queries):
+        """ Testing the summary is read from the cart row with no join """
+
+        with max_queries(1) as statements:
+            response = client.get(f'{API_BASE_URL}/auth/cart/summary',
+                                  headers=user_auth_header)
+        summary_statements = [statement for statement in statements
+                              if 'FROM carts' in statement]
+
+        assert response.status_code == 200
+        assert response.json['message'] == 'Cart summary successfully fetched'
+        assert response.json['data']['summary'] == \
+            {'items_count': 4, 'subtotal': '800000.00'}
+        assert len(summary_statements) == 1
+        assert 'JOIN' not in summary_statements[0]
+
+    def test_product_price_change_updates_summary_succeeds(self,
+                                                           client,
+                                                           init_db,
+                                                           new_product,
+                                                           user_auth_header,
+                                                           admin_auth_header):
+        """ Testing the subtotal follows the product price """
+
+        response = client.put(
+            f'{API_BASE_URL}/products/{new_product.id}',
+            data=json.dumps(dict(UPDATED_VALID_PRODUCT, price=150000,
+                                 category_id=new_product.category_id,
+                                 brand_id=new_product.brand_id)),
+            headers=admin_auth_header)
+        summary = client.get(f'{API_BASE_URL}/auth/cart/summary',
+                             headers=user_auth_header)
+
+        assert response.status_code == 200
+        assert summary.json['data']['summary'] == \
+            {'items_count': 4, 'subtotal': '600000.00'}
+
+    def test_remove_item_from_cart_updates_summary_succeeds(self,
+                                                            client,
+                                                            init_db,
+                                                            user_auth_header):
+        """ Testing a removed item leaves the summary """
+
+        cart = client.get(f'{API_BASE_URL}/auth/cart', headers=user_auth_header)
+        item_id = cart.json['data']['cart']['items'][0]['id']
+        response = client.delete(f'{API_BASE_URL}/auth/cart/items/{item_id}',
+                                 headers=user_auth_header)
+
+        assert response.status_code == 200
+        assert response.json['data']['summary'] == \
+            {'items_count': 0, 'subtotal': '0.00'}
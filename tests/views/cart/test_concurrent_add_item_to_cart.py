@@ -0,0 +1,106 @@
+""" Module for testing concurrent add item to the cart requests """
+
+import threading
+from flask import json
+from api.models.database import db
+from api.models.cart import Cart
+from api.models.product import Product
+from api.models.user import User
+from api.schemas.user import UserSchema
+from api.utilities.generate_token import generate_auth_token
+from tests.constants import API_BASE_URL
+import api.views.cart
+
+
+class TestConcurrentAddCartItemEndpoint:
+    """ Class for testing concurrent add item to the cart requests """
+
+    def test_concurrent_add_item_to_cart_never_oversells(self,
+                                                         app,
+                                                         init_db,
+                                                         new_product):
+        """ Testing parallel adds of a hot product keep the stock positive """
+
+        new_product.save()
+        product_id = new_product.id
+        users_count = 10
+        headers = []
+        for index in range(users_count):
+            user = User(firstname='Buyer', lastname=str(index),
+                        email=f'buyer{index}@gmail.com',
+                        password='Password1234', is_activated=True)
+            user.save()
+            Cart(user_id=user.id).save()
+            token = generate_auth_token(UserSchema().dump(user))
+            headers.append({'Authorization': token,
+                            'Content-Type': 'application/json'})
+
+        barrier = threading.Barrier(users_count)
+        status_codes = []
+
+        def add_item_to_cart(user_headers):
+            with app.test_client() as client:
+                barrier.wait()
+                response = client.post(
+                    f'{API_BASE_URL}/auth/cart',
+                    data=json.dumps({'product_id': product_id, 'quantity': 7}),
+                    headers=user_headers)
+                status_codes.append(response.status_code)
+
+        threads = [threading.Thread(target=add_item_to_cart, args=(user_headers,))
+                   for user_headers in headers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db.session.rollback()
+        stock = db.session.query(Product.quantity).filter_by(
+            id=product_id).scalar()
+
+        # 50 items in stock, 7 taken per request
+        assert status_codes.count(200) == 7
+        assert status_codes.count(400) == 3
+        assert stock == 1
+
+    def test_concurrent_first_adds_create_one_cart(self,
+                                                   app,
+                                                   init_db,
+                                                   another_product):
+        """ Testing parallel first adds of a user without a cart succeed """
+
+        another_product.save()
+        product_id = another_product.id
+        user = User(firstname='First', lastname='Buyer',
+                    email='first.buyer@gmail.com',
+                    password='Password1234', is_activated=True)
+        user.save()
+        user_id = user.id
+        headers = {'Authorization': generate_auth_token(UserSchema().dump(user)),
+                   'Content-Type': 'application/json'}
+        requests_count = 5
+        barrier = threading.Barrier(requests_count)
+        status_codes = []
+
+        def add_item_to_cart():
+            with app.test_client() as client:
+                barrier.wait()
+                response = client.post(
+                    f'{API_BASE_URL}/auth/cart',
+                    data=json.dumps({'product_id': product_id, 'quantity': 1}),
+                    headers=headers)
+                status_codes.append(response.status_code)
+
+        threads = [threading.Thread(target=add_item_to_cart)
+                   for _ in range(requests_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db.session.rollback()
+        carts = Cart.query.filter_by(user_id=user_id).all()
+
+        assert status_codes == [200] * requests_count
+        assert len(carts) == 1
+        assert carts[0].items_count == requests_count
@@ -20,3 +20,24 @@ class TestGetCartEndpoints:
         assert response.json['message'] == message
         assert 'cart' in response.json['data']
         assert len(response.json['data']['cart']) == 3
+
+    def test_get_cart_loads_only_the_shown_columns(self,
+                                                   client,
+                                                   init_db,
+                                                   new_cart_item,
+                                                   user_auth_header,
+                                                   max_queries):
+        """ Testing the cart is read without the owner and the unused columns """
+
+        new_cart_item.save()
+        with max_queries(3) as statements:
+            response = client.get(
+                f'{API_BASE_URL}/auth/cart', headers=user_auth_header)
+        cart = response.json['data']['cart']
+
+        assert response.status_code == 200
+        assert not [statement for statement in statements
+                    if 'users' in statement or 'products.description' in statement]
+        assert set(cart['owner']) == {'id', 'firstname', 'lastname', 'email'}
+        assert cart['items'][0]['quantity'] == new_cart_item.quantity
+        assert set(cart['items'][0]['product']) == {'id', 'name', 'main_image', 'price'}
@@ -0,0 +1,136 @@
+""" Module for testing the category tree endpoints """
+
+import pytest
+from flask import json
+import api.views.category
+from api.models.category import Category
+from api.models.product import Product
+from tests.constants import API_BASE_URL
+
+
+@pytest.fixture(scope='module')
+def category_tree(init_db):
+    """ electronics > computers > laptops and electronics > phones """
+
+    electronics = Category(name='electronics', description='')
+    electronics.save()
+    computers = Category(name='computers', description='',
+                         parent_id=electronics.id)
+    computers.save()
+    laptops = Category(name='notebooks', description='',
+                       parent_id=computers.id)
+    laptops.save()
+    phones = Category(name='phones', description='', parent_id=electronics.id)
+    phones.save()
+    Product(name='zenbook', description='Asus laptop',
+            main_image={'url': 'http://someimage.url',
+                        'public_id': 'image_public_id'},
+            category_id=laptops.id, price=1000, quantity=2).save()
+
+    return {'electronics': electronics.id, 'computers': computers.id,
+            'laptops': laptops.id, 'phones': phones.id}
+
+
+def get_category_path(category_id):
+    """ Gets the stored path of a category """
+
+    return Category.query.with_entities(Category.path)\
+        .filter_by(id=category_id).scalar()
+
+
+class TestCategoryTreeEndpoints:
+    """ Class for testing the category tree endpoints """
+
+    def test_get_category_tree_succeeds(self, client, category_tree):
+        """ Testing the categories are nested under their parent """
+
+        response = client.get(f'{API_BASE_URL}/categories/tree')
+        roots = response.json['data']['categories']
+
+        assert response.status_code == 200
+        assert response.json['message'] == 'Category tree successfully fetched'
+        assert [root['name'] for root in roots] == ['electronics']
+        assert [child['name'] for child in roots[0]['children']] == \
+            ['computers', 'phones']
+        assert roots[0]['children'][0]['children'][0]['name'] == 'notebooks'
+        assert response.headers['X-Cache'] == 'MISS'
+
+        response = client.get(f'{API_BASE_URL}/categories/tree')
+
+        assert response.headers['X-Cache'] == 'HIT'
+
+    def test_get_category_subtree_products_succeeds(self,
+                                                    client,
+                                                    category_tree):
+        """ Testing the products of the subcategories are included """
+
+        electronics = category_tree['electronics']
+        response = client.get(
+            f'{API_BASE_URL}/categories/{electronics}/products?subtree=true')
+
+        assert response.status_code == 200
+        assert [product['name'] for product in response.json['data']['products']] == \
+            ['zenbook']
+
+        response = client.get(
+            f'{API_BASE_URL}/categories/{electronics}/products')
+
+        assert response.status_code == 200
+        assert response.json['data']['products'] == []
+
+    def test_move_category_subtree_succeeds(self,
+                                            client,
+                                            category_tree,
+                                            admin_auth_header):
+        """ Testing moving a category moves its subcategories """
+
+        computers = category_tree['computers']
+        laptops = category_tree['laptops']
+        phones = category_tree['phones']
+        response = client.put(
+            f'{API_BASE_URL}/categories/{computers}',
+            data=json.dumps({'name': 'computers', 'parent_id': phones}),
+            headers=admin_auth_header)
+        tree = client.get(f'{API_BASE_URL}/categories/tree')
+
+        assert response.status_code == 200
+        assert get_category_path(laptops) == \
+            f'/{category_tree["electronics"]}/{phones}/{computers}/{laptops}/'
+        assert tree.headers['X-Cache'] == 'MISS'
+        assert tree.json['data']['categories'][0]['children'][0]['name'] == 'phones'
+
+    def test_move_category_under_its_subcategory_fails(self,
+                                                       client,
+                                                       category_tree,
+                                                       admin_auth_header):
+        """ Testing a category can't become its own descendant """
+
+        computers = category_tree['computers']
+        response = client.put(
+            f'{API_BASE_URL}/categories/{computers}',
+            data=json.dumps({'name': 'computers',
+                             'parent_id': category_tree['laptops']}),
+            headers=admin_auth_header)
+        message = 'The parent category can\'t be the category itself or one of its subcategories'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_delete_category_makes_subcategories_roots_succeeds(self,
+                                                                client,
+                                                                category_tree,
+                                                                admin_auth_header):
+        """ Testing the subcategories of a deleted category become roots """
+
+        response = client.delete(
+            f'{API_BASE_URL}/categories/{category_tree["phones"]}',
+            headers=admin_auth_header)
+        computers = category_tree['computers']
+        laptops = category_tree['laptops']
+        roots = client.get(
+            f'{API_BASE_URL}/categories/tree').json['data']['categories']
+
+        assert response.status_code == 200
+        assert get_category_path(laptops) == f'/{computers}/{laptops}/'
+        assert sorted(root['name'] for root in roots) == ['computers', 'electronics']
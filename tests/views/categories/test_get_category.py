@@ -36,6 +36,75 @@ class TestGetCategoryEndpoints:
         assert 'category' in response.json['data']
         assert response.json['data']['category']['name'] == new_category.name
 
+    def test_get_all_categories_with_products_count_succeeds(self,
+                                                             client,
+                                                             init_db,
+                                                             new_product):
+        """ Testing get all categories without their products """
+
+        new_product.save()
+        response = client.get(
+            f'{API_BASE_URL}/categories')
+        category = response.json['data']['categories'][0]
+
+        assert response.status_code == 200
+        assert category['products_count'] == 1
+        assert 'products' not in category
+
+    def test_get_all_categories_including_products_succeeds(self,
+                                                            client,
+                                                            init_db,
+                                                            new_product):
+        """ Testing get all categories with their products """
+
+        new_product.save()
+        response = client.get(
+            f'{API_BASE_URL}/categories?include=products')
+        category = response.json['data']['categories'][0]
+
+        assert response.status_code == 200
+        assert category['products_count'] == 1
+        assert category['products'][0]['name'] == new_product.name
+
+    def test_get_all_categories_with_invalid_include_fails(self,
+                                                           client,
+                                                           init_db):
+        """ Testing get all categories with an unknown relationship """
+
+        response = client.get(
+            f'{API_BASE_URL}/categories?include=brands')
+        message = 'The include param must be one of: products'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_get_category_products_succeeds(self,
+                                            client,
+                                            init_db,
+                                            new_category,
+                                            new_product):
+        """ Testing get the paginated products of a category """
+
+        new_product.save()
+        response = client.get(
+            f'{API_BASE_URL}/categories/{new_category.id}/products?limit=1')
+        message = 'Category products successfully fetched'
+
+        assert response.status_code == 200
+        assert response.json['message'] == message
+        assert len(response.json['data']['products']) == 1
+        assert response.json['data']['meta']['total_count'] == 1
+
+    def test_get_unexisting_category_products_fails(self, client, init_db):
+        """ Testing get the products of an unexisting category """
+
+        response = client.get(
+            f'{API_BASE_URL}/categories/20/products')
+
+        assert response.status_code == 404
+        assert response.json['message'] == 'Category not found'
+
     def test_get_single_category_with_unexisting_category_id_fails(self,
                                                                    client,
                                                                    init_db):
@@ -0,0 +1,97 @@
+""" Module for testing create order endpoint """
+
+from flask import json
+from api.models.database import db
+from api.models.product import Product
+from tests.mocks.order import (VALID_ORDER,
+                               INVALID_ORDER_WITHOUT_ITEMS,
+                               INVALID_ORDER_WITH_UNEXISTED_PRODUCT_ID,
+                               INVALID_ORDER_WITH_UNAVAILABLE_QUANTITY)
+from tests.constants import API_BASE_URL
+import api.views.order
+
+
+def get_product_stock(product_id):
+    """ Gets the stock of a product from the database """
+
+    return db.session.query(Product.quantity).filter_by(id=product_id).scalar()
+
+
+class TestCreateOrderEndpoint:
+    """ Class for testing create order endpoint """
+
+    def test_create_order_succeeds(self,
+                                   client,
+                                   init_db,
+                                   user_auth_header,
+                                   new_product):
+        """ Testing create an order """
+
+        new_product.save()
+        stock = new_product.quantity
+        response = client.post(
+            f'{API_BASE_URL}/auth/orders', data=json.dumps(VALID_ORDER),
+            headers=user_auth_header)
+        message = 'Order successfully created'
+
+        assert response.status_code == 201
+        assert response.json['status'] == 'success'
+        assert response.json['message'] == message
+        assert len(response.json['data']['order']['items']) == 2
+        assert response.json['data']['order']['total_amount'] == '1000000.00'
+        assert response.json['data']['order']['items'][0]['unit_price'] == '200000.00'
+        assert get_product_stock(new_product.id) == stock - 5
+
+    def test_create_order_without_items_fails(self,
+                                              client,
+                                              init_db,
+                                              user_auth_header):
+        """ Testing create an order without items """
+
+        response = client.post(
+            f'{API_BASE_URL}/auth/orders',
+            data=json.dumps(INVALID_ORDER_WITHOUT_ITEMS),
+            headers=user_auth_header)
+        message = 'Order must contain at least one item'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_create_order_with_unexisted_product_id_fails(self,
+                                                          client,
+                                                          init_db,
+                                                          user_auth_header,
+                                                          new_product):
+        """ Testing create an order with an unexisted product ID """
+
+        new_product.save()
+        response = client.post(
+            f'{API_BASE_URL}/auth/orders',
+            data=json.dumps(INVALID_ORDER_WITH_UNEXISTED_PRODUCT_ID),
+            headers=user_auth_header)
+        message = 'The product ID provided doesn\'t exist'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_create_order_with_unavailable_quantity_fails(self,
+                                                          client,
+                                                          init_db,
+                                                          user_auth_header,
+                                                          new_product):
+        """ Testing create an order with more items than in stock """
+
+        new_product.save()
+        stock = get_product_stock(new_product.id)
+        response = client.post(
+            f'{API_BASE_URL}/auth/orders',
+            data=json.dumps(INVALID_ORDER_WITH_UNAVAILABLE_QUANTITY),
+            headers=user_auth_header)
+        message = 'The product is not available in the requested quantity'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+        assert get_product_stock(new_product.id) == stock
@@ -0,0 +1,52 @@
+""" Module for testing get order endpoints """
+
+from flask import json
+from tests.mocks.order import VALID_ORDER
+from tests.constants import API_BASE_URL
+import api.views.order
+
+
+class TestGetOrderEndpoints:
+    """ Class for testing get order endpoints """
+
+    def test_get_all_orders_succeeds(self,
+                                     client,
+                                     init_db,
+                                     user_auth_header,
+                                     new_product):
+        """ Testing get the user orders with their stored total amount """
+
+        new_product.save()
+        for _ in range(2):
+            client.post(f'{API_BASE_URL}/auth/orders',
+                        data=json.dumps(VALID_ORDER), headers=user_auth_header)
+        response = client.get(
+            f'{API_BASE_URL}/auth/orders?limit=1', headers=user_auth_header)
+        message = 'Orders successfully fetched'
+
+        assert response.status_code == 200
+        assert response.json['message'] == message
+        assert len(response.json['data']['orders']) == 1
+        assert response.json['data']['orders'][0]['total_amount'] == '1000000.00'
+        assert response.json['data']['meta']['total_count'] == 2
+
+    def test_get_all_orders_with_cursor_succeeds(self,
+                                                 client,
+                                                 init_db,
+                                                 user_auth_header):
+        """ Testing get the user orders with keyset pagination """
+
+        response = client.get(
+            f'{API_BASE_URL}/auth/orders?cursor=&limit=1', headers=user_auth_header)
+        next_cursor = response.json['data']['meta']['next_cursor']
+        next_response = client.get(
+            f'{API_BASE_URL}/auth/orders?cursor={next_cursor}&limit=1',
+            headers=user_auth_header)
+
+        assert response.status_code == 200
+        assert len(response.json['data']['orders']) == 1
+        assert next_response.status_code == 200
+        assert len(next_response.json['data']['orders']) == 1
+        assert next_response.json['data']['orders'][0]['id'] != \
+            response.json['data']['orders'][0]['id']
+        assert next_response.json['data']['meta']['next_cursor'] is None
@@ -0,0 +1,216 @@
+""" Module for testing bulk product import and export endpoints """
+
+import csv
+import io
+from flask import json
+import api.views.product
+import api.utilities.product_import
+from api.models.database import db
+from api.models.product import Product
+from tests.constants import API_BASE_URL
+
+MAIN_IMAGE = {'url': 'http://someimage.url', 'public_id': 'image_public_id'}
+
+
+def make_ndjson(*products):
+    """ Serializes products as NDJSON """
+
+    return '\n'.join(json.dumps(product) for product in products) + '\n'
+
+
+class TestBulkProductEndpoints:
+    """ Class for testing bulk product import and export endpoints """
+
+    def test_import_products_from_ndjson_succeeds(self,
+                                                  client,
+                                                  init_db,
+                                                  new_product,
+                                                  admin_auth_header):
+        """ Testing NDJSON products are created or updated by name """
+
+        new_product.save()
+        category_id = new_product.category_id
+        body = make_ndjson(
+            {'name': 'IPhone', 'main_image': MAIN_IMAGE, 'price': 900,
+             'quantity': 7, 'category_id': category_id},
+            {'name': 'pixel', 'main_image': MAIN_IMAGE, 'price': 500,
+             'quantity': 3, 'category_id': category_id},
+            {'name': 'galaxy', 'main_image': MAIN_IMAGE, 'price': 600,
+             'quantity': 4, 'category_id': 1000},
+        ) + 'not json\n'
+        headers = dict(admin_auth_header, **{'Content-Type': 'application/x-ndjson'})
+        response = client.post(
+            f'{API_BASE_URL}/products/bulk', data=body, headers=headers)
+        report = response.json['data']
+
+        assert response.status_code == 200
+        assert response.json['message'] == 'Products successfully imported'
+        assert report['created'] == 1
+        assert report['updated'] == 1
+        assert report['failed'] == 2
+        assert report['errors'] == [
+            {'line': 3, 'message': 'The category ID provided doesn\'t exist'},
+            {'line': 4, 'message': 'The line is not a valid JSON object'}]
+        assert Product.query.filter_by(name='iphone').one().quantity == 7
+        assert Product.query.filter_by(name='pixel').one().price == 500
+
+    def test_import_products_from_csv_succeeds(self,
+                                               client,
+                                               init_db,
+                                               new_product,
+                                               admin_auth_header):
+        """ Testing CSV products are imported in chunks """
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['name', 'description', 'main_image_url',
+                         'main_image_public_id', 'category_id', 'brand_id',
+                         'price', 'quantity'])
+        for index in range(3):
+            writer.writerow([f'watch {index}', 'Smart watch', MAIN_IMAGE['url'],
+                             MAIN_IMAGE['public_id'], new_product.category_id,
+                             '', '99.90', 10])
+        headers = dict(admin_auth_header, **{'Content-Type': 'text/csv'})
+        client.application.config['PRODUCT_IMPORT_CHUNK_SIZE'] = 2
+        try:
+            response = client.post(f'{API_BASE_URL}/products/bulk',
+                                   data=buffer.getvalue(), headers=headers)
+        finally:
+            client.application.config['PRODUCT_IMPORT_CHUNK_SIZE'] = 500
+
+        assert response.status_code == 200
+        assert response.json['data']['created'] == 3
+        assert response.json['data']['failed'] == 0
+        assert str(Product.query.filter_by(name='watch 2').one().price) == '99.90'
+
+    def test_import_products_with_unsupported_content_type_fails(self,
+                                                                 client,
+                                                                 init_db,
+                                                                 admin_auth_header):
+        """ Testing bulk import of a JSON body """
+
+        response = client.post(f'{API_BASE_URL}/products/bulk',
+                               data='[]', headers=admin_auth_header)
+        message = 'The content type must be either application/x-ndjson or text/csv'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_export_products_succeeds(self, client, init_db, admin_auth_header):
+        """ Testing every product is exported as NDJSON or CSV """
+
+        response = client.get(f'{API_BASE_URL}/products/export',
+                              headers=admin_auth_header)
+        products = [json.loads(line)
+                    for line in response.get_data(as_text=True).splitlines()]
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert [product['name'] for product in products] == \
+            ['iphone', 'pixel', 'watch 0', 'watch 1', 'watch 2']
+
+        response = client.get(f'{API_BASE_URL}/products/export?format=csv',
+                              headers=admin_auth_header)
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/csv'
+        assert len(rows) == 5
+        assert rows[0]['main_image_url'] == MAIN_IMAGE['url']
+
+    def test_import_existing_product_without_images_keeps_them(
+            self, client, init_db, new_product, admin_auth_header):
+        """ Testing a product imported again without images keeps them """
+
+        new_product.save()
+        product = {'name': 'nokia', 'main_image': MAIN_IMAGE, 'price': 100,
+                   'quantity': 2, 'category_id': new_product.category_id}
+        headers = dict(admin_auth_header, **{'Content-Type': 'application/x-ndjson'})
+        client.post(f'{API_BASE_URL}/products/bulk', headers=headers,
+                    data=make_ndjson(dict(product, images=[MAIN_IMAGE])))
+        response = client.post(f'{API_BASE_URL}/products/bulk', headers=headers,
+                               data=make_ndjson(dict(product, price=90)))
+        imported_product = Product.query.filter_by(name='nokia').one()
+
+        assert response.json['data']['updated'] == 1
+        assert imported_product.price == 90
+        assert imported_product.images == [MAIN_IMAGE]
+
+    def test_import_products_with_invalid_values_reports_them(
+            self, client, init_db, new_product, admin_auth_header, monkeypatch):
+        """ Testing values the database can't store are reported per line,
+            as well as a chunk the database rejects
+        """
+
+        new_product.save()
+        product = {'main_image': MAIN_IMAGE, 'price': 100, 'quantity': 2,
+                   'category_id': new_product.category_id}
+        upsert_products = api.utilities.product_import.upsert_products
+        upserts = []
+
+        def fail_first_upsert(products, fields):
+            upserts.append(products)
+            if len(upserts) == 1:
+                db.session.execute('SELECT 1 / 0')
+            return upsert_products(products, fields)
+
+        monkeypatch.setattr(api.utilities.product_import, 'upsert_products',
+                            fail_first_upsert)
+        monkeypatch.setitem(client.application.config,
+                            'PRODUCT_IMPORT_CHUNK_SIZE', 1)
+        headers = dict(admin_auth_header, **{'Content-Type': 'application/x-ndjson'})
+        response = client.post(f'{API_BASE_URL}/products/bulk', headers=headers,
+                               data=make_ndjson(
+                                   dict(product, name='sony'),
+                                   dict(product, name='oppo'),
+                                   dict(product, name='lg', category_id=[1]),
+                                   dict(product, name='lg', brand_id={'id': 1}),
+                                   dict(product, name='lg', description={}),
+                                   dict(product, name='lg', price=10 ** 10),
+                                   dict(product, name='lg', quantity=2 ** 31),
+                                   dict(product, name='lg', images=1)))
+        report = response.json['data']
+
+        assert response.status_code == 200
+        assert report['created'] == 1
+        assert report['failed'] == 7
+        assert report['errors'] == [
+            {'line': 1, 'message': 'The product could not be saved'},
+            {'line': 3, 'message': 'The category ID should be a positive integer'},
+            {'line': 4, 'message': 'The brand ID should be a positive integer'},
+            {'line': 5, 'message': 'The product description must be a string'},
+            {'line': 6, 'message':
+                'The price must be a positive number up to 9999999999.99'},
+            {'line': 7, 'message':
+                'The quantity must be a positive integer up to 2147483647'},
+            {'line': 8, 'message': 'The product images must be a list'}]
+        assert Product.query.filter_by(name='sony').first() is None
+        assert Product.query.filter_by(name='oppo').one().quantity == 2
+
+    def test_import_existing_product_without_optional_fields_keeps_them(
+            self, client, init_db, new_product, new_brand, admin_auth_header):
+        """ Testing the fields missing from a line are left unchanged """
+
+        new_product.save()
+        new_brand.save()
+        product = {'name': 'motorola', 'main_image': MAIN_IMAGE, 'price': 100,
+                   'quantity': 2, 'category_id': new_product.category_id}
+        headers = dict(admin_auth_header, **{'Content-Type': 'application/x-ndjson'})
+        client.post(f'{API_BASE_URL}/products/bulk', headers=headers,
+                    data=make_ndjson(dict(product, description='Razr',
+                                          brand_id=new_brand.id)))
+        response = client.post(f'{API_BASE_URL}/products/bulk', headers=headers,
+                               data=make_ndjson(
+                                   dict(product, price=80),
+                                   {'name': 'alcatel', 'main_image': MAIN_IMAGE,
+                                    'price': 50, 'quantity': 1,
+                                    'category_id': new_product.category_id,
+                                    'description': None}))
+        imported_product = Product.query.filter_by(name='motorola').one()
+
+        assert response.json['data']['created'] == 1
+        assert response.json['data']['updated'] == 1
+        assert imported_product.price == 80
+        assert imported_product.description == 'Razr'
+        assert imported_product.brand_id == new_brand.id
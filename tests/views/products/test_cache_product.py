@@ -0,0 +1,116 @@
+""" Module for testing the cached product endpoints """
+
+from flask import json
+import api.views.product
+import api.views.cart
+from tests.constants import API_BASE_URL
+
+
+class TestCacheProductEndpoints:
+    """ Class for testing the cached product endpoints """
+
+    def test_get_single_product_is_cached(self, client, init_db, new_product):
+        """ Testing a repeated product request is served from the cache """
+
+        new_product.save()
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        cached_response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert cached_response.headers['X-Cache'] == 'HIT'
+        assert cached_response.json == response.json
+
+    def test_update_product_invalidates_cache(self, client, init_db, new_product):
+        """ Testing a product update invalidates its cached responses """
+
+        new_product.save()
+        client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        client.get(f'{API_BASE_URL}/products')
+        new_product.update({'quantity': 20})
+
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        list_response = client.get(f'{API_BASE_URL}/products')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.json['data']['product']['quantity'] == 20
+        assert list_response.headers['X-Cache'] == 'MISS'
+
+    def test_update_product_invalidates_category_cache(self,
+                                                       client,
+                                                       init_db,
+                                                       new_product):
+        """ Testing a product update invalidates the responses embedding it """
+
+        new_product.save()
+        category_url = f'{API_BASE_URL}/categories/{new_product.category_id}'
+        client.get(f'{category_url}?include=products')
+        new_product.update({'quantity': 30})
+        response = client.get(f'{category_url}?include=products')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.json['data']['category']['products'][0]['quantity'] == 30
+
+    def test_cart_add_keeps_category_cache(self,
+                                           client,
+                                           init_db,
+                                           user_auth_header,
+                                           new_cart,
+                                           new_product):
+        """ Testing a stock change only invalidates the product responses """
+
+        new_cart.save()
+        new_product.save()
+        category_url = f'{API_BASE_URL}/categories/{new_product.category_id}'
+        client.get(f'{category_url}?include=products')
+        client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        response = client.post(
+            f'{API_BASE_URL}/auth/cart', headers=user_auth_header,
+            data=json.dumps({'product_id': new_product.id, 'quantity': 1}))
+
+        category_response = client.get(f'{category_url}?include=products')
+        product_response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+
+        assert response.status_code == 200
+        assert category_response.headers['X-Cache'] == 'HIT'
+        assert product_response.headers['X-Cache'] == 'MISS'
+
+    def test_shared_cache_counts_hits_and_misses(self,
+                                                 client,
+                                                 init_db,
+                                                 shared_cache,
+                                                 new_product):
+        """ Testing the shared cache backend """
+
+        new_product.save()
+        client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+
+        assert response.headers['X-Cache'] == 'HIT'
+        assert shared_cache.stats() == {'hits': 1, 'misses': 1}
+
+        new_product.update({'quantity': 40})
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.json['data']['product']['quantity'] == 40
+
+    def test_shared_cache_deletes_prefixes_without_scanning(self, shared_cache):
+        """ Testing a deleted prefix hides its entries from the next reads """
+
+        shared_cache.set('products:1:/products/1?', 'product')
+        shared_cache.set('products:list:/products?', 'products')
+        shared_cache.set('categories:1:/categories/1?', 'category')
+
+        shared_cache.delete_prefix('products:1:')
+
+        assert shared_cache.get('products:1:/products/1?') is None
+        assert shared_cache.get('products:list:/products?') == 'products'
+
+        shared_cache.delete_prefix('products:')
+
+        assert shared_cache.get('products:list:/products?') is None
+        assert shared_cache.get('categories:1:/categories/1?') == 'category'
+
+        shared_cache.clear()
+
+        assert shared_cache.get('categories:1:/categories/1?') is None
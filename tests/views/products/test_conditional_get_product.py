@@ -0,0 +1,131 @@
+""" Module for testing conditional get product endpoints """
+
+import datetime
+from werkzeug.http import http_date
+import api.views.product
+import api.views.category
+from tests.constants import API_BASE_URL
+
+
+class TestConditionalGetProductEndpoints:
+    """ Class for testing conditional get product endpoints """
+
+    def test_get_single_product_returns_validators(self, client, init_db, new_product):
+        """ Testing a product response carries an ETag and a Last-Modified """
+
+        new_product.save()
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+
+        assert response.status_code == 200
+        assert response.headers['ETag'].startswith('W/"')
+        assert 'Last-Modified' in response.headers
+
+    def test_get_single_product_with_matching_etag_succeeds(self,
+                                                            client,
+                                                            init_db,
+                                                            new_product):
+        """ Testing a product request with a fresh ETag returns 304 """
+
+        new_product.save()
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        not_modified_response = client.get(
+            f'{API_BASE_URL}/products/{new_product.id}',
+            headers={'If-None-Match': response.headers['ETag']})
+
+        assert not_modified_response.status_code == 304
+        assert not_modified_response.data == b''
+
+    def test_get_single_product_with_fresh_date_succeeds(self,
+                                                         client,
+                                                         init_db,
+                                                         new_product):
+        """ Testing a product request with a fresh date returns 304 """
+
+        new_product.save()
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        not_modified_response = client.get(
+            f'{API_BASE_URL}/products/{new_product.id}',
+            headers={'If-Modified-Since': response.headers['Last-Modified']})
+
+        assert not_modified_response.status_code == 304
+
+    def test_get_updated_product_with_stale_etag_succeeds(self,
+                                                          client,
+                                                          init_db,
+                                                          new_product):
+        """ Testing a product request with a stale ETag returns the product """
+
+        new_product.save()
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        new_product.update({'quantity': 45})
+        modified_response = client.get(
+            f'{API_BASE_URL}/products/{new_product.id}',
+            headers={'If-None-Match': response.headers['ETag']})
+
+        assert modified_response.status_code == 200
+        assert modified_response.json['data']['product']['quantity'] == 45
+        assert modified_response.headers['ETag'] != response.headers['ETag']
+
+    def test_get_all_products_with_matching_etag_succeeds(self,
+                                                          client,
+                                                          init_db,
+                                                          new_product,
+                                                          another_product):
+        """ Testing a products listing request with a fresh ETag returns 304 """
+
+        new_product.save()
+        response = client.get(f'{API_BASE_URL}/products?page=1&limit=1')
+        not_modified_response = client.get(
+            f'{API_BASE_URL}/products?page=1&limit=1',
+            headers={'If-None-Match': response.headers['ETag']})
+        another_product.save()
+        modified_response = client.get(
+            f'{API_BASE_URL}/products?page=1&limit=1',
+            headers={'If-None-Match': response.headers['ETag']})
+
+        assert 'Last-Modified' not in response.headers
+        assert not_modified_response.status_code == 304
+        assert modified_response.status_code == 200
+
+    def test_cached_product_is_validated_without_queries(self,
+                                                         client,
+                                                         init_db,
+                                                         new_product,
+                                                         max_queries):
+        """ Testing a cached product is served and validated from the cache """
+
+        new_product.save()
+        url = f'{API_BASE_URL}/products/{new_product.id}'
+        response = client.get(url)
+        with max_queries(0):
+            cached_response = client.get(url)
+            not_modified_response = client.get(
+                url, headers={'If-None-Match': response.headers['ETag']})
+
+        assert cached_response.headers['X-Cache'] == 'HIT'
+        assert cached_response.headers['ETag'] == response.headers['ETag']
+        assert cached_response.headers['Last-Modified'] == \
+            response.headers['Last-Modified']
+        assert not_modified_response.status_code == 304
+
+    def test_get_category_with_updated_product_and_date_succeeds(self,
+                                                                 client,
+                                                                 init_db,
+                                                                 new_product):
+        """ Testing a category embedding an updated product isn't answered
+            304 from its date
+        """
+
+        new_product.save()
+        category_url = f'{API_BASE_URL}/categories/{new_product.category_id}'
+        response = client.get(f'{category_url}?include=products')
+        new_product.update({'quantity': 35})
+        modified_response = client.get(
+            f'{category_url}?include=products',
+            headers={'If-Modified-Since': http_date(datetime.datetime.utcnow())})
+
+        assert 'Last-Modified' not in response.headers
+        assert modified_response.status_code == 200
+        assert {'id': new_product.id, 'quantity': 35} in [
+            {'id': product['id'], 'quantity': product['quantity']}
+            for product in modified_response.json['data']['category']['products']]
@@ -0,0 +1,127 @@
+""" Module for testing filter and sort product endpoint """
+
+import pytest
+import api.views.product
+from api.models.product import Product
+from tests.constants import API_BASE_URL
+
+
+@pytest.fixture(scope='module')
+def catalog(init_db, new_category, another_category, new_brand, another_brand):
+    """ Products of two categories and two brands """
+
+    for record in (new_category, another_category, new_brand, another_brand):
+        record.save()
+
+    products = [
+        ('macbook', new_category.id, new_brand.id, 1500, 3),
+        ('thinkpad', new_category.id, another_brand.id, 900, 0),
+        ('chromebook', new_category.id, another_brand.id, 300, 8),
+        ('tesla', another_category.id, new_brand.id, 40000, 1),
+    ]
+    for name, category_id, brand_id, price, quantity in products:
+        Product(name=name, description=name,
+                main_image={'url': 'http://someimage.url',
+                            'public_id': 'image_public_id'},
+                category_id=category_id, brand_id=brand_id,
+                price=price, quantity=quantity).save()
+
+    return {'categories': (new_category.id, another_category.id),
+            'brands': (new_brand.id, another_brand.id)}
+
+
+def get_names(response):
+    """ Gets the names of the returned products """
+
+    return [product['name'] for product in response.json['data']['products']]
+
+
+class TestFilterProductEndpoints:
+    """ Class for testing filter and sort product endpoint """
+
+    def test_get_products_filtered_and_sorted_by_price_succeeds(self,
+                                                                client,
+                                                                catalog):
+        """ Testing filters combine and sort by price """
+
+        category_id, _ = catalog['categories']
+        response = client.get(
+            f'{API_BASE_URL}/products?category_id={category_id}'
+            '&min_price=500&sort=-price')
+
+        assert response.status_code == 200
+        assert get_names(response) == ['macbook', 'thinkpad']
+
+        response = client.get(
+            f'{API_BASE_URL}/products?in_stock=true&max_price=2000&sort=price')
+
+        assert response.status_code == 200
+        assert get_names(response) == ['chromebook', 'macbook']
+
+    def test_get_products_sorted_with_cursor_succeeds(self, client, catalog):
+        """ Testing the sort is kept across cursor pages """
+
+        response = client.get(
+            f'{API_BASE_URL}/products?sort=-price&cursor=&limit=3')
+        next_page = response.json['data']['meta']['next_page']
+
+        assert get_names(response) == ['tesla', 'macbook', 'thinkpad']
+        assert 'sort=-price' in next_page
+
+        response = client.get(next_page)
+
+        assert get_names(response) == ['chromebook']
+
+    def test_get_products_facets_succeeds(self, client, catalog):
+        """ Testing facets ignore their own filter only """
+
+        laptops, _ = catalog['categories']
+        nike, puma = catalog['brands']
+        response = client.get(
+            f'{API_BASE_URL}/products?brand_id={puma}&in_stock=true')
+        facets = response.json['data']['meta']['facets']
+
+        assert get_names(response) == ['chromebook']
+        assert facets['categories'] == [{'id': laptops, 'count': 1}]
+        assert facets['brands'] == [{'id': nike, 'count': 2},
+                                    {'id': puma, 'count': 1}]
+
+    def test_get_products_with_invalid_category_id_fails(self, client, init_db):
+        """ Testing get products with an invalid category ID """
+
+        response = client.get(f'{API_BASE_URL}/products?category_id=abc')
+        message = 'The category_id must be a positive integer greater than 0'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_get_products_with_invalid_min_price_fails(self, client, init_db):
+        """ Testing get products with a negative minimum price """
+
+        response = client.get(f'{API_BASE_URL}/products?min_price=-1')
+        message = 'The min_price must be a positive number'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_get_products_with_invalid_in_stock_fails(self, client, init_db):
+        """ Testing get products with an invalid stock filter """
+
+        response = client.get(f'{API_BASE_URL}/products?in_stock=yes')
+        message = 'The in_stock must be either true or false'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_get_products_with_invalid_sort_fails(self, client, init_db):
+        """ Testing get products with an unknown sort key """
+
+        response = client.get(f'{API_BASE_URL}/products?sort=name')
+        message = 'The sort must be one of: price, -price, created_at, -created_at'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
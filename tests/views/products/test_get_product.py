@@ -1,9 +1,18 @@
 """ Module for testing get product endpoints """
 
+import base64
+from flask import json
 import api.views.product
 from tests.constants import API_BASE_URL
 
 
+def make_cursor(payload):
+    """ Encodes a cursor payload as encode_cursor does """
+
+    raw = json.dumps(payload).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('utf-8').rstrip('=')
+
+
 class TestGetProductEndpoints:
     """ Class for testing get product endpoints """
 
@@ -95,6 +104,65 @@ class TestGetProductEndpoints:
         assert response.json['status'] == 'error'
         assert response.json['message'] == message
 
+    def test_get_all_products_with_cursor_succeeds(self,
+                                                   client,
+                                                   init_db,
+                                                   new_product,
+                                                   another_product):
+        """ Testing get all products with keyset pagination """
+
+        another_product.save()
+        response = client.get(
+            f'{API_BASE_URL}/products?cursor=&limit=1&count=true')
+        meta = response.json['data']['meta']
+
+        assert response.status_code == 200
+        assert len(response.json['data']['products']) == 1
+        assert response.json['data']['products'][0]['name'] == new_product.name
+        assert meta['cursor'] is None
+        assert meta['next_cursor'] is not None
+        assert meta['total_count'] == 2
+
+        response = client.get(
+            f'{API_BASE_URL}/products?cursor={meta["next_cursor"]}&limit=1')
+        meta = response.json['data']['meta']
+
+        assert response.status_code == 200
+        assert len(response.json['data']['products']) == 1
+        assert response.json['data']['products'][0]['name'] == another_product.name
+        assert meta['next_cursor'] is None
+        assert meta['next_page'] is None
+        assert meta['total_count'] is None
+
+    def test_get_all_products_with_invalid_cursor_fails(self,
+                                                        client,
+                                                        init_db):
+        """ Testing get all products with an invalid cursor """
+
+        response = client.get(
+            f'{API_BASE_URL}/products?cursor=invalid&limit=1')
+        message = 'The cursor provided is invalid'
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == message
+
+    def test_get_all_products_with_forged_cursor_fails(self, client, init_db):
+        """ Testing a cursor with values the sort keys can't be compared
+            to is rejected before reaching the database
+        """
+
+        for payload in ([['v', {'a': 1}], ['v', 'x']],
+                        [['v', 'x'], ['v', [1]]],
+                        [['v', '2024-01-01'], ['v', 1]],
+                        [['v', 'x'], ['v', True]],
+                        [['x', 1], ['v', 1]]):
+            response = client.get(
+                f'{API_BASE_URL}/products?cursor={make_cursor(payload)}')
+
+            assert response.status_code == 400
+            assert response.json['message'] == 'The cursor provided is invalid'
+
     def test_get_single_product_succeeds(self, client, init_db, new_product):
         """ Testing get a single product by ID """
 
@@ -0,0 +1,142 @@
+""" Module for testing the Prometheus metrics """
+
+import time
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+import api.views.product
+from api.models.database import db
+from api.utilities.metrics import TimedQueuePool
+from api.utilities.password_hasher import hash_password
+from tests.constants import API_BASE_URL
+
+
+def sample_value(name, **labels):
+    """ Gets the current value of a metric sample, 0 before its first record """
+
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetricsEndpoint:
+    """ Class for testing the Prometheus metrics """
+
+    def test_request_metrics_are_labeled_by_endpoint(self,
+                                                     client,
+                                                     init_db,
+                                                     new_product):
+        """ Testing the responses are counted per resource method """
+
+        new_product.save()
+        labels = {'endpoint': 'SingleProductResource.get', 'method': 'GET'}
+        responses = sample_value('http_responses_total', status='200', **labels)
+        latencies = sample_value('http_request_duration_seconds_count', **labels)
+
+        client.get(f'{API_BASE_URL}/products/{new_product.id}')
+        response = client.get('/metrics')
+        body = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        assert sample_value('http_responses_total', status='200', **labels) == \
+            responses + 1
+        assert sample_value('http_request_duration_seconds_count', **labels) == \
+            latencies + 1
+        assert sample_value('http_requests_in_progress', **labels) == 0
+        assert 'http_response_size_bytes_bucket{endpoint="SingleProductResource.get"' \
+            in body
+
+    def test_unknown_routes_share_a_label(self, client, init_db):
+        """ Testing the requests of unknown routes don't create new labels """
+
+        responses = sample_value('http_responses_total', endpoint='unmatched',
+                                 method='GET', status='404')
+
+        client.get('/undefined/route')
+
+        assert sample_value('http_responses_total', endpoint='unmatched',
+                            method='GET', status='404') == responses + 1
+
+    def test_pool_and_password_hash_metrics_are_recorded(self, client, init_db):
+        """ Testing the connection waits and the bcrypt durations are recorded """
+
+        hashes = sample_value('password_hash_duration_seconds_count',
+                              operation='hash')
+
+        hash_password('password')
+
+        assert isinstance(db.engine.pool, TimedQueuePool)
+        assert sample_value('db_pool_checkout_wait_seconds_count') > 0
+        assert sample_value('password_hash_duration_seconds_count',
+                            operation='hash') == hashes + 1
+
+    def test_cache_hits_and_misses_are_counted(self,
+                                               client,
+                                               init_db,
+                                               new_product):
+        """ Testing the response cache lookups are counted per namespace """
+
+        new_product.save()
+        hits = sample_value('cache_hits_total', namespace='products')
+        misses = sample_value('cache_misses_total', namespace='products')
+
+        client.get(f'{API_BASE_URL}/products/{new_product.id}?metrics=cache')
+        client.get(f'{API_BASE_URL}/products/{new_product.id}?metrics=cache')
+
+        assert sample_value('cache_hits_total', namespace='products') == hits + 1
+        assert sample_value('cache_misses_total', namespace='products') == \
+            misses + 1
+
+    def test_pool_connect_time_is_not_counted_as_wait(self, client, init_db):
+        """ Testing opening a connection isn't recorded as waiting for one """
+
+        def slow_connect(connection, record):
+            time.sleep(0.2)
+
+        db.session.remove()
+        db.engine.dispose()
+        event.listen(db.engine.pool, 'connect', slow_connect)
+        waits = sample_value('db_pool_checkout_wait_seconds_sum')
+        connects = sample_value('db_pool_connect_duration_seconds_sum')
+        try:
+            db.session.execute('SELECT 1')
+        finally:
+            event.remove(db.engine.pool, 'connect', slow_connect)
+            db.session.remove()
+
+        assert sample_value('db_pool_connect_duration_seconds_sum') - connects \
+            >= 0.2
+        assert sample_value('db_pool_checkout_wait_seconds_sum') - waits < 0.1
+
+    def test_unhandled_errors_are_counted_as_500(self,
+                                                 app,
+                                                 init_db,
+                                                 new_product,
+                                                 monkeypatch):
+        """ Testing a raising view is counted as a 500 response """
+
+        def raise_error(product_id):
+            raise RuntimeError('Database unavailable')
+
+        new_product.save()
+        labels = {'endpoint': 'SingleProductResource.get', 'method': 'GET'}
+        errors = sample_value('http_responses_total', status='500', **labels)
+        monkeypatch.setattr(api.views.product.Product, 'find_by_id', raise_error)
+        # The teardown of a failed test request is otherwise deferred
+        monkeypatch.setitem(app.config, 'PRESERVE_CONTEXT_ON_EXCEPTION', False)
+
+        with pytest.raises(RuntimeError):
+            app.test_client().get(f'{API_BASE_URL}/products/{new_product.id}?metrics=error')
+
+        assert sample_value('http_responses_total', status='500', **labels) == \
+            errors + 1
+        assert sample_value('http_requests_in_progress', **labels) == 0
+
+    def test_metrics_are_hidden_outside_the_allowed_networks(self,
+                                                            client,
+                                                            init_db):
+        """ Testing /metrics is unknown to the other networks """
+
+        response = client.get('/metrics',
+                              environ_base={'REMOTE_ADDR': '10.1.2.3'})
+
+        assert response.status_code == 404
@@ -0,0 +1,72 @@
+""" Module for testing the response bodies and their JSON encoding """
+
+import datetime
+import decimal
+import threading
+import api.views.product
+from api.utilities.json_encoder import encode_json, encode_orjson, get_encoder, orjson
+from tests.constants import API_BASE_URL
+
+
+class TestProductResponse:
+    """ Class for testing the response bodies and their JSON encoding """
+
+    def test_concurrent_responses_are_not_shared_succeeds(self,
+                                                          app,
+                                                          init_db,
+                                                          new_product):
+        """ Testing parallel requests each get their own response body """
+
+        new_product.save()
+        product_id = new_product.id
+        barrier = threading.Barrier(8)
+        responses = []
+
+        def get_product(index):
+            # Half of the requests fail, their message must not leak
+            requested_id = product_id if index % 2 else 100000 + index
+            with app.test_client() as client:
+                barrier.wait()
+                response = client.get(f'{API_BASE_URL}/products/{requested_id}')
+                responses.append((requested_id, response.status_code, response.json))
+
+        threads = [threading.Thread(target=get_product, args=(index,))
+                   for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(responses) == 8
+        for requested_id, status_code, body in responses:
+            if requested_id == product_id:
+                assert status_code == 200
+                assert body['message'] == 'Product successfully fetched'
+                assert body['data']['product']['id'] == product_id
+            else:
+                assert status_code == 404
+                assert body == {'status': 'error', 'message': 'Product not found'}
+
+    def test_json_encoders_serialize_decimal_and_datetime_succeeds(self):
+        """ Testing the encoders serialize the same JSON """
+
+        data = {'price': decimal.Decimal('10.50'),
+                'created_at': datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+                'name': 'iphone'}
+        expected = '{"price":"10.50","created_at":"2020-01-02T03:04:05.000006","name":"iphone"}'
+
+        assert encode_json(data) == expected
+        if orjson is not None:
+            assert encode_orjson(data).decode('utf-8') == expected
+            assert get_encoder('orjson') is encode_orjson
+        else:
+            assert get_encoder('orjson') is encode_json
+
+    def test_json_response_content_type_succeeds(self, client, init_db):
+        """ Testing the responses are served as JSON """
+
+        response = client.get(f'{API_BASE_URL}/products/100000')
+
+        assert response.status_code == 404
+        assert response.mimetype == 'application/json'
+        assert response.json['message'] == 'Product not found'
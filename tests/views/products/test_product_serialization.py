@@ -0,0 +1,65 @@
+""" Module for testing the precompiled serializers """
+
+from flask import json
+import api.views.cart
+import api.views.product
+from api.models.cart import Cart
+from api.models.product import Product
+from api.schemas.cart import CartSchema
+from api.schemas.product import ProductSchema
+from api.schemas.registry import get_dumper, get_schema
+from api.utilities.helpers.constants import EXCLUDED_FIELDS
+from tests.constants import API_BASE_URL
+
+
+def to_json(data):
+    """ Serializes data like the endpoints do """
+
+    return json.loads(json.dumps(data))
+
+
+class TestProductSerialization:
+    """ Class for testing the fast dumpers output """
+
+    def test_fast_dumper_matches_schema_dump_succeeds(self, init_db, new_cart_item):
+        """ Testing the fast dumpers output the marshmallow dump """
+
+        new_cart_item.save()
+        products = Product.query.order_by(Product.id).all()
+        cart = Cart.query.get(new_cart_item.cart_id)
+
+        assert get_dumper(ProductSchema, many=True).dump(products) == \
+            ProductSchema(many=True).dump(products)
+        assert get_dumper(ProductSchema).dump(products[0]) == \
+            ProductSchema().dump(products[0])
+        assert get_dumper(CartSchema, exclude=EXCLUDED_FIELDS).dump(cart) == \
+            CartSchema(exclude=EXCLUDED_FIELDS).dump(cart)
+
+    def test_schema_instances_are_reused_succeeds(self):
+        """ Testing a schema variant is built once """
+
+        schema = get_schema(ProductSchema, exclude=['images', 'price'])
+
+        assert get_schema(ProductSchema, exclude=['price', 'images']) is schema
+        assert get_schema(ProductSchema, exclude=['price']) is not schema
+        assert get_dumper(ProductSchema, many=True) is \
+            get_dumper(ProductSchema, many=True)
+
+    def test_endpoints_output_matches_schema_dump_succeeds(self,
+                                                           client,
+                                                           init_db,
+                                                           user_auth_header):
+        """ Testing the endpoints output is unchanged """
+
+        products = Product.query.order_by(Product.id).all()
+        cart = Cart.query.filter(Cart.items.any()).first()
+        listing = client.get(f'{API_BASE_URL}/products')
+        product = client.get(f'{API_BASE_URL}/products/{products[0].id}')
+        user_cart = client.get(f'{API_BASE_URL}/auth/cart', headers=user_auth_header)
+
+        assert listing.json['data']['products'] == \
+            to_json(ProductSchema(many=True).dump(products))
+        assert product.json['data']['product'] == \
+            to_json(ProductSchema().dump(products[0]))
+        assert user_cart.json['data']['cart'] == \
+            to_json(CartSchema(exclude=EXCLUDED_FIELDS).dump(cart))
@@ -0,0 +1,144 @@
+""" Module for testing the SQL statements of the validations """
+
+from flask import json
+import api.views.brand
+import api.views.category
+import api.views.product
+from api.models.category import Category
+from api.models.product import Product
+from api.utilities.validators.context import ValidationContext
+from tests.constants import API_BASE_URL
+from tests.mocks.product import VALID_PRODUCT, INVALID_PRODUCT_WITH_EXISTING_NAME
+
+
+def validation_statements(statements, table):
+    """ Gets the SELECT statements of a table run before the first write """
+
+    reads = []
+    for statement in statements:
+        if not statement.lstrip().startswith('SELECT'):
+            break
+        if f'FROM {table}' in statement:
+            reads.append(statement)
+    return reads
+
+
+class TestValidationQueries:
+    """ Class for testing the SQL statements of the validations """
+
+    def test_validation_context_fetches_one_query_per_table(self,
+                                                            app,
+                                                            init_db,
+                                                            new_product,
+                                                            max_queries):
+        """ Testing the gathered records of a table are fetched once """
+
+        new_product.save()
+        context = ValidationContext()
+        context.add(Product, name=' IPhone ')
+        context.add(Product, id=new_product.id)
+        context.add(Category, columns=['path'], id=new_product.category_id)
+        context.add(Category, id='not an ID', name=None)
+
+        with max_queries(2) as statements:
+            product = context.find(Product, name='iphone')
+            same_product = context.find(Product, id=new_product.id)
+            category = context.find(Category, id=new_product.category_id)
+            missing_product = context.find(Product, name='pixel')
+
+        assert product == same_product
+        assert product.id == new_product.id
+        assert category.path == f'/{new_product.category_id}/'
+        assert missing_product is None
+        assert 'products.description' not in statements[0]
+
+    def test_create_product_validates_with_one_query_per_table(self,
+                                                               client,
+                                                               init_db,
+                                                               new_product,
+                                                               admin_auth_header,
+                                                               max_queries):
+        """ Testing the product name, category and brand are fetched once """
+
+        new_product.save()
+        product = dict(VALID_PRODUCT, category_id=new_product.category_id,
+                       brand_id=new_product.brand_id)
+
+        with max_queries(6) as statements:
+            response = client.post(f'{API_BASE_URL}/products',
+                                   data=json.dumps(product),
+                                   headers=admin_auth_header)
+
+        assert response.status_code == 201
+        for table in ['products', 'categories', 'brands']:
+            assert len(validation_statements(statements, table)) == 1
+
+    def test_create_product_with_existing_name_runs_one_query(self,
+                                                              client,
+                                                              init_db,
+                                                              admin_auth_header,
+                                                              max_queries):
+        """ Testing the validation stops at the first failing lookup """
+
+        with max_queries(1):
+            response = client.post(f'{API_BASE_URL}/products',
+                                   data=json.dumps(INVALID_PRODUCT_WITH_EXISTING_NAME),
+                                   headers=admin_auth_header)
+
+        assert response.status_code == 400
+        assert response.json['message'] == 'The product name provided already exists'
+
+    def test_update_product_validates_with_one_query_per_table(self,
+                                                               client,
+                                                               init_db,
+                                                               new_product,
+                                                               admin_auth_header,
+                                                               max_queries):
+        """ Testing the product update reads each table once to validate """
+
+        product = dict(VALID_PRODUCT, name='iphone', price=300000,
+                       category_id=new_product.category_id,
+                       brand_id=new_product.brand_id)
+
+        with max_queries(7) as statements:
+            response = client.put(f'{API_BASE_URL}/products/{new_product.id}',
+                                  data=json.dumps(product),
+                                  headers=admin_auth_header)
+
+        assert response.status_code == 200
+        for table in ['categories', 'brands']:
+            assert len(validation_statements(statements, table)) == 1
+
+    def test_create_subcategory_validates_with_one_query(self,
+                                                         client,
+                                                         init_db,
+                                                         new_product,
+                                                         admin_auth_header,
+                                                         max_queries):
+        """ Testing the category name and parent are fetched together """
+
+        category = {'name': 'gaming laptops', 'description': 'Gaming',
+                    'parent_id': new_product.category_id}
+
+        with max_queries(5) as statements:
+            response = client.post(f'{API_BASE_URL}/categories',
+                                   data=json.dumps(category),
+                                   headers=admin_auth_header)
+
+        assert response.status_code == 201
+        assert len(validation_statements(statements, 'categories')) == 1
+
+    def test_create_brand_validates_with_one_query(self,
+                                                   client,
+                                                   init_db,
+                                                   admin_auth_header,
+                                                   max_queries):
+        """ Testing the brand name is checked with one query """
+
+        with max_queries(3) as statements:
+            response = client.post(f'{API_BASE_URL}/brands',
+                                   data=json.dumps({'name': 'sony'}),
+                                   headers=admin_auth_header)
+
+        assert response.status_code == 201
+        assert len(validation_statements(statements, 'brands')) == 1
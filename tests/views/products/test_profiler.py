@@ -0,0 +1,111 @@
+""" Module for testing the profiling of the admin requests """
+
+import pstats
+import re
+import api.views.product
+from tests.constants import API_BASE_URL
+
+PROFILE_TIMING = re.compile(
+    r'^profile;dur=[\d.]+, profile-sql;dur=([\d.]+), '
+    r'profile-serialization;dur=([\d.]+), profile-view;dur=[\d.]+$')
+
+
+class TestProfiler:
+    """ Class for testing the profiling of the admin requests """
+
+    def test_admin_request_is_profiled(self,
+                                       client,
+                                       init_db,
+                                       new_product,
+                                       admin_auth_header,
+                                       tmp_path):
+        """ Testing the profile is stored and its time broken down """
+
+        new_product.save()
+        client.application.config['PROFILE_DIR'] = str(tmp_path)
+        try:
+            response = client.get(
+                f'{API_BASE_URL}/products?limit=5&profile=admin',
+                headers=dict(admin_auth_header, **{'X-Profile': '1'}))
+        finally:
+            client.application.config['PROFILE_DIR'] = None
+        profile_id = response.headers['X-Profile-Id']
+        timing = [value for value in response.headers.getlist('Server-Timing')
+                  if value.startswith('profile;')]
+        stats = pstats.Stats(str(tmp_path / f'{profile_id}.pstats'))
+
+        assert response.status_code == 200
+        assert '-ProductResource.get-' in profile_id
+        assert len(timing) == 1
+        sql, serialization = PROFILE_TIMING.match(timing[0]).groups()
+        assert float(sql) > 0
+        assert float(serialization) > 0
+        assert stats.total_calls > 0
+
+    def test_user_request_is_not_profiled(self, client, init_db, user_auth_header):
+        """ Testing the profiling header of a regular user is ignored """
+
+        response = client.get(
+            f'{API_BASE_URL}/products?limit=5&profile=user',
+            headers=dict(user_auth_header, **{'X-Profile': '1'}))
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+
+    def test_request_without_header_is_not_profiled(self,
+                                                    client,
+                                                    init_db,
+                                                    admin_auth_header):
+        """ Testing the requests are only profiled on demand """
+
+        response = client.get(f'{API_BASE_URL}/products?limit=5&profile=none',
+                              headers=admin_auth_header)
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+        assert not [value for value in response.headers.getlist('Server-Timing')
+                    if value.startswith('profile;')]
+
+    def test_only_the_last_profiles_are_kept(self,
+                                             client,
+                                             init_db,
+                                             admin_auth_header,
+                                             monkeypatch,
+                                             tmp_path):
+        """ Testing the oldest profiles are removed beyond the limit """
+
+        monkeypatch.setitem(client.application.config, 'PROFILE_DIR', str(tmp_path))
+        monkeypatch.setitem(client.application.config, 'PROFILE_MAX_FILES', 2)
+        profile_ids = [
+            client.get(f'{API_BASE_URL}/products?limit=5&profile={index}',
+                       headers=dict(admin_auth_header, **{'X-Profile': '1'}))
+            .headers['X-Profile-Id'] for index in range(3)]
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == \
+            sorted(f'{profile_id}.pstats' for profile_id in profile_ids[1:])
+
+    def test_streamed_response_is_profiled_until_its_end(self,
+                                                         client,
+                                                         init_db,
+                                                         new_product,
+                                                         admin_auth_header,
+                                                         monkeypatch,
+                                                         tmp_path):
+        """ Testing the body of the export is generated under the profiler """
+
+        new_product.save()
+        monkeypatch.setitem(client.application.config, 'PROFILE_DIR', str(tmp_path))
+        headers = dict(admin_auth_header, **{'X-Profile': '1'})
+        response = client.get(f'{API_BASE_URL}/products/export', headers=headers)
+        profile_id = response.headers['X-Profile-Id']
+        response.get_data()
+        # Closed by the WSGI server once the body is sent
+        response.close()
+        stats = pstats.Stats(str(tmp_path / f'{profile_id}.pstats'))
+        next_response = client.get(f'{API_BASE_URL}/products?limit=5&profile=next',
+                                   headers=headers)
+
+        assert response.status_code == 200
+        assert [function for function in stats.stats
+                if function[2] == 'export_products']
+        assert next_response.headers['X-Profile-Id'] != 'busy'
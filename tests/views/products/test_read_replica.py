@@ -0,0 +1,146 @@
+""" Module for testing the read replica routing """
+
+import time
+import pytest
+from flask import json
+from flask_sqlalchemy import get_state
+import api.views.cart
+import api.views.product
+from itsdangerous import TimestampSigner
+from api.middlewares.read_replica import (PRIMARY_COOKIE, check_replica_config,
+                                          get_primary_cookie_signer,
+                                          get_primary_reads)
+from api.models.database import db
+from api.utilities.cache import get_cache
+from tests.constants import API_BASE_URL
+
+
+@pytest.fixture(scope='module')
+def replica(app, init_db):
+    """ Stand-in replica: the tables of a replica schema of the test
+        database, left empty since nothing replicates to it
+    """
+
+    db.session.execute('CREATE SCHEMA IF NOT EXISTS replica')
+    db.session.commit()
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    separator = '&' if '?' in url else '?'
+    app.config['SQLALCHEMY_BINDS'] = {
+        'replica0': f'{url}{separator}options=-csearch_path%3Dreplica'}
+    db.Model.metadata.create_all(db.get_engine(app, bind='replica0'))
+
+    yield 'replica0'
+
+    db.session.remove()
+    get_state(app).connectors.pop('replica0').get_engine().dispose()
+    app.config['SQLALCHEMY_BINDS'] = {}
+    db.session.execute('DROP SCHEMA replica CASCADE')
+    db.session.commit()
+
+
+class TestReadReplica:
+    """ Class for testing the read replica routing """
+
+    def test_catalog_reads_go_to_the_replica_succeeds(self,
+                                                      client,
+                                                      new_product,
+                                                      replica):
+        """ Testing the product reads don't see the primary database """
+
+        new_product.save()
+        products = client.get(f'{API_BASE_URL}/products')
+        product = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+
+        assert products.status_code == 200
+        assert products.json['data']['products'] == []
+        assert product.status_code == 404
+        assert PRIMARY_COOKIE not in products.headers.get('Set-Cookie', '')
+
+    def test_reads_after_a_write_go_to_the_primary_succeeds(self,
+                                                            client,
+                                                            new_cart,
+                                                            new_product,
+                                                            user_auth_header,
+                                                            replica):
+        """ Testing a client reads its own writes after adding to its cart """
+
+        new_cart.save()
+        response = client.post(
+            f'{API_BASE_URL}/auth/cart',
+            data=json.dumps({'product_id': new_product.id, 'quantity': 1}),
+            headers=user_auth_header)
+        products = client.get(f'{API_BASE_URL}/products')
+
+        assert response.status_code == 200
+        assert PRIMARY_COOKIE in response.headers['Set-Cookie']
+        assert [product['name'] for product in products.json['data']['products']] == \
+            ['iphone']
+        assert products.json['data']['products'][0]['quantity'] == 49
+
+    def test_user_reads_after_a_write_go_to_the_primary_succeeds(self,
+                                                                 client,
+                                                                 new_cart,
+                                                                 new_product,
+                                                                 user_auth_header,
+                                                                 replica):
+        """ Testing a user without cookies reads its own writes """
+
+        new_cart.save()
+        response = client.post(
+            f'{API_BASE_URL}/auth/cart',
+            data=json.dumps({'product_id': new_product.id, 'quantity': 1}),
+            headers=user_auth_header)
+        client.cookie_jar.clear()
+        anonymous_product = client.get(
+            f'{API_BASE_URL}/products/{new_product.id}')
+        product = client.get(f'{API_BASE_URL}/products/{new_product.id}',
+                             headers=user_auth_header)
+
+        assert response.status_code == 200
+        assert product.status_code == 200
+        assert anonymous_product.status_code == 404
+        assert get_primary_reads() is not get_cache()
+        assert get_primary_reads().get(str(new_cart.user_id)) is True
+
+    def test_reads_go_back_to_the_replica_after_the_window_succeeds(self,
+                                                                    client,
+                                                                    new_product,
+                                                                    replica,
+                                                                    monkeypatch):
+        """ Testing the stickiness expires and can't be forged """
+
+        client.set_cookie('localhost', PRIMARY_COOKIE, str(time.time() + 60))
+        product = client.get(f'{API_BASE_URL}/products/{new_product.id}?cookie=forged')
+
+        assert product.status_code == 404
+
+        with client.application.test_request_context():
+            cookie = get_primary_cookie_signer().sign('1').decode('utf-8')
+            monkeypatch.setattr(TimestampSigner, 'get_timestamp',
+                                lambda signer: int(time.time()) - 60)
+            expired_cookie = get_primary_cookie_signer().sign('1').decode('utf-8')
+        monkeypatch.undo()
+
+        client.set_cookie('localhost', PRIMARY_COOKIE, expired_cookie)
+        product = client.get(f'{API_BASE_URL}/products/{new_product.id}?cookie=expired')
+
+        assert product.status_code == 404
+
+        client.set_cookie('localhost', PRIMARY_COOKIE, cookie)
+        product = client.get(f'{API_BASE_URL}/products/{new_product.id}?cookie=signed')
+
+        assert product.status_code == 200
+
+    def test_replicas_without_a_shared_store_fail(self):
+        """ Testing several workers can't use the replicas with the
+            in-process cache, their users wouldn't read their writes
+        """
+
+        config = {'SQLALCHEMY_BINDS': {'replica0': 'postgresql://replica'},
+                  'WEB_CONCURRENCY': 2, 'CACHE_BACKEND': 'memory'}
+
+        with pytest.raises(ValueError):
+            check_replica_config(config)
+
+        check_replica_config(dict(config, CACHE_BACKEND='redis'))
+        check_replica_config(dict(config, WEB_CONCURRENCY=1))
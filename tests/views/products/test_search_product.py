@@ -0,0 +1,71 @@
+""" Module for testing search product endpoint """
+
+import api.views.product
+from api.models.product import Product
+from tests.constants import API_BASE_URL
+
+
+class TestSearchProductEndpoints:
+    """ Class for testing search product endpoint """
+
+    def test_search_products_ranks_name_matches_first_succeeds(self,
+                                                                client,
+                                                                init_db,
+                                                                new_product,
+                                                                another_product):
+        """ Testing name matches rank above description matches """
+
+        new_product.save()
+        another_product.save()
+        Product(name='phone case', description='Leather case for an iphone',
+                main_image={'url': 'http://someimage.url',
+                            'public_id': 'image_public_id'},
+                category_id=new_product.category_id, price=20,
+                quantity=5).save()
+        response = client.get(
+            f'{API_BASE_URL}/products/search?q=case')
+        products = response.json['data']['products']
+
+        assert response.status_code == 200
+        assert response.json['status'] == 'success'
+        assert response.json['message'] == 'Products successfully fetched'
+        assert [product['name'] for product in products] == ['phone case']
+
+        response = client.get(
+            f'{API_BASE_URL}/products/search?q=phone&count=true')
+        products = response.json['data']['products']
+
+        assert response.status_code == 200
+        assert products[0]['name'] == 'phone case'
+        assert response.json['data']['meta']['total_count'] == 3
+
+    def test_search_products_with_cursor_succeeds(self, client, init_db):
+        """ Testing search results are paginated with a cursor """
+
+        response = client.get(
+            f'{API_BASE_URL}/products/search?q=phone&limit=2')
+        meta = response.json['data']['meta']
+        first_page = [product['name']
+                      for product in response.json['data']['products']]
+
+        assert response.status_code == 200
+        assert len(first_page) == 2
+        assert 'q=phone' in meta['next_page']
+
+        response = client.get(meta['next_page'])
+        second_page = [product['name']
+                       for product in response.json['data']['products']]
+
+        assert response.status_code == 200
+        assert len(second_page) == 1
+        assert not set(first_page) & set(second_page)
+        assert response.json['data']['meta']['next_cursor'] is None
+
+    def test_search_products_without_query_fails(self, client, init_db):
+        """ Testing search products without a search query """
+
+        response = client.get(f'{API_BASE_URL}/products/search?q=%20')
+
+        assert response.status_code == 400
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == 'The search query is required'
@@ -0,0 +1,104 @@
+""" Module for testing the SQL statements instrumentation """
+
+import logging
+import re
+import pytest
+from flask import json
+import api.views.brand
+import api.views.product
+from api.middlewares.sql_instrumentation import (StatementStats,
+                                                 SQLBudgetExceeded,
+                                                 collect_statements,
+                                                 fingerprint)
+from api.models.database import db
+from tests.constants import API_BASE_URL
+
+SERVER_TIMING = re.compile(r'^db;dur=\d+\.\d{2};desc="\d+ statements"$')
+
+
+class TestSQLInstrumentation:
+    """ Class for testing the SQL statements instrumentation """
+
+    def test_server_timing_header_reports_statements(self,
+                                                     client,
+                                                     init_db,
+                                                     new_product):
+        """ Testing the statements count and time are sent to the client """
+
+        new_product.save()
+        response = client.get(f'{API_BASE_URL}/products/{new_product.id}')
+
+        assert response.status_code == 200
+        assert SERVER_TIMING.match(response.headers['Server-Timing'])
+
+    def test_request_over_budget_fails(self, client, init_db, admin_auth_header):
+        """ Testing a request over the statements budget fails in the tests """
+
+        client.application.config['SQL_STATEMENT_BUDGET'] = 0
+        try:
+            with pytest.raises(SQLBudgetExceeded) as error:
+                client.post(f'{API_BASE_URL}/brands',
+                            data=json.dumps({'name': 'nokia'}),
+                            headers=admin_auth_header)
+        finally:
+            client.application.config['SQL_STATEMENT_BUDGET'] = 20
+
+        assert re.match(r'BrandResource.post: \d+ SQL statements, the budget is 0$',
+                        str(error.value))
+
+    def test_request_over_budget_is_logged(self,
+                                           client,
+                                           init_db,
+                                           admin_auth_header,
+                                           caplog):
+        """ Testing a request over the statements budget is logged in production """
+
+        client.application.config['SQL_STATEMENT_BUDGET'] = 0
+        client.application.config['SQL_BUDGET_ACTION'] = 'warn'
+        try:
+            with caplog.at_level(logging.WARNING):
+                response = client.post(f'{API_BASE_URL}/brands',
+                                       data=json.dumps({'name': 'nokia'}),
+                                       headers=admin_auth_header)
+        finally:
+            client.application.config['SQL_STATEMENT_BUDGET'] = 20
+            client.application.config['SQL_BUDGET_ACTION'] = 'raise'
+
+        assert response.status_code == 400
+        assert 'BrandResource.post: 1 SQL statements, the budget is 0' in caplog.text
+
+    def test_repeated_statements_are_detected(self):
+        """ Testing the statements differing by their parameters are counted together """
+
+        stats = StatementStats(budget=20)
+        for product_id in range(4):
+            stats.record('SELECT products.id FROM products\n'
+                         'WHERE products.id = %(param_1)s', 0.001)
+        stats.record('SELECT brands.id FROM brands WHERE brands.id IN '
+                     '(%(id_1)s, %(id_2)s)', 0.001)
+        stats.record('SELECT brands.id FROM brands WHERE brands.id IN '
+                     '(%(id_1)s, %(id_2)s, %(id_3)s)', 0.001)
+
+        assert stats.count == 6
+        assert stats.repeated(3) == [
+            ('SELECT products.id FROM products WHERE products.id = ?', 4)]
+        assert stats.repeated(1)[1] == \
+            ('SELECT brands.id FROM brands WHERE brands.id IN (?)', 2)
+        assert fingerprint('SELECT 1 WHERE a = %s') == 'SELECT 1 WHERE a = ?'
+
+    def test_collected_statements_include_the_requests(self,
+                                                       client,
+                                                       init_db,
+                                                       new_product):
+        """ Testing a block collects its statements and those of its requests,
+            which are still reported to the client
+        """
+
+        new_product.save()
+        with collect_statements() as stats:
+            db.session.execute('SELECT 1')
+            response = client.get(f'{API_BASE_URL}/products/{new_product.id}?sql=collect')
+
+        assert stats.statements[0] == 'SELECT 1'
+        assert stats.count == len(stats.statements) > 1
+        assert SERVER_TIMING.match(response.headers['Server-Timing'])
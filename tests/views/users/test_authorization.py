@@ -0,0 +1,70 @@
+""" Module for testing the authorization of admin endpoints """
+
+from flask import json
+from sqlalchemy import event
+from api.models.database import db
+from tests.constants import API_BASE_URL
+import api.views.brand
+
+
+class TestAuthorization:
+    """ Class for testing the authorization of admin endpoints """
+
+    def test_admin_authorization_is_served_from_cache(self,
+                                                      client,
+                                                      init_db,
+                                                      admin_auth_header):
+        """ Testing a known admin is authorized without any query """
+
+        client.post(f'{API_BASE_URL}/brands',
+                    data=json.dumps({'name': 'reebok'}), headers=admin_auth_header)
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record_statement)
+        try:
+            response = client.delete(
+                f'{API_BASE_URL}/brands/1000', headers=admin_auth_header)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record_statement)
+
+        assert response.status_code == 404
+        assert not [statement for statement in statements if 'users' in statement]
+
+    def test_user_permission_denied(self, client, init_db, user_auth_header):
+        """ Testing a regular user can't perform admin actions """
+
+        response = client.delete(
+            f'{API_BASE_URL}/brands/1000', headers=user_auth_header)
+        message = 'Permission denied. You are not authorized to perform this action'
+
+        assert response.status_code == 403
+        assert response.json['message'] == message
+
+    def test_demoted_admin_permission_denied(self,
+                                             client,
+                                             init_db,
+                                             new_admin,
+                                             admin_auth_header):
+        """ Testing the cached admin role is dropped when the user is updated """
+
+        response = client.delete(
+            f'{API_BASE_URL}/brands/1000', headers=admin_auth_header)
+        new_admin.save()
+        new_admin.update({'is_admin': False})
+        demoted_response = client.delete(
+            f'{API_BASE_URL}/brands/1000', headers=admin_auth_header)
+
+        assert response.status_code == 404
+        assert demoted_response.status_code == 403
+
+    def test_invalid_token_fails(self, client, init_db):
+        """ Testing an invalid token is rejected """
+
+        response = client.delete(
+            f'{API_BASE_URL}/brands/1000', headers={'Authorization': 'invalid'})
+
+        assert response.status_code == 401
+        assert response.json['message'] == 'The provided authorization token is invalid'
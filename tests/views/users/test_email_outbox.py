@@ -0,0 +1,123 @@
+""" Module for testing the queued emails of the user endpoints """
+
+import datetime
+from flask import json
+from api.models.database import db
+from api.models.email_outbox import EmailOutbox
+from api.utilities import email_dispatcher
+from api.utilities.email_dispatcher import dispatch_emails
+from config.server import create_app
+from tests.conftest import TestConfig
+from tests.constants import API_BASE_URL, CONTENT_TYPE
+import api.views.user
+
+
+def queue_emails(*recipients):
+    """ Queues one email per recipient """
+
+    return [EmailOutbox.enqueue('Dash Shop <shop@example.com>', recipient,
+                                'Confirmation Email', '<p>Hello</p>')
+            for recipient in recipients]
+
+
+class TestEmailOutbox:
+    """ Class for testing the email outbox and its dispatcher """
+
+    def test_user_signup_queues_confirmation_email_succeeds(self,
+                                                            client,
+                                                            init_db,
+                                                            smtp_server):
+        """ Testing signup only queues the email """
+
+        user_data = json.dumps({'firstname': 'Aline', 'lastname': 'Uwase',
+                                'email': 'alineuwase@gmail.com',
+                                'password': 'Password1234'})
+        response = client.post(
+            f'{API_BASE_URL}/auth/signup', data=user_data, content_type=CONTENT_TYPE)
+        email = EmailOutbox.query.filter_by(
+            recipient='alineuwase@gmail.com').one()
+
+        assert response.status_code == 201
+        assert email.status == 'pending'
+        assert email.subject == 'Confirmation Email'
+        assert smtp_server.connections == 0
+
+    def test_dispatch_emails_over_one_connection_succeeds(self,
+                                                          init_db,
+                                                          smtp_server):
+        """ Testing the due emails are sent in one batch """
+
+        emails = queue_emails('one@example.com', 'two@example.com')
+        processed = dispatch_emails()
+
+        assert processed == EmailOutbox.query.count()
+        assert smtp_server.connections == 1
+        assert {'alineuwase@gmail.com', 'one@example.com', 'two@example.com'} == \
+            {message['recipients'][0] for message in smtp_server.messages}
+        assert all(email.status == 'sent' for email in emails)
+        assert dispatch_emails() == 0
+
+    def test_dispatch_rejected_email_is_retried_with_backoff_succeeds(
+            self, app, init_db, smtp_server):
+        """ Testing a rejected email is retried later then given up """
+
+        smtp_server.rejected_recipients.add('unknown@example.com')
+        rejected, accepted = queue_emails('unknown@example.com',
+                                          'three@example.com')
+        dispatch_emails()
+        next_attempt_at = rejected.next_attempt_at
+
+        assert accepted.status == 'sent'
+        assert rejected.status == 'pending'
+        assert rejected.attempts == 1
+        assert next_attempt_at > datetime.datetime.utcnow()
+        assert dispatch_emails() == 0
+
+        for _ in range(app.config['EMAIL_MAX_ATTEMPTS'] - 1):
+            rejected.update({'next_attempt_at': datetime.datetime.utcnow()})
+            dispatch_emails()
+
+        assert rejected.status == 'failed'
+        assert '550' in rejected.last_error
+
+    def test_dispatch_when_smtp_server_is_down_postpones_emails_succeeds(
+            self, init_db, smtp_server, monkeypatch):
+        """ Testing a connection failure postpones the whole batch """
+
+        smtp_server.shutdown()
+        smtp_server.server_close()
+        emails = queue_emails('four@example.com', 'five@example.com')
+        dispatch_emails()
+
+        for email in emails:
+            assert email.status == 'pending'
+            assert email.attempts == 1
+            assert email.next_attempt_at > datetime.datetime.utcnow()
+
+    def test_queued_email_is_rolled_back_with_its_transaction(self, init_db):
+        """ Testing an email is only queued when its transaction commits """
+
+        queue_emails('six@example.com')
+        db.session.rollback()
+
+        assert EmailOutbox.query.filter_by(
+            recipient='six@example.com').count() == 0
+
+    def test_first_request_starts_dispatcher(self, app, monkeypatch):
+        """ Testing a new worker process sends the emails left pending """
+
+        class Dispatcher:
+            notifications = 0
+
+            def notify(self):
+                self.notifications += 1
+
+        dispatcher = Dispatcher()
+        monkeypatch.setattr(email_dispatcher, '_dispatcher', dispatcher)
+        new_app = create_app(TestConfig)
+        new_app.config['EMAIL_DISPATCHER'] = 'thread'
+        client = new_app.test_client()
+        client.get('/undefined')
+        client.get('/undefined')
+
+        assert dispatcher.notifications == 1
@@ -0,0 +1,92 @@
+""" Module for testing the password hashing of the user endpoints """
+
+import threading
+import time
+import bcrypt
+from flask import json
+from api.models.user import User
+import api.utilities.password_hasher
+from api.utilities.password_hasher import (PasswordHasher,
+                                           get_password_hasher,
+                                           set_password_hasher)
+from tests.constants import API_BASE_URL, CONTENT_TYPE
+import api.views.user
+
+
+class TestPasswordHashing:
+    """ Class for testing the password hashing of the user endpoints """
+
+    def test_user_login_rehashes_password_with_new_cost_succeeds(self,
+                                                                 client,
+                                                                 init_db):
+        """ Testing login upgrades a hash computed with another cost """
+
+        hashed = bcrypt.hashpw(b'Password1234', bcrypt.gensalt(4))
+        user = User(firstname='Jean', lastname='Kabera',
+                    email='jeankabera@gmail.com',
+                    password=hashed.decode('utf-8'), is_activated=True)
+        user.save()
+        user_data = json.dumps(
+            {'email': 'jeankabera@gmail.com', 'password': 'Password1234'})
+        response = client.post(
+            f'{API_BASE_URL}/auth/login', data=user_data, content_type=CONTENT_TYPE)
+        rounds = get_password_hasher().rounds
+        response_again = client.post(
+            f'{API_BASE_URL}/auth/login', data=user_data, content_type=CONTENT_TYPE)
+
+        assert response.status_code == 200
+        assert response_again.status_code == 200
+        assert user.password.startswith(f'$2b${rounds:02d}$')
+        assert bcrypt.checkpw(b'Password1234', user.password.encode('utf-8'))
+
+    def test_user_login_when_hasher_is_saturated_fails(self, client, init_db):
+        """ Testing login is rejected when no hashing slot is free """
+
+        password_hasher = PasswordHasher(workers=1, queue_size=0,
+                                         rounds=4, wait_timeout=0)
+        password_hasher.slots.acquire()
+        set_password_hasher(password_hasher)
+        user_data = json.dumps(
+            {'email': 'jeankabera@gmail.com', 'password': 'Password1234'})
+        try:
+            response = client.post(
+                f'{API_BASE_URL}/auth/login', data=user_data,
+                content_type=CONTENT_TYPE)
+        finally:
+            set_password_hasher(None)
+
+        assert response.status_code == 503
+        assert response.json['status'] == 'error'
+        assert response.json['message'] == \
+            'The server is busy, please try again later'
+
+    def test_concurrent_first_uses_share_one_hasher(self, app, monkeypatch):
+        """ Testing the hasher is created once by concurrent first requests """
+
+        class SlowPasswordHasher(PasswordHasher):
+            def __init__(self, **kwargs):
+                time.sleep(0.05)
+                super().__init__(**kwargs)
+
+        monkeypatch.setattr(api.utilities.password_hasher, 'PasswordHasher',
+                            SlowPasswordHasher)
+        set_password_hasher(None)
+        barrier = threading.Barrier(4)
+        hashers = []
+
+        def use_hasher():
+            with app.app_context():
+                barrier.wait()
+                hashers.append(get_password_hasher())
+
+        threads = [threading.Thread(target=use_hasher) for _ in range(4)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            set_password_hasher(None)
+
+        assert len(hashers) == 4
+        assert all(hasher is hashers[0] for hasher in hashers)